@@ -1,84 +1,216 @@
 
 import pandas_ta as ta
 import pandas as pd
+import numpy as np
 import streamlit as st
 import plotly.graph_objects as go
 from datetime import datetime
+import os
+import sys
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'indicateurs_economique'))
+from registry import AssetRegistry, DEFAULT_ASSETS
+from panel import build_panel, ALIGNMENTS
+from downsampling import downsample_line, downsample_ohlc, DEFAULT_BUDGET
+from risk_metrics import summary_metrics, rolling_risk_metrics, rolling_risk_panel, to_returns, ROLLING_COLUMNS, ROLLING_WINDOWS
+from excess_returns import ExcessReturns, risk_free_rates
+from indicator_cache import IndicatorCache
+from correlation import correlation_matrix, rolling_correlation, significant, METHODS
+from portfolio import PortfolioEngine, random_weights, backtest, REBALANCING
+from montecarlo import simulate, future_dates
+from profiling import RerunProfiler, load_records
 import warnings
 warnings.simplefilter(action='ignore', category=FutureWarning)
 
 # Configuration de la page
 st.set_page_config(page_title="Dashboard des Actifs Financiers", layout="wide")
 
-# Fonction pour charger les données en cache
-@st.cache_data
-def load_data(file_path):
-    df = pd.read_csv(file_path)
-    df['Date'] = pd.to_datetime(df['Date'])
-    return df
+# Instrumentation de cette exécution du script (durées par étape, mémoire et cProfile à la demande)
+prof = RerunProfiler("app_V2", trace_memory=st.session_state.get("prof_memory", False),
+                     cprofile=st.session_state.pop("prof_cprofile", False))
+
+# Registre des actifs : manifeste sur disque (symbole, classe d'actifs, chemin, bornes de dates, lignes).
+# Les listes d'actifs ne lisent que le manifeste ; une série est ouverte au premier accès
+# puis évincée (LRU) au-delà du budget mémoire du registre.
+@st.cache_resource
+def get_registry():
+    return AssetRegistry()
+
+def load_data(asset):
+    return get_registry().frame(asset)
+
+# Sérialisation des figures vers le navigateur, mesurée comme une étape à part
+def plotly_chart(fig, **kwargs):
+    with prof.stage("Sérialisation Plotly"):
+        st.plotly_chart(fig, **kwargs)
+
+# Série indexée par dates triées : une période = deux recherches dichotomiques et des vues, sans copie
+def load_series(asset):
+    return get_registry().series(asset)
+
+# Paramètres des indicateurs techniques (font partie de la clé du cache)
+INDICATOR_PARAMS = {'sma': 50, 'ema': 50, 'rsi': 14, 'macd': (12, 26, 9), 'bb': (20, 2), 'sharpe': 90}
 
-# Liste des fichiers de données
-data_files = {    
-    'S&P 500': 'indicateurs_economique\sp500_with_indicators.csv',
-    'Bitcoin': 'indicateurs_economique/bitcoin_historical_data_cleaned.csv',
-    'Gold': 'indicateurs_economique\gold_historical_data_cleaned.csv'
-}
-
-# Barre latérale pour la sélection de l'actif
-with st.sidebar:
-    st.header("Sélection de l'Actif")
-    selected_asset = st.selectbox("Choisissez un actif :", list(data_files.keys()))
-
-if selected_asset:
-    df = load_data(data_files[selected_asset])
-
-    # Sélection des dates sur une même ligne
-    min_date, max_date = df['Date'].min(), df['Date'].max()
-    col_start, col_end = st.columns(2)
-    with col_start:
-        start_date = st.date_input("Début", min_date, min_value=min_date, max_value=max_date)
-    with col_end:
-        end_date = st.date_input("Fin", max_date, min_value=min_date, max_value=max_date)
-    df = df[(df['Date'] >= pd.to_datetime(start_date)) & (df['Date'] <= pd.to_datetime(end_date))]
-
-    # Calcul des indicateurs techniques
-    df['SMA'] = df['Close'].rolling(window=50).mean()
-    df['EMA'] = df['Close'].ewm(span=50, adjust=False).mean()
-    df['RSI'] = ta.rsi(df['Close'], length=14)
-    df['MACD'] = ta.macd(df['Close'], fast=12, slow=26, signal=9)['MACD_12_26_9']
+@st.cache_resource
+def get_indicator_cache():
+    return IndicatorCache(max_entries=32)
+
+def compute_indicators(series, start_date, end_date, params):
+    df = series.view(start_date, end_date)
+    fast, slow, signal = params['macd']
+    bb_length, bb_std = params['bb']
+    df['SMA'] = df['Close'].rolling(window=params['sma']).mean()
+    df['EMA'] = df['Close'].ewm(span=params['ema'], adjust=False).mean()
+    df['RSI'] = ta.rsi(df['Close'], length=params['rsi'])
+    df['MACD'] = ta.macd(df['Close'], fast=fast, slow=slow, signal=signal)[f'MACD_{fast}_{slow}_{signal}']
     df['MDD'] = (df['Close'] / df['Close'].cummax() - 1) * 100
-    df['Sharpe_Ratio'] = df['Close'].pct_change(fill_method=None).mean() / df['Close'].pct_change(fill_method=None).std()
-    bollinger = ta.bbands(df['Close'], length=20, std=2)
-    df['BB_Upper'] = bollinger['BBU_20_2.0']
-    df['BB_Middle'] = bollinger['BBM_20_2.0']
-    df['BB_Lower'] = bollinger['BBL_20_2.0']
-
-    # Création des onglets
-    tabs = st.tabs(["Overview", "Détails", "Comparaisons", "Prédiction"])
-
-    # Onglet Aperçu
-    with tabs[0]:
-        st.header(f"Aperçu de {selected_asset}")
-        rendement_moyen = df['Close'].pct_change().mean()
-        volatilite = df['Close'].pct_change().std()
-        tendance = "Hausse" if df['Close'].iloc[-1] > df['Close'].iloc[0] else "Baisse"
+    # Sharpe annualisé sur fenêtre glissante (et non plus une constante recopiée sur toute la colonne)
+    df['Sharpe_Ratio'] = rolling_risk_metrics(to_returns(df['Close']), params['sharpe'], risk_free=risk_free_rates(df['Date']))['Sharpe Ratio'][0].values
+    bollinger = ta.bbands(df['Close'], length=bb_length, std=bb_std)
+    df['BB_Upper'] = bollinger[f'BBU_{bb_length}_{float(bb_std)}']
+    df['BB_Middle'] = bollinger[f'BBM_{bb_length}_{float(bb_std)}']
+    df['BB_Lower'] = bollinger[f'BBL_{bb_length}_{float(bb_std)}']
+    return df
+
+# Panel multi-actifs aligné sur un calendrier commun, en cache par (actifs, alignement)
+@st.cache_resource(max_entries=8)
+def get_panel(assets, alignment):
+    return build_panel({asset: load_data(asset) for asset in assets}, alignment=alignment)
+
+# Rendements excédentaires (R_F aligné en as-of) et sommes cumulées précalculées par actif :
+# Sharpe, Sortino, alpha et bêta de n'importe quelle période sans recalcul sur les données
+@st.cache_resource(max_entries=8)
+def get_excess_returns(asset):
+    df = load_data(asset)
+    return ExcessReturns(df['Date'], df['Close'], benchmark=load_data('S&P 500'))
+
+# Corrélations sur les rendements, calendrier 'inner' : les jours reportés par ffill
+# donneraient des rendements nuls qui tirent artificiellement les corrélations vers 0
+@st.cache_resource(max_entries=8)
+def get_correlations(assets, method, window, step, start_date, end_date):
+    panel = get_panel(assets, "inner").slice(start_date, end_date)
+    returns = pd.DataFrame(panel.returns('Close'), index=panel.dates, columns=panel.assets)
+    full = correlation_matrix(returns, method)
+    dates, frames = rolling_correlation(returns, window, method, step=step)
+    return full, len(returns.dropna()), dates, frames
+
+# Portefeuille sur le calendrier 'inner' (rendements simultanés de tous les actifs) :
+# moyennes, covariance et R_F estimés une fois, optima et frontière efficiente
+@st.cache_resource(max_entries=8)
+def get_portfolio(assets, long_only, start_date, end_date):
+    panel = get_panel(assets, "inner").slice(start_date, end_date)
+    returns = pd.DataFrame(panel.returns('Close'), index=panel.dates, columns=panel.assets)
+    engine = PortfolioEngine(returns, risk_free=risk_free_rates(returns.index))
+    frontier_weights, frontier = engine.frontier(long_only=long_only)
+    return {
+        "engine": engine,
+        "returns": returns,
+        "min_variance": engine.min_variance(long_only),
+        "max_sharpe": engine.max_sharpe(long_only),
+        "frontier": frontier,
+    }
+
+# Lot de portefeuilles aléatoires évalué en un produit matriciel
+@st.cache_resource(max_entries=8)
+def get_random_portfolios(assets, start_date, end_date, n_portfolios, seed=0):
+    engine = get_portfolio(assets, True, start_date, end_date)["engine"]
+    weights = random_weights(n_portfolios, len(assets), seed)
+    return weights, engine.evaluate(weights)
+
+# Pool de processus partagé par les sessions pour les simulations Monte Carlo
+# ('spawn' plutôt que 'fork' : le serveur Streamlit est multi-thread)
+@st.cache_resource
+def get_simulation_pool():
+    return ProcessPoolExecutor(max_workers=os.cpu_count() or 1, mp_context=multiprocessing.get_context("spawn"))
+
+# Simulation calibrée sur la période choisie ; plusieurs actifs : tirages conjoints sur le calendrier 'inner'.
+# Graine fixe : une même demande donne le même éventail, quel que soit le nombre de processus.
+@st.cache_resource(max_entries=16)
+def get_simulation(assets, model, horizon, n_paths, block, start_date, end_date):
+    prices = get_panel(assets, "inner").slice(start_date, end_date).frame('Close')
+    result = simulate(prices, horizon=horizon, n_paths=n_paths, model=model, block=block, seed=0, executor=get_simulation_pool())
+    return result, prices, future_dates(prices.index, horizon)
+
+# Sondes de profilage (tracemalloc, cProfile) arrêtées à la sortie du bloc, même si le script est interrompu
+with prof:
+    # Barre latérale pour la sélection de l'actif
+    with st.sidebar:
+        st.header("Sélection de l'Actif")
+        classe = st.selectbox("Classe d'actifs", ["Toutes"] + get_registry().classes())
+        selected_asset = st.selectbox("Choisissez un actif :", get_registry().symbols(None if classe == "Toutes" else classe))
+
+    if selected_asset:
+        with prof.stage("Chargement"):
+            series = load_series(selected_asset)
+
+        # Sélection des dates sur une même ligne
+        min_date, max_date = get_registry().bounds(selected_asset)
+        col_start, col_end = st.columns(2)
+        with col_start:
+            start_date = st.date_input("Début", min_date, min_value=min_date, max_value=max_date)
+        with col_end:
+            end_date = st.date_input("Fin", max_date, min_value=min_date, max_value=max_date)
+
+        # Calcul des indicateurs techniques, mis en cache par (actif, période, paramètres) :
+        # un clic sur un filtre ne recalcule rien, seul le graphique est redessiné.
+        with prof.stage("Indicateurs"):
+            df = get_indicator_cache().get(
+                selected_asset, start_date, end_date, INDICATOR_PARAMS,
+                lambda: compute_indicators(series, start_date, end_date, INDICATOR_PARAMS)
+            )
+        with st.sidebar:
+            cache_stats = get_indicator_cache().stats()
+            st.caption(f"Cache indicateurs : {cache_stats['hits']} hits / {cache_stats['misses']} misses")
+
+        # Création des onglets
+        tabs = st.tabs(["Overview", "Détails", "Comparaisons", "Corrélations", "Portefeuille", "Prédiction"])
+
+        # Onglet Aperçu
+        with tabs[0], prof.stage("Overview"):
+            st.header(f"Aperçu de {selected_asset}")
+            metriques = summary_metrics(df['Close'])
+            excedents = get_excess_returns(selected_asset).metrics(start_date, end_date)
+            tendance = "Hausse" if df['Close'].iloc[-1] > df['Close'].iloc[0] else "Baisse"
         
-        max_close = df['Close'].max()
-        max_close_date = df[df['Close'] == max_close]['Date'].iloc[0]
-        min_close = df['Close'].min()
-        min_close_date = df[df['Close'] == min_close]['Date'].iloc[0]
+            max_close = df['Close'].max()
+            max_close_date = df[df['Close'] == max_close]['Date'].iloc[0]
+            min_close = df['Close'].min()
+            min_close_date = df[df['Close'] == min_close]['Date'].iloc[0]
         
-        st.metric("Rendement Moyen", f"{rendement_moyen:.2%}")
-        st.metric("Volatilité", f"{volatilite:.2%}")
-        st.metric("Tendance du marché", tendance)
-        st.metric("Close Max", f"{max_close:.2f} ({max_close_date.date()})")
-        st.metric("Close Min", f"{min_close:.2f} ({min_close_date.date()})")
+            st.metric("Rendement Annuel", f"{metriques['Rendement Annuel']:.2%}")
+            st.metric("Volatilité Annuelle", f"{metriques['Volatilité Annuelle']:.2%}")
+            st.metric("Sharpe Ratio", f"{excedents['Sharpe Ratio']:.2f}")
+            st.metric("Sortino Ratio", f"{excedents['Sortino Ratio']:.2f}")
+            if selected_asset != 'S&P 500':
+                st.metric("Alpha (vs S&P 500)", f"{excedents['Alpha']:.2%}")
+                st.metric("Bêta (vs S&P 500)", f"{excedents['Bêta']:.2f}")
+            st.metric("Ulcer Index", f"{metriques['Ulcer Index']:.2f}")
+            st.metric("Max Drawdown", f"{metriques['Max Drawdown']:.2f}%")
+            st.metric("Tendance du marché", tendance)
+            st.metric("Close Max", f"{max_close:.2f} ({max_close_date.date()})")
+            st.metric("Close Min", f"{min_close:.2f} ({min_close_date.date()})")
+
+            # Métriques de risque glissantes (sommes cumulées : toutes les fenêtres en une passe)
+            st.subheader("Métriques de risque glissantes")
+            col_metrique, col_fenetres = st.columns(2)
+            with col_metrique:
+                metrique = st.selectbox("Métrique", ROLLING_COLUMNS)
+            with col_fenetres:
+                fenetres = st.multiselect("Fenêtres (jours)", list(ROLLING_WINDOWS), default=[90])
+            if fenetres:
+                rolling = rolling_risk_panel(to_returns(df['Close']), fenetres, risk_free=risk_free_rates(df['Date']))
+                fig_risk = go.Figure()
+                for fenetre in fenetres:
+                    fig_risk.add_trace(go.Scatter(x=df['Date'], y=rolling[fenetre][metrique][0], mode='lines', name=f"{metrique} ({fenetre} j)"))
+                fig_risk.update_layout(xaxis=dict(tickformat='%d-%m-%Y'), yaxis_title=metrique)
+                plotly_chart(fig_risk, use_container_width=True)
 
 
-    # Onglet Détails : graphique combiné (chandeliers + indicateurs superposés)
-    with tabs[1]:
-        # Injection de CSS pour la mise en page des boutons et labels
-        st.markdown("""
+        # Onglet Détails : graphique combiné (chandeliers + indicateurs superposés)
+        with tabs[1], prof.stage("Détails"):
+            # Injection de CSS pour la mise en page des boutons et labels
+            st.markdown("""
         <style>
             .stButton > button {
                 margin: 0 !important;
@@ -96,100 +228,281 @@ if selected_asset:
         </style>
         """, unsafe_allow_html=True)
 
-        # Initialisation des indicateurs sélectionnés dans session_state
-        if "selected_indicators" not in st.session_state:
-            st.session_state.selected_indicators = []
-
-        # Liste des indicateurs disponibles
-        indicateurs_options = ["SMA", "EMA", "MACD", "RSI", "Sharpe_Ratio", "BB_Upper", "BB_Lower"]
-
-        # En-tête "Détails" avec "Filtres" alignés à côté
-        header_cols = st.columns([2, 8])
-        with header_cols[0]:
-            st.markdown(f"<span class='custom-title'>Détails de {selected_asset}</span>", unsafe_allow_html=True)
-        with header_cols[1]:
-            filtres_cols = st.columns([1] + [1] * len(indicateurs_options))
-            with filtres_cols[0]:
-                st.markdown("<span class='custom-title'>Filtres:</span>", unsafe_allow_html=True)
-            for idx, indicateur in enumerate(indicateurs_options):
-                with filtres_cols[idx+1]:
-                    if st.button(indicateur, key=f"btn_{indicateur}"):
-                        if indicateur in st.session_state.selected_indicators:
-                            st.session_state.selected_indicators.remove(indicateur)
-                        else:
-                            st.session_state.selected_indicators.append(indicateur)
-
-        # Construction du graphique combiné
-        fig = go.Figure()
-        fig.add_trace(go.Candlestick(
-            x=df['Date'],
-            open=df['Open'],
-            high=df['High'],
-            low=df['Low'],
-            close=df['Close'],
-            name="Chandeliers"
-        ))
-
-        # Ajout des indicateurs sélectionnés
-        for indicateur in st.session_state.selected_indicators:
-            fig.add_trace(go.Scatter(
-                x=df['Date'],
-                y=df[indicateur],
-                mode='lines',
-                name=indicateur
+            # Initialisation des indicateurs sélectionnés dans session_state
+            if "selected_indicators" not in st.session_state:
+                st.session_state.selected_indicators = []
+
+            # Liste des indicateurs disponibles
+            indicateurs_options = ["SMA", "EMA", "MACD", "RSI", "Sharpe_Ratio", "BB_Upper", "BB_Lower"]
+
+            # En-tête "Détails" avec "Filtres" alignés à côté
+            header_cols = st.columns([2, 8])
+            with header_cols[0]:
+                st.markdown(f"<span class='custom-title'>Détails de {selected_asset}</span>", unsafe_allow_html=True)
+            with header_cols[1]:
+                filtres_cols = st.columns([1] + [1] * len(indicateurs_options))
+                with filtres_cols[0]:
+                    st.markdown("<span class='custom-title'>Filtres:</span>", unsafe_allow_html=True)
+                for idx, indicateur in enumerate(indicateurs_options):
+                    with filtres_cols[idx+1]:
+                        if st.button(indicateur, key=f"btn_{indicateur}"):
+                            if indicateur in st.session_state.selected_indicators:
+                                st.session_state.selected_indicators.remove(indicateur)
+                            else:
+                                st.session_state.selected_indicators.append(indicateur)
+
+            # Plage affichée : au-delà de DEFAULT_BUDGET points, les chandeliers sont agrégés en barres plus
+            # larges et les courbes sous-échantillonnées (LTTB) ; zoomer sur une plage courte rend la pleine résolution.
+            visible = df
+            if len(df) > DEFAULT_BUDGET:
+                zoom = st.slider("Plage affichée", min_value=df['Date'].iloc[0].to_pydatetime(), max_value=df['Date'].iloc[-1].to_pydatetime(),
+                                 value=(df['Date'].iloc[0].to_pydatetime(), df['Date'].iloc[-1].to_pydatetime()), format="DD/MM/YYYY", key="zoom_details")
+                visible = df.iloc[df['Date'].searchsorted(zoom[0]):df['Date'].searchsorted(zoom[1], side='right')]
+            bars = downsample_ohlc(visible)
+            if len(bars) < len(visible):
+                st.caption(f"{len(visible)} séances agrégées en {len(bars)} barres : zoomez pour la pleine résolution")
+
+            # Construction du graphique combiné
+            fig = go.Figure()
+            fig.add_trace(go.Candlestick(
+                x=bars['Date'],
+                open=bars['Open'],
+                high=bars['High'],
+                low=bars['Low'],
+                close=bars['Close'],
+                name="Chandeliers"
             ))
-        fig.update_layout(xaxis=dict(tickformat='%d-%m-%Y'))
-        st.plotly_chart(fig, use_container_width=True)
+
+            # Ajout des indicateurs sélectionnés
+            for indicateur in st.session_state.selected_indicators:
+                x_ind, y_ind = downsample_line(visible['Date'], visible[indicateur])
+                fig.add_trace(go.Scatter(
+                    x=x_ind,
+                    y=y_ind,
+                    mode='lines',
+                    name=indicateur
+                ))
+            fig.update_layout(xaxis=dict(tickformat='%d-%m-%Y'))
+            plotly_chart(fig, use_container_width=True)
 
     
-    # Onglet Comparaisons
-    with tabs[2]:
-        st.header("Comparaison entre actifs")
-        assets_to_compare = st.multiselect(
-            "Sélectionnez les actifs à comparer", 
-            options=list(data_files.keys()), 
-            default=list(data_files.keys())
-        )
+        # Onglet Comparaisons
+        with tabs[2], prof.stage("Comparaisons"):
+            st.header("Comparaison entre actifs")
+            assets_to_compare = st.multiselect(
+                "Sélectionnez les actifs à comparer", 
+                options=get_registry().symbols(), 
+                default=[selected_asset]
+            )
+        
+            alignement = st.selectbox("Alignement des calendriers", ALIGNMENTS, index=ALIGNMENTS.index("ffill"))
         
-        if assets_to_compare:
-            fig_prices = go.Figure()
-            fig_volume = go.Figure()
+            if assets_to_compare:
+                fig_prices = go.Figure()
+                fig_volume = go.Figure()
             
-            for asset in assets_to_compare:
-                temp_df = load_data(data_files[asset])
-                temp_df = temp_df[(temp_df['Date'] >= pd.to_datetime(start_date)) & (temp_df['Date'] <= pd.to_datetime(end_date))]
-                
-                # Normalisation des prix à une échelle de 1000
-                temp_df['Normalized_Close'] = (temp_df['Close'] - temp_df['Close'].min()) / (temp_df['Close'].max() - temp_df['Close'].min()) * 1000
-                
-                # Normalisation des volumes à une échelle de 100
-                temp_df['Normalized_Volume'] = (temp_df['Volume'] - temp_df['Volume'].min()) / (temp_df['Volume'].max() - temp_df['Volume'].min()) * 100
-                
-                # Ajout des courbes
-                fig_prices.add_trace(go.Scatter(x=temp_df['Date'], y=temp_df['Normalized_Close'], mode='lines', name=f"{asset} (Normalisé)"))
-                fig_volume.add_trace(go.Scatter(x=temp_df['Date'], y=temp_df['Normalized_Volume'], mode='lines', name=f"Volume {asset} (Normalisé)"))
+                # Panel aligné (mis en cache) : une seule normalisation vectorisée pour tous les actifs
+                panel = get_panel(tuple(assets_to_compare), alignement).slice(start_date, end_date)
             
-            fig_prices.update_layout(title="Évolution des prix des actifs (Normalisé à 1000)", xaxis_title="Date", yaxis_title="Prix Normalisé")
-            fig_volume.update_layout(title="Volume échangé sur le marché (Normalisé à 100)", xaxis_title="Date", yaxis_title="Volume Normalisé")
+                # Normalisation des prix à une échelle de 1000 et des volumes à une échelle de 100
+                normalized_close = panel.normalize('Close', 1000)
+                normalized_volume = panel.normalize('Volume', 100)
             
-            st.plotly_chart(fig_prices, use_container_width=True)
-            st.plotly_chart(fig_volume, use_container_width=True)
-        else:
-            st.warning("Veuillez sélectionner au moins un actif pour la comparaison.")
-    # Onglet Prédiction
-    with tabs[3]:
-        st.header("Prédiction des Prix")
-        col_pred_start, col_pred_end = st.columns(2)
-        with col_pred_start:
-            pred_start_date = st.date_input("Début de la prédiction", min_date, key="pred_start", min_value=min_date, max_value=max_date)
-        with col_pred_end:
-            pred_end_date = st.date_input("Fin de la prédiction", max_date, key="pred_end", min_value=min_date, max_value=max_date)
-        prediction_model = st.selectbox("Choisissez un modèle de prédiction", ["ARIMA", "Prophet", ])
-        if st.button("Lancer la prédiction"):
-            st.info("Modèle en cours d'entraînement...")
-            st.success(f"Prédiction terminée avec {prediction_model} !")
-            st.metric("Accuracy", "90%")
-            st.metric("Précision", "85%")
+                # Ajout des courbes (LTTB pour les prix, min/max pour garder les pics de volume)
+                for i, asset in enumerate(panel.assets):
+                    x_close, y_close = downsample_line(panel.dates, normalized_close[:, i])
+                    x_volume, y_volume = downsample_line(panel.dates, normalized_volume[:, i], method="minmax")
+                    fig_prices.add_trace(go.Scatter(x=x_close, y=y_close, mode='lines', name=f"{asset} (Normalisé)"))
+                    fig_volume.add_trace(go.Scatter(x=x_volume, y=y_volume, mode='lines', name=f"Volume {asset} (Normalisé)"))
+            
+                fig_prices.update_layout(title="Évolution des prix des actifs (Normalisé à 1000)", xaxis_title="Date", yaxis_title="Prix Normalisé")
+                fig_volume.update_layout(title="Volume échangé sur le marché (Normalisé à 100)", xaxis_title="Date", yaxis_title="Volume Normalisé")
+            
+                plotly_chart(fig_prices, use_container_width=True)
+                plotly_chart(fig_volume, use_container_width=True)
+            else:
+                st.warning("Veuillez sélectionner au moins un actif pour la comparaison.")
+        # Onglet Corrélations : matrice complète filtrée et animation de la matrice glissante
+        with tabs[3], prof.stage("Corrélations"):
+            st.header("Corrélations des rendements")
+            assets_corr = st.multiselect("Actifs", options=get_registry().symbols(), default=list(dict.fromkeys([selected_asset, 'S&P 500'])), key="corr_assets")
+            col_methode, col_fenetre, col_pas, col_seuil = st.columns(4)
+            with col_methode:
+                methode = st.selectbox("Méthode", METHODS)
+            with col_fenetre:
+                fenetre = st.selectbox("Fenêtre glissante (jours)", list(ROLLING_WINDOWS), index=list(ROLLING_WINDOWS).index(90))
+            with col_pas:
+                pas = st.number_input("Pas de l'animation (jours)", min_value=1, max_value=60, value=5)
+            with col_seuil:
+                seuil = st.slider("Seuil |corr|", 0.0, 1.0, 0.5, 0.05)
+
+            if len(assets_corr) >= 2:
+                full, n_obs, corr_dates, frames = get_correlations(tuple(assets_corr), methode, fenetre, int(pas), start_date, end_date)
+
+                # Corrélations fortes et significatives (5 %) sur toute la période
+                filtered = significant(full, n_obs, threshold=seuil)
+                fig_corr = go.Figure(go.Heatmap(z=filtered.values, x=full.columns, y=full.index, zmin=-1, zmax=1,
+                                                colorscale="RdBu_r", text=full.round(2).values, texttemplate="%{text}"))
+                fig_corr.update_layout(title=f"Corrélations significatives (|corr| ≥ {seuil:.2f}, {n_obs} observations)")
+                plotly_chart(fig_corr, use_container_width=True)
+
+                if len(frames):
+                    labels = [d.strftime('%d-%m-%Y') for d in corr_dates]
+                    fig_roll = go.Figure(
+                        data=[go.Heatmap(z=frames[0], x=full.columns, y=full.index, zmin=-1, zmax=1, colorscale="RdBu_r")],
+                        frames=[go.Frame(data=[go.Heatmap(z=frame)], name=label) for frame, label in zip(frames.round(3), labels)]
+                    )
+                    fig_roll.update_layout(
+                        title=f"Corrélation glissante {fenetre} jours ({methode})",
+                        updatemenus=[dict(type="buttons", buttons=[
+                            dict(label="▶", method="animate", args=[None, dict(frame=dict(duration=100, redraw=True), fromcurrent=True)]),
+                            dict(label="⏸", method="animate", args=[[None], dict(mode="immediate", frame=dict(duration=0))]),
+                        ])],
+                        sliders=[dict(steps=[dict(label=label, method="animate", args=[[label], dict(mode="immediate", frame=dict(duration=0, redraw=True))]) for label in labels])]
+                    )
+                    plotly_chart(fig_roll, use_container_width=True)
+                else:
+                    st.info("Période trop courte pour la fenêtre glissante choisie.")
+            else:
+                st.warning("Veuillez sélectionner au moins deux actifs.")
+
+        # Onglet Portefeuille : nuage de portefeuilles aléatoires, frontière efficiente, optima et backtest
+        with tabs[4], prof.stage("Portefeuille"):
+            st.header("Portefeuille et frontière efficiente")
+            assets_pf = st.multiselect("Actifs", options=get_registry().symbols(),
+                                       default=[s for s in DEFAULT_ASSETS if s in get_registry().symbols()], key="pf_assets")
+            col_nombre, col_position, col_reequilibrage = st.columns(3)
+            with col_nombre:
+                n_portfolios = st.select_slider("Portefeuilles aléatoires", [10_000, 50_000, 100_000, 200_000], value=100_000)
+            with col_position:
+                long_only = st.checkbox("Sans vente à découvert", value=True)
+            with col_reequilibrage:
+                reequilibrage = st.selectbox("Rééquilibrage du backtest", list(REBALANCING), index=2)
+
+            if len(assets_pf) >= 2:
+                try:
+                    pf = get_portfolio(tuple(assets_pf), long_only, start_date, end_date)
+                except ValueError as e:
+                    st.error(str(e))
+                    pf = None
+            else:
+                st.warning("Veuillez sélectionner au moins deux actifs.")
+                pf = None
+
+            if pf is not None:
+                engine = pf["engine"]
+                weights, stats = get_random_portfolios(tuple(assets_pf), start_date, end_date, n_portfolios)
+                portefeuilles = {
+                    "Variance minimale": pf["min_variance"],
+                    "Sharpe maximal": pf["max_sharpe"],
+                    "Meilleur tirage": weights[np.nanargmax(stats[:, 2])],
+                    "Équipondéré": np.full(len(assets_pf), 1 / len(assets_pf)),
+                }
+
+                # Nuage réduit au budget de points pour l'affichage ; le meilleur tirage porte sur tout le lot
+                shown = np.random.default_rng(0).choice(len(stats), min(len(stats), DEFAULT_BUDGET), replace=False)
+                fig_pf = go.Figure()
+                fig_pf.add_trace(go.Scattergl(x=stats[shown, 1], y=stats[shown, 0], mode='markers', name=f"{n_portfolios:,} portefeuilles aléatoires",
+                                              marker=dict(size=3, color=stats[shown, 2], colorscale="Viridis", showscale=True, colorbar=dict(title="Sharpe"))))
+                fig_pf.add_trace(go.Scatter(x=pf["frontier"][:, 1], y=pf["frontier"][:, 0], mode='lines', name="Frontière efficiente"))
+                fig_pf.add_trace(go.Scatter(x=np.sqrt(np.diag(engine.cov)), y=engine.mean, mode='markers+text', text=engine.assets,
+                                            textposition="top center", name="Actifs"))
+                for nom, w in portefeuilles.items():
+                    ret, vol, _ = engine.evaluate(w)[0]
+                    fig_pf.add_trace(go.Scatter(x=[vol], y=[ret], mode='markers', marker=dict(size=12, symbol="star"), name=nom))
+                fig_pf.update_layout(xaxis=dict(title="Volatilité annuelle", tickformat=".0%"), yaxis=dict(title="Rendement annuel", tickformat=".0%"),
+                                     title=f"Frontière efficiente ({engine.n_obs} rendements journaliers communs)")
+                plotly_chart(fig_pf, use_container_width=True)
+
+                col_poids, col_stats = st.columns(2)
+                with col_poids:
+                    st.caption("Poids (%)")
+                    st.dataframe((pd.DataFrame(portefeuilles, index=engine.assets) * 100).round(1))
+                with col_stats:
+                    st.caption("Statistiques annualisées")
+                    st.dataframe(engine.stats(np.vstack(list(portefeuilles.values()))).set_axis(list(portefeuilles)).round(3))
+
+                # Backtest vectorisé des portefeuilles, rééquilibrés à la fréquence choisie
+                richesse = backtest(pf["returns"], np.vstack(list(portefeuilles.values())), REBALANCING[reequilibrage])
+                fig_bt = go.Figure()
+                for i, nom in enumerate(portefeuilles):
+                    x_bt, y_bt = downsample_line(richesse.index, richesse[i].to_numpy())
+                    fig_bt.add_trace(go.Scatter(x=x_bt, y=y_bt, mode='lines', name=nom))
+                fig_bt.update_layout(title=f"Backtest (rééquilibrage {reequilibrage.lower()}, base 1)", xaxis=dict(tickformat='%d-%m-%Y'), yaxis_title="Richesse")
+                plotly_chart(fig_bt, use_container_width=True)
+
+        # Onglet Prédiction : éventail de percentiles et distribution des prix simulés (Monte Carlo)
+        with tabs[5], prof.stage("Prédiction"):
+            st.header("Prédiction des Prix (Monte Carlo)")
+            col_pred_start, col_pred_end = st.columns(2)
+            with col_pred_start:
+                pred_start_date = st.date_input("Début de l'historique de calibration", min_date, key="pred_start", min_value=min_date, max_value=max_date)
+            with col_pred_end:
+                pred_end_date = st.date_input("Fin de l'historique de calibration", max_date, key="pred_end", min_value=min_date, max_value=max_date)
+            modeles = {"Mouvement brownien géométrique": "gbm", "Bootstrap par blocs": "bootstrap"}
+            col_modele, col_horizon, col_trajectoires = st.columns(3)
+            with col_modele:
+                prediction_model = st.selectbox("Choisissez un modèle de simulation", list(modeles))
+            with col_horizon:
+                horizon = st.slider("Horizon (jours de cotation)", 5, 252, 50)
+            with col_trajectoires:
+                n_paths = st.select_slider("Trajectoires", [10_000, 50_000, 100_000, 200_000], value=100_000)
+            col_conjoints, col_bloc = st.columns(2)
+            with col_conjoints:
+                conjoints = st.multiselect("Simulation conjointe avec (corrélations conservées)",
+                                           [a for a in get_registry().symbols() if a != selected_asset], key="mc_joint")
+            with col_bloc:
+                bloc = st.slider("Longueur des blocs (jours)", 5, 60, 20, disabled=modeles[prediction_model] != "bootstrap")
+
+            try:
+                result, historique, dates_futures = get_simulation(tuple([selected_asset] + conjoints), modeles[prediction_model], horizon,
+                                                                   n_paths, bloc, pred_start_date, pred_end_date)
+            except ValueError as e:
+                st.error(str(e))
+                result = None
+
+            if result is not None:
+                bandes = result.percentiles(selected_asset)
+                fig_mc = go.Figure()
+                passe = historique[selected_asset].iloc[-250:]
+                fig_mc.add_trace(go.Scatter(x=passe.index, y=passe.values, mode='lines', name="Historique", line=dict(color="black")))
+                for trajectoire in result.sample_paths(selected_asset):
+                    fig_mc.add_trace(go.Scatter(x=dates_futures, y=trajectoire, mode='lines', line=dict(width=0.5, color="lightgrey"),
+                                                showlegend=False, hoverinfo="skip"))
+                for bas, haut, couleur in ((5, 95, "rgba(31, 119, 180, 0.15)"), (25, 75, "rgba(31, 119, 180, 0.35)")):
+                    fig_mc.add_trace(go.Scatter(x=dates_futures, y=bandes[haut], mode='lines', line=dict(width=0), showlegend=False))
+                    fig_mc.add_trace(go.Scatter(x=dates_futures, y=bandes[bas], mode='lines', line=dict(width=0), fill='tonexty',
+                                                fillcolor=couleur, name=f"P{bas}-P{haut}"))
+                fig_mc.add_trace(go.Scatter(x=dates_futures, y=bandes[50], mode='lines', name="Médiane", line=dict(color="rgb(31, 119, 180)")))
+                fig_mc.update_layout(title=f"{n_paths:,} trajectoires simulées sur {horizon} jours ({prediction_model})",
+                                     xaxis=dict(tickformat='%d-%m-%Y'), yaxis_title="Prix")
+                plotly_chart(fig_mc, use_container_width=True)
+
+                prix_finaux, probabilites = result.terminal(selected_asset)
+                dernier = bandes[50].iloc[0]
+                col_mediane, col_hausse, col_var = st.columns(3)
+                col_mediane.metric("Prix médian à l'horizon", f"{bandes[50].iloc[-1]:.2f}", f"{bandes[50].iloc[-1] / dernier - 1:.2%}")
+                col_hausse.metric("Probabilité de hausse", f"{probabilites[prix_finaux > dernier].sum():.1%}")
+                col_var.metric("VaR 95 % à l'horizon", f"{1 - bandes[5].iloc[-1] / dernier:.2%}")
+                fig_term = go.Figure(go.Bar(x=prix_finaux, y=probabilites, name="Probabilité"))
+                fig_term.add_vline(x=dernier, line_dash="dash", annotation_text="Dernier prix")
+                fig_term.update_layout(title="Distribution des prix à l'horizon", xaxis_title="Prix", yaxis=dict(title="Probabilité", tickformat=".1%"))
+                plotly_chart(fig_term, use_container_width=True)
+
+# Panneau de profilage : étapes de cette exécution, budgets, taux de hit du cache et historique exporté
+record = prof.finish(caches={"load_data": get_registry().stats(),
+                            "indicateurs": get_indicator_cache().stats()})
+with st.sidebar.expander("Profilage"):
+    st.checkbox("Mesurer la mémoire (tracemalloc)", key="prof_memory")
+    st.button("cProfile sur la prochaine rerun", on_click=lambda: st.session_state.update(prof_cprofile=True))
+    st.dataframe(prof.summary(), hide_index=True)
+    st.caption(f"Total : {record['total']:.3f} s — hit rate load_data : {record['caches']['load_data'].get('hit_rate', 0.0):.0%}")
+    if "cprofile" in record:
+        st.code(record["cprofile"])
+    history = load_records(prof.app)
+    if not history.empty:
+        st.line_chart(history['total'].tail(200))
+prof.export(record)
 
 st.markdown("""
 <style>
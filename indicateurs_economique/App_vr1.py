@@ -11,19 +11,33 @@ from sklearn.metrics import mean_squared_error
 from sklearn.linear_model import LinearRegression
 from fbprophet import Prophet
 import statsmodels.api as sm
+from model_registry import shared_registry, registry_key
+from train_evaluate_model import MODEL_PARAMS
+from registry import AssetRegistry
+from panel import build_panel, ALIGNMENTS
+from downsampling import downsample_line, downsample_ohlc, DEFAULT_BUDGET
 import warnings
 warnings.simplefilter(action='ignore', category=FutureWarning)
 
 st.set_page_config(page_title="Dashboard des Actifs Financiers", layout="wide")
 
-@st.cache_data
-def load_data(file_path):
-    df = pd.read_csv(file_path)
-    df['Date'] = pd.to_datetime(df['Date'])
-    return df
+# Registre des actifs : manifeste sur disque (symbole, classe d'actifs, chemin, bornes de dates, lignes).
+# Les listes d'actifs ne lisent que le manifeste ; une série est ouverte au premier accès
+# puis évincée (LRU) au-delà du budget mémoire du registre.
+@st.cache_resource
+def get_registry():
+    return AssetRegistry()
 
-def save_model_coefficients(model, model_name, output_dir="model_coefficients"):
-    os.makedirs(output_dir, exist_ok=True)
+def load_data(asset):
+    return get_registry().frame(asset)
+
+# Série indexée par dates triées : une période = deux recherches dichotomiques et des vues, sans copie
+def load_series(asset):
+    return get_registry().series(asset)
+
+# Les modèles sont rangés dans le registre par empreinte des données d'entraînement :
+# deux actifs ou deux périodes différentes ne s'écrasent plus.
+def save_model_coefficients(model, model_name, df, metrics=None, output_dir="model_coefficients", params=None):
     coefficients = {}
     if hasattr(model, "coef_"):
         coefficients["coefficients"] = model.coef_.tolist()
@@ -31,34 +45,31 @@ def save_model_coefficients(model, model_name, output_dir="model_coefficients"):
         coefficients["intercept"] = model.intercept_.tolist()
     if hasattr(model, "params"):
         coefficients["parameters"] = model.params.to_dict()
-    json_path = os.path.join(output_dir, f"{model_name}.json")
-    with open(json_path, "w") as f:
-        json.dump(coefficients, f, indent=4)
-    pickle_path = os.path.join(output_dir, f"{model_name}.pkl")
-    with open(pickle_path, "wb") as f:
-        pickle.dump(model, f)
-    print(f"Coefficients saved for {model_name} in {output_dir}")
+    registry = shared_registry(output_dir)
+    entry = registry.store(registry_key(df, model_name, params), model, metrics, model=model_name, params=params,
+                           coefficients=coefficients)
+    print(f"Coefficients saved for {model_name} in {entry['model_path']}")
+    return entry
 
-data_files = {
-    'S&P 500': 'indicateurs_economique/sp500_with_indicators.csv',
-    'Bitcoin': 'indicateurs_economique/bitcoin_historical_data_cleaned.csv',
-    'Gold': 'indicateurs_economique/gold_historical_data_cleaned.csv'
-}
+# Panel multi-actifs aligné sur un calendrier commun, en cache par (actifs, alignement)
+@st.cache_resource(max_entries=8)
+def get_panel(assets, alignment):
+    return build_panel({asset: load_data(asset) for asset in assets}, alignment=alignment)
 
 with st.sidebar:
     st.header("Sélection de l'Actif")
-    selected_asset = st.selectbox("Choisissez un actif :", list(data_files.keys()))
+    classe = st.selectbox("Classe d'actifs", ["Toutes"] + get_registry().classes())
+    selected_asset = st.selectbox("Choisissez un actif :", get_registry().symbols(None if classe == "Toutes" else classe))
 
 if selected_asset:
-    df = load_data(data_files[selected_asset])
-    min_date, max_date = df['Date'].min(), df['Date'].max()
+    min_date, max_date = get_registry().bounds(selected_asset)
     
     col_start, col_end = st.columns(2)
     with col_start:
         start_date = st.date_input("Début", min_date, min_value=min_date, max_value=max_date)
     with col_end:
         end_date = st.date_input("Fin", max_date, min_value=min_date, max_value=max_date)
-    df = df[(df['Date'] >= pd.to_datetime(start_date)) & (df['Date'] <= pd.to_datetime(end_date))]
+    df = load_series(selected_asset).view(start_date, end_date)
     
     df['Returns'] = df['Close'].pct_change()
     df['Annual_Return'] = df['Returns'].mean() * 252
@@ -73,22 +84,36 @@ if selected_asset:
     
     with tabs[1]:
         st.header(f"Détails de {selected_asset}")
+        # Plage affichée : au-delà de DEFAULT_BUDGET points, les chandeliers sont agrégés en barres plus
+        # larges et les courbes sous-échantillonnées (LTTB) ; zoomer sur une plage courte rend la pleine résolution.
+        visible = df
+        if len(df) > DEFAULT_BUDGET:
+            zoom = st.slider("Plage affichée", min_value=df['Date'].iloc[0].to_pydatetime(), max_value=df['Date'].iloc[-1].to_pydatetime(),
+                             value=(df['Date'].iloc[0].to_pydatetime(), df['Date'].iloc[-1].to_pydatetime()), format="DD/MM/YYYY", key="zoom_details")
+            visible = df.iloc[df['Date'].searchsorted(zoom[0]):df['Date'].searchsorted(zoom[1], side='right')]
+        bars = downsample_ohlc(visible)
+        if len(bars) < len(visible):
+            st.caption(f"{len(visible)} séances agrégées en {len(bars)} barres : zoomez pour la pleine résolution")
         fig = go.Figure()
-        fig.add_trace(go.Candlestick(x=df['Date'], open=df['Open'], high=df['High'], low=df['Low'], close=df['Close'], name="Chandeliers"))
+        fig.add_trace(go.Candlestick(x=bars['Date'], open=bars['Open'], high=bars['High'], low=bars['Low'], close=bars['Close'], name="Chandeliers"))
         for indicator in ["SMA", "EMA", "MACD", "RSI"]:
             if indicator in df.columns:
-                fig.add_trace(go.Scatter(x=df['Date'], y=df[indicator], mode='lines', name=indicator))
+                x_ind, y_ind = downsample_line(visible['Date'], visible[indicator])
+                fig.add_trace(go.Scatter(x=x_ind, y=y_ind, mode='lines', name=indicator))
         st.plotly_chart(fig, use_container_width=True)
     
     with tabs[2]:
         st.header("Comparaison entre actifs (Transformation Logarithmique)")
-        selected_assets = st.multiselect("Sélectionnez les actifs", list(data_files.keys()), default=list(data_files.keys()))
+        selected_assets = st.multiselect("Sélectionnez les actifs", get_registry().symbols(), default=[selected_asset])
+        alignement = st.selectbox("Alignement des calendriers", ALIGNMENTS, index=ALIGNMENTS.index("ffill"))
         fig = go.Figure()
-        for asset in selected_assets:
-            temp_df = load_data(data_files[asset])
-            temp_df = temp_df[(temp_df['Date'] >= pd.to_datetime(start_date)) & (temp_df['Date'] <= pd.to_datetime(end_date))]
-            temp_df['Log_Close'] = np.log(temp_df['Close'])
-            fig.add_trace(go.Scatter(x=temp_df['Date'], y=temp_df['Log_Close'], mode='lines', name=f"{asset} (Log)"))
+        if selected_assets:
+            # Panel aligné (mis en cache) : transformation logarithmique de tous les actifs en une opération
+            panel = get_panel(tuple(selected_assets), alignement).slice(start_date, end_date)
+            log_close = panel.log('Close')
+            for i, asset in enumerate(panel.assets):
+                x_log, y_log = downsample_line(panel.dates, log_close[:, i])
+                fig.add_trace(go.Scatter(x=x_log, y=y_log, mode='lines', name=f"{asset} (Log)"))
         st.plotly_chart(fig, use_container_width=True)
     
     with tabs[3]:
@@ -105,7 +130,14 @@ if selected_asset:
         
         X = np.array(df['Close']).reshape(-1, 1)
         y = np.array(df['Close'].shift(-pred_days)).reshape(-1, 1)
-        model.fit(X, y)
+        # Même clé que train_evaluate_model.train_model : données, modèle, hyperparamètres et horizon
+        params = dict(MODEL_PARAMS.get(model_choice, {}), pred_days=pred_days)
+        registry = shared_registry()
+        key = registry_key(df, model_choice, params)
+        if registry.lookup(key) is not None:
+            model = registry.load(key)
+        else:
+            model.fit(X, y)
         predictions = model.predict(X)
         
         df['Predicted_Close'] = np.nan
@@ -118,5 +150,7 @@ if selected_asset:
         
         mse = mean_squared_error(y, predictions)
         rmse = np.sqrt(mse)
+        if registry.lookup(key) is None:
+            save_model_coefficients(model, model_choice, df, {"mse": float(mse), "rmse": float(rmse)}, params=params)
         st.metric("MSE", f"{mse:.2f}")
         st.metric("RMSE", f"{rmse:.2f}")
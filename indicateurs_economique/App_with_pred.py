@@ -8,76 +8,171 @@ import json
 import os
 from datetime import datetime
 from sklearn.metrics import mean_squared_error
-from train_evaluate_model import train_model
+from training_jobs import TrainingJobManager, PENDING, RUNNING, FAILED
+from registry import AssetRegistry
+from panel import build_panel, ALIGNMENTS
+from downsampling import downsample_line, downsample_ohlc, DEFAULT_BUDGET
+from risk_metrics import summary_metrics
+from excess_returns import ExcessReturns
+from profiling import RerunProfiler, load_records
 import warnings
 warnings.simplefilter(action='ignore', category=FutureWarning)
 
 st.set_page_config(page_title="Dashboard des Actifs Financiers", layout="wide")
 
-@st.cache_data
-def load_data(file_path):
-    df = pd.read_csv(file_path)
-    df['Date'] = pd.to_datetime(df['Date'])
-    return df
+# Instrumentation de cette exécution du script (durées par étape, mémoire et cProfile à la demande)
+prof = RerunProfiler("App_with_pred", trace_memory=st.session_state.get("prof_memory", False),
+                     cprofile=st.session_state.pop("prof_cprofile", False))
 
-data_files = {
-    'S&P 500': 'indicateurs_economique/sp500_with_indicators.csv',
-    'Bitcoin': 'indicateurs_economique/bitcoin_historical_data_cleaned.csv',
-    'Gold': 'indicateurs_economique/gold_historical_data_cleaned.csv'
-}
+# Registre des actifs : manifeste sur disque (symbole, classe d'actifs, chemin, bornes de dates, lignes).
+# Les listes d'actifs ne lisent que le manifeste ; une série est ouverte au premier accès
+# puis évincée (LRU) au-delà du budget mémoire du registre.
+@st.cache_resource
+def get_registry():
+    return AssetRegistry()
 
-with st.sidebar:
-    st.header("Sélection de l'Actif")
-    selected_asset = st.selectbox("Choisissez un actif :", list(data_files.keys()))
+def load_data(asset):
+    return get_registry().frame(asset)
 
-if selected_asset:
-    df = load_data(data_files[selected_asset])
-    min_date, max_date = df['Date'].min(), df['Date'].max()
+# Sérialisation des figures vers le navigateur, mesurée comme une étape à part
+def plotly_chart(fig, **kwargs):
+    with prof.stage("Sérialisation Plotly"):
+        st.plotly_chart(fig, **kwargs)
+
+# Série indexée par dates triées : une période = deux recherches dichotomiques et des vues, sans copie
+def load_series(asset):
+    return get_registry().series(asset)
+
+# Gestionnaire de jobs partagé par toutes les sessions : deux utilisateurs qui demandent
+# le même entraînement partagent le même calcul.
+@st.cache_resource
+def get_job_manager():
+    return TrainingJobManager(max_workers=2)
+
+# Statut d'un entraînement en cours, rafraîchi chaque seconde par un fragment : seul ce widget est
+# réexécuté, pas le script entier. Une fois le job terminé, une réexécution complète affiche le résultat.
+@st.fragment(run_every=1)
+def training_status(key, model_choice):
+    job = get_job_manager().status(key)
+    if job['state'] in (PENDING, RUNNING):
+        st.info(f"{job['state']} : entraînement {model_choice} ({job['elapsed']:.0f} s)")
+    else:
+        st.rerun()
+
+# Panel multi-actifs aligné sur un calendrier commun, en cache par (actifs, alignement)
+@st.cache_resource(max_entries=8)
+def get_panel(assets, alignment):
+    return build_panel({asset: load_data(asset) for asset in assets}, alignment=alignment)
+
+# Rendements excédentaires (R_F aligné en as-of) et sommes cumulées précalculées par actif :
+# Sharpe, Sortino, alpha et bêta de n'importe quelle période sans recalcul sur les données
+@st.cache_resource(max_entries=8)
+def get_excess_returns(asset):
+    df = load_data(asset)
+    return ExcessReturns(df['Date'], df['Close'], benchmark=load_data('S&P 500'))
+
+# Sondes de profilage (tracemalloc, cProfile) arrêtées à la sortie du bloc, même si le script est interrompu
+with prof:
+    with st.sidebar:
+        st.header("Sélection de l'Actif")
+        classe = st.selectbox("Classe d'actifs", ["Toutes"] + get_registry().classes())
+        selected_asset = st.selectbox("Choisissez un actif :", get_registry().symbols(None if classe == "Toutes" else classe))
+
+    if selected_asset:
+        with prof.stage("Chargement"):
+            series = load_series(selected_asset)
+        min_date, max_date = get_registry().bounds(selected_asset)
     
-    col_start, col_end = st.columns(2)
-    with col_start:
-        start_date = st.date_input("Début", min_date, min_value=min_date, max_value=max_date)
-    with col_end:
-        end_date = st.date_input("Fin", max_date, min_value=min_date, max_value=max_date)
-    df = df[(df['Date'] >= pd.to_datetime(start_date)) & (df['Date'] <= pd.to_datetime(end_date))]
+        col_start, col_end = st.columns(2)
+        with col_start:
+            start_date = st.date_input("Début", min_date, min_value=min_date, max_value=max_date)
+        with col_end:
+            end_date = st.date_input("Fin", max_date, min_value=min_date, max_value=max_date)
+        with prof.stage("Filtrage des dates"):
+            df = series.view(start_date, end_date)
     
-    df['Returns'] = df['Close'].pct_change()
-    df['Annual_Return'] = df['Returns'].mean() * 252
-    df['Annual_Volatility'] = df['Returns'].std() * np.sqrt(252)
+        with prof.stage("Indicateurs"):
+            metriques = summary_metrics(df['Close'])
+            excedents = get_excess_returns(selected_asset).metrics(start_date, end_date)
     
-    tabs = st.tabs(["Overview", "Détails", "Comparaisons", "Prédiction"])
+        tabs = st.tabs(["Overview", "Détails", "Comparaisons", "Prédiction"])
     
-    with tabs[0]:
-        st.header(f"Aperçu de {selected_asset}")
-        st.metric("Rendement Annuel", f"{df['Annual_Return'].iloc[-1]:.2%}")
-        st.metric("Volatilité Annuelle", f"{df['Annual_Volatility'].iloc[-1]:.2%}")
+        with tabs[0], prof.stage("Overview"):
+            st.header(f"Aperçu de {selected_asset}")
+            st.metric("Rendement Annuel", f"{metriques['Rendement Annuel']:.2%}")
+            st.metric("Volatilité Annuelle", f"{metriques['Volatilité Annuelle']:.2%}")
+            st.metric("Sharpe Ratio", f"{excedents['Sharpe Ratio']:.2f}")
+            st.metric("Sortino Ratio", f"{excedents['Sortino Ratio']:.2f}")
+            if selected_asset != 'S&P 500':
+                st.metric("Alpha (vs S&P 500)", f"{excedents['Alpha']:.2%}")
+                st.metric("Bêta (vs S&P 500)", f"{excedents['Bêta']:.2f}")
+            st.metric("Max Drawdown", f"{metriques['Max Drawdown']:.2f}%")
     
-    with tabs[1]:
-        st.header(f"Détails de {selected_asset}")
-        fig = go.Figure()
-        fig.add_trace(go.Candlestick(x=df['Date'], open=df['Open'], high=df['High'], low=df['Low'], close=df['Close'], name="Chandeliers"))
-        for indicator in ["SMA", "EMA", "MACD", "RSI"]:
-            if indicator in df.columns:
-                fig.add_trace(go.Scatter(x=df['Date'], y=df[indicator], mode='lines', name=indicator))
-        st.plotly_chart(fig, use_container_width=True)
+        with tabs[1], prof.stage("Détails"):
+            st.header(f"Détails de {selected_asset}")
+            # Plage affichée : au-delà de DEFAULT_BUDGET points, les chandeliers sont agrégés en barres plus
+            # larges et les courbes sous-échantillonnées (LTTB) ; zoomer sur une plage courte rend la pleine résolution.
+            visible = df
+            if len(df) > DEFAULT_BUDGET:
+                zoom = st.slider("Plage affichée", min_value=df['Date'].iloc[0].to_pydatetime(), max_value=df['Date'].iloc[-1].to_pydatetime(),
+                                 value=(df['Date'].iloc[0].to_pydatetime(), df['Date'].iloc[-1].to_pydatetime()), format="DD/MM/YYYY", key="zoom_details")
+                visible = df.iloc[df['Date'].searchsorted(zoom[0]):df['Date'].searchsorted(zoom[1], side='right')]
+            bars = downsample_ohlc(visible)
+            if len(bars) < len(visible):
+                st.caption(f"{len(visible)} séances agrégées en {len(bars)} barres : zoomez pour la pleine résolution")
+            fig = go.Figure()
+            fig.add_trace(go.Candlestick(x=bars['Date'], open=bars['Open'], high=bars['High'], low=bars['Low'], close=bars['Close'], name="Chandeliers"))
+            for indicator in ["SMA", "EMA", "MACD", "RSI"]:
+                if indicator in df.columns:
+                    x_ind, y_ind = downsample_line(visible['Date'], visible[indicator])
+                    fig.add_trace(go.Scatter(x=x_ind, y=y_ind, mode='lines', name=indicator))
+            plotly_chart(fig, use_container_width=True)
     
-    with tabs[2]:
-        st.header("Comparaison entre actifs (Transformation Logarithmique)")
-        selected_assets = st.multiselect("Sélectionnez les actifs", list(data_files.keys()), default=list(data_files.keys()))
-        fig = go.Figure()
-        for asset in selected_assets:
-            temp_df = load_data(data_files[asset])
-            temp_df = temp_df[(temp_df['Date'] >= pd.to_datetime(start_date)) & (temp_df['Date'] <= pd.to_datetime(end_date))]
-            temp_df['Log_Close'] = np.log(temp_df['Close'])
-            fig.add_trace(go.Scatter(x=temp_df['Date'], y=temp_df['Log_Close'], mode='lines', name=f"{asset} (Log)"))
-        st.plotly_chart(fig, use_container_width=True)
+        with tabs[2], prof.stage("Comparaisons"):
+            st.header("Comparaison entre actifs (Transformation Logarithmique)")
+            selected_assets = st.multiselect("Sélectionnez les actifs", get_registry().symbols(), default=[selected_asset])
+            alignement = st.selectbox("Alignement des calendriers", ALIGNMENTS, index=ALIGNMENTS.index("ffill"))
+            fig = go.Figure()
+            if selected_assets:
+                # Panel aligné (mis en cache) : transformation logarithmique de tous les actifs en une opération
+                panel = get_panel(tuple(selected_assets), alignement).slice(start_date, end_date)
+                log_close = panel.log('Close')
+                for i, asset in enumerate(panel.assets):
+                    x_log, y_log = downsample_line(panel.dates, log_close[:, i])
+                    fig.add_trace(go.Scatter(x=x_log, y=y_log, mode='lines', name=f"{asset} (Log)"))
+            plotly_chart(fig, use_container_width=True)
     
-    with tabs[3]:
-        st.header("Prédiction des Prix sur 50 Jours")
-        model_choice = st.selectbox("Sélectionner un modèle de prédiction", ["Linear Regression", "Prophet", "Logistic Regression"])
+        with tabs[3], prof.stage("Prédiction"):
+            st.header("Prédiction des Prix sur 50 Jours")
+            model_choice = st.selectbox("Sélectionner un modèle de prédiction", ["Linear Regression", "Prophet", "Logistic Regression"])
         
-        model_path, mse, rmse = train_model(df, model_choice, pred_days=50)
+            # L'entraînement tourne en arrière-plan ; le fragment training_status interroge le job jusqu'à la fin.
+            jobs = get_job_manager()
+            key = jobs.submit(selected_asset, start_date, end_date, model_choice, 50, df)
+            job = jobs.status(key)
         
-        st.metric("MSE", f"{mse:.2f}")
-        st.metric("RMSE", f"{rmse:.2f}")
-        st.success(f"Modèle sauvegardé : {model_path}")
+            if job['state'] in (PENDING, RUNNING):
+                training_status(key, model_choice)
+            elif job['state'] == FAILED:
+                st.error(f"Échec de l'entraînement : {job['error']}")
+            else:
+                result = job['result']
+                st.metric("MSE", f"{result['mse']:.2f}")
+                st.metric("RMSE", f"{result['rmse']:.2f}")
+                st.success(f"Modèle sauvegardé : {result['model_path']} ({result['fit_time']:.1f} s)")
+                # Entraînement exécuté en arrière-plan : sa durée est reportée telle quelle
+                prof.record("train_model", result['fit_time'])
+
+# Panneau de profilage : étapes de cette exécution, budgets, taux de hit du cache et historique exporté
+record = prof.finish(caches={"load_data": get_registry().stats()})
+with st.sidebar.expander("Profilage"):
+    st.checkbox("Mesurer la mémoire (tracemalloc)", key="prof_memory")
+    st.button("cProfile sur la prochaine rerun", on_click=lambda: st.session_state.update(prof_cprofile=True))
+    st.dataframe(prof.summary(), hide_index=True)
+    st.caption(f"Total : {record['total']:.3f} s — hit rate load_data : {record['caches']['load_data'].get('hit_rate', 0.0):.0%}")
+    if "cprofile" in record:
+        st.code(record["cprofile"])
+    history = load_records(prof.app)
+    if not history.empty:
+        st.line_chart(history['total'].tail(200))
+prof.export(record)
@@ -4,42 +4,59 @@ import pandas as pd
 import streamlit as st
 import plotly.graph_objects as go
 from datetime import datetime
+from registry import AssetRegistry
+from panel import build_panel, ALIGNMENTS
+from downsampling import downsample_line, downsample_ohlc, DEFAULT_BUDGET
+from risk_metrics import summary_metrics, rolling_risk_metrics, to_returns
+from excess_returns import ExcessReturns, risk_free_rates
 import warnings
 warnings.simplefilter(action='ignore', category=FutureWarning)
 
 # Configuration de la page
 st.set_page_config(page_title="Dashboard des Actifs Financiers", layout="wide")
 
-# Fonction pour charger les données en cache
-@st.cache_data
-def load_data(file_path):
-    df = pd.read_csv(file_path)
-    df['Date'] = pd.to_datetime(df['Date'])
-    return df
+# Registre des actifs : manifeste sur disque (symbole, classe d'actifs, chemin, bornes de dates, lignes).
+# Les listes d'actifs ne lisent que le manifeste ; une série est ouverte au premier accès
+# puis évincée (LRU) au-delà du budget mémoire du registre.
+@st.cache_resource
+def get_registry():
+    return AssetRegistry()
 
-# Liste des fichiers de données
-data_files = {    
-    'S&P 500': 'indicateurs_economique\sp500_with_indicators.csv',
-    'Bitcoin': 'indicateurs_economique/bitcoin_historical_data_cleaned.csv',
-    'Gold': 'indicateurs_economique\gold_historical_data_cleaned.csv'
-}
+def load_data(asset):
+    return get_registry().frame(asset)
+
+# Série indexée par dates triées : une période = deux recherches dichotomiques et des vues, sans copie
+def load_series(asset):
+    return get_registry().series(asset)
+
+# Panel multi-actifs aligné sur un calendrier commun, en cache par (actifs, alignement)
+@st.cache_resource(max_entries=8)
+def get_panel(assets, alignment):
+    return build_panel({asset: load_data(asset) for asset in assets}, alignment=alignment)
+
+# Rendements excédentaires (R_F aligné en as-of) et sommes cumulées précalculées par actif :
+# Sharpe, Sortino, alpha et bêta de n'importe quelle période sans recalcul sur les données
+@st.cache_resource(max_entries=8)
+def get_excess_returns(asset):
+    df = load_data(asset)
+    return ExcessReturns(df['Date'], df['Close'], benchmark=load_data('S&P 500'))
 
 # Barre latérale pour la sélection de l'actif
 with st.sidebar:
     st.header("Sélection de l'Actif")
-    selected_asset = st.selectbox("Choisissez un actif :", list(data_files.keys()))
+    classe = st.selectbox("Classe d'actifs", ["Toutes"] + get_registry().classes())
+    selected_asset = st.selectbox("Choisissez un actif :", get_registry().symbols(None if classe == "Toutes" else classe))
 
 if selected_asset:
-    df = load_data(data_files[selected_asset])
 
     # Sélection des dates sur une même ligne
-    min_date, max_date = df['Date'].min(), df['Date'].max()
+    min_date, max_date = get_registry().bounds(selected_asset)
     col_start, col_end = st.columns(2)
     with col_start:
         start_date = st.date_input("Début", min_date, min_value=min_date, max_value=max_date)
     with col_end:
         end_date = st.date_input("Fin", max_date, min_value=min_date, max_value=max_date)
-    df = df[(df['Date'] >= pd.to_datetime(start_date)) & (df['Date'] <= pd.to_datetime(end_date))]
+    df = load_series(selected_asset).view(start_date, end_date)
 
     # Calcul des indicateurs techniques
     df['SMA'] = df['Close'].rolling(window=50).mean()
@@ -47,7 +64,8 @@ if selected_asset:
     df['RSI'] = ta.rsi(df['Close'], length=14)
     df['MACD'] = ta.macd(df['Close'], fast=12, slow=26, signal=9)['MACD_12_26_9']
     df['MDD'] = (df['Close'] / df['Close'].cummax() - 1) * 100
-    df['Sharpe_Ratio'] = df['Close'].pct_change(fill_method=None).mean() / df['Close'].pct_change(fill_method=None).std()
+    # Sharpe annualisé sur 90 jours glissants (et non plus une constante recopiée sur toute la colonne)
+    df['Sharpe_Ratio'] = rolling_risk_metrics(to_returns(df['Close']), 90, risk_free=risk_free_rates(df['Date']))['Sharpe Ratio'][0].values
     bollinger = ta.bbands(df['Close'], length=20, std=2)
     df['BB_Upper'] = bollinger['BBU_20_2.0']
     df['BB_Middle'] = bollinger['BBM_20_2.0']
@@ -59,8 +77,8 @@ if selected_asset:
     # Onglet Aperçu
     with tabs[0]:
         st.header(f"Aperçu de {selected_asset}")
-        rendement_moyen = df['Close'].pct_change().mean()
-        volatilite = df['Close'].pct_change().std()
+        metriques = summary_metrics(df['Close'])
+        excedents = get_excess_returns(selected_asset).metrics(start_date, end_date)
         tendance = "Hausse" if df['Close'].iloc[-1] > df['Close'].iloc[0] else "Baisse"
         
         max_close = df['Close'].max()
@@ -68,8 +86,15 @@ if selected_asset:
         min_close = df['Close'].min()
         min_close_date = df[df['Close'] == min_close]['Date'].iloc[0]
         
-        st.metric("Rendement Moyen", f"{rendement_moyen:.2%}")
-        st.metric("Volatilité", f"{volatilite:.2%}")
+        st.metric("Rendement Annuel", f"{metriques['Rendement Annuel']:.2%}")
+        st.metric("Volatilité Annuelle", f"{metriques['Volatilité Annuelle']:.2%}")
+        st.metric("Sharpe Ratio", f"{excedents['Sharpe Ratio']:.2f}")
+        st.metric("Sortino Ratio", f"{excedents['Sortino Ratio']:.2f}")
+        if selected_asset != 'S&P 500':
+            st.metric("Alpha (vs S&P 500)", f"{excedents['Alpha']:.2%}")
+            st.metric("Bêta (vs S&P 500)", f"{excedents['Bêta']:.2f}")
+        st.metric("Ulcer Index", f"{metriques['Ulcer Index']:.2f}")
+        st.metric("Max Drawdown", f"{metriques['Max Drawdown']:.2f}%")
         st.metric("Tendance du marché", tendance)
         st.metric("Close Max", f"{max_close:.2f} ({max_close_date.date()})")
         st.metric("Close Min", f"{min_close:.2f} ({min_close_date.date()})")
@@ -119,22 +144,34 @@ if selected_asset:
                         else:
                             st.session_state.selected_indicators.append(indicateur)
 
+        # Plage affichée : au-delà de DEFAULT_BUDGET points, les chandeliers sont agrégés en barres plus
+        # larges et les courbes sous-échantillonnées (LTTB) ; zoomer sur une plage courte rend la pleine résolution.
+        visible = df
+        if len(df) > DEFAULT_BUDGET:
+            zoom = st.slider("Plage affichée", min_value=df['Date'].iloc[0].to_pydatetime(), max_value=df['Date'].iloc[-1].to_pydatetime(),
+                             value=(df['Date'].iloc[0].to_pydatetime(), df['Date'].iloc[-1].to_pydatetime()), format="DD/MM/YYYY", key="zoom_details")
+            visible = df.iloc[df['Date'].searchsorted(zoom[0]):df['Date'].searchsorted(zoom[1], side='right')]
+        bars = downsample_ohlc(visible)
+        if len(bars) < len(visible):
+            st.caption(f"{len(visible)} séances agrégées en {len(bars)} barres : zoomez pour la pleine résolution")
+
         # Construction du graphique combiné
         fig = go.Figure()
         fig.add_trace(go.Candlestick(
-            x=df['Date'],
-            open=df['Open'],
-            high=df['High'],
-            low=df['Low'],
-            close=df['Close'],
+            x=bars['Date'],
+            open=bars['Open'],
+            high=bars['High'],
+            low=bars['Low'],
+            close=bars['Close'],
             name="Chandeliers"
         ))
 
         # Ajout des indicateurs sélectionnés
         for indicateur in st.session_state.selected_indicators:
+            x_ind, y_ind = downsample_line(visible['Date'], visible[indicateur])
             fig.add_trace(go.Scatter(
-                x=df['Date'],
-                y=df[indicateur],
+                x=x_ind,
+                y=y_ind,
                 mode='lines',
                 name=indicateur
             ))
@@ -147,27 +184,29 @@ if selected_asset:
         st.header("Comparaison entre actifs")
         assets_to_compare = st.multiselect(
             "Sélectionnez les actifs à comparer", 
-            options=list(data_files.keys()), 
-            default=list(data_files.keys())
+            options=get_registry().symbols(), 
+            default=[selected_asset]
         )
         
+        alignement = st.selectbox("Alignement des calendriers", ALIGNMENTS, index=ALIGNMENTS.index("ffill"))
+        
         if assets_to_compare:
             fig_prices = go.Figure()
             fig_volume = go.Figure()
             
-            for asset in assets_to_compare:
-                temp_df = load_data(data_files[asset])
-                temp_df = temp_df[(temp_df['Date'] >= pd.to_datetime(start_date)) & (temp_df['Date'] <= pd.to_datetime(end_date))]
-                
-                # Normalisation des prix à une échelle de 1000
-                temp_df['Normalized_Close'] = (temp_df['Close'] - temp_df['Close'].min()) / (temp_df['Close'].max() - temp_df['Close'].min()) * 1000
-                
-                # Normalisation des volumes à une échelle de 100
-                temp_df['Normalized_Volume'] = (temp_df['Volume'] - temp_df['Volume'].min()) / (temp_df['Volume'].max() - temp_df['Volume'].min()) * 100
-                
-                # Ajout des courbes
-                fig_prices.add_trace(go.Scatter(x=temp_df['Date'], y=temp_df['Normalized_Close'], mode='lines', name=f"{asset} (Normalisé)"))
-                fig_volume.add_trace(go.Scatter(x=temp_df['Date'], y=temp_df['Normalized_Volume'], mode='lines', name=f"Volume {asset} (Normalisé)"))
+            # Panel aligné (mis en cache) : une seule normalisation vectorisée pour tous les actifs
+            panel = get_panel(tuple(assets_to_compare), alignement).slice(start_date, end_date)
+            
+            # Normalisation des prix à une échelle de 1000 et des volumes à une échelle de 100
+            normalized_close = panel.normalize('Close', 1000)
+            normalized_volume = panel.normalize('Volume', 100)
+            
+            # Ajout des courbes (LTTB pour les prix, min/max pour garder les pics de volume)
+            for i, asset in enumerate(panel.assets):
+                x_close, y_close = downsample_line(panel.dates, normalized_close[:, i])
+                x_volume, y_volume = downsample_line(panel.dates, normalized_volume[:, i], method="minmax")
+                fig_prices.add_trace(go.Scatter(x=x_close, y=y_close, mode='lines', name=f"{asset} (Normalisé)"))
+                fig_volume.add_trace(go.Scatter(x=x_volume, y=y_volume, mode='lines', name=f"Volume {asset} (Normalisé)"))
             
             fig_prices.update_layout(title="Évolution des prix des actifs (Normalisé à 1000)", xaxis_title="Date", yaxis_title="Prix Normalisé")
             fig_volume.update_layout(title="Volume échangé sur le marché (Normalisé à 100)", xaxis_title="Date", yaxis_title="Volume Normalisé")
@@ -0,0 +1,141 @@
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+from fbprophet import Prophet
+from statsmodels.tsa.holtwinters import ExponentialSmoothing
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+from tbats import TBATS
+from train_evaluate_model import MODEL_PARAMS
+
+# Modèles pouvant produire une prévision sur un horizon (la régression logistique n'en fait pas partie)
+FORECAST_MODELS = ["Linear Regression", "Prophet", "Holt-Winters", "ARIMA", "TBATS"]
+
+
+def make_folds(n, initial=730, horizon=180, step=180, window=None):
+    """
+    Découpage walk-forward en tableaux d'indices (aucune copie du DataFrame).
+
+    :param n: Nombre d'observations.
+    :param initial: Taille minimale de la première fenêtre d'entraînement.
+    :param horizon: Nombre de pas prévus par fold.
+    :param step: Décalage entre deux folds.
+    :param window: Taille de la fenêtre glissante ; None pour une fenêtre croissante.
+    :return: (train_start, test_start, test_index) ; test_index est une matrice folds × horizon.
+    """
+    test_start = np.arange(initial, n - horizon + 1, step)
+    if window is None:
+        train_start = np.zeros_like(test_start)
+    else:
+        train_start = np.maximum(test_start - window, 0)
+    test_index = test_start[:, None] + np.arange(horizon)[None, :]
+    return train_start, test_start, test_index
+
+
+def _prophet_init(model):
+    # Paramètres d'un Prophet ajusté, réutilisables comme point de départ de l'optimisation
+    return {name: model.params[name][0] if name in ("delta", "beta") else model.params[name][0][0]
+            for name in ("k", "m", "sigma_obs", "delta", "beta")}
+
+
+def fit_forecast(model_choice, dates, y, test_dates, warm=None):
+    """
+    Ajuste un modèle sur y et prévoit len(test_dates) pas.
+
+    :param warm: Paramètres du fold précédent (ARIMA, Prophet) ou None.
+    :return: (prévisions, paramètres réutilisables pour le fold suivant)
+    """
+    horizon = len(test_dates)
+    if model_choice == "Linear Regression":
+        # Même formulation que train_model : Close(t + horizon) expliqué par Close(t)
+        model = LinearRegression().fit(y[:-horizon].reshape(-1, 1), y[horizon:])
+        return model.predict(y[-horizon:].reshape(-1, 1)), None
+    if model_choice == "Prophet":
+        model = Prophet()
+        train = pd.DataFrame({'ds': dates, 'y': y})
+        if warm is not None:
+            model.fit(train, init=warm)
+        else:
+            model.fit(train)
+        forecast = model.predict(pd.DataFrame({'ds': test_dates}))
+        return forecast['yhat'].values, _prophet_init(model)
+    if model_choice == "Holt-Winters":
+        hw = MODEL_PARAMS["Holt-Winters"]
+        model = ExponentialSmoothing(y, trend=hw["trend"], seasonal=hw["seasonal"],
+                                     seasonal_periods=hw["seasonal_periods"]).fit()
+        return np.asarray(model.forecast(horizon)), None
+    if model_choice == "ARIMA":
+        model = SARIMAX(y, order=MODEL_PARAMS["ARIMA"]["order"]).fit(start_params=warm, disp=False)
+        return np.asarray(model.forecast(horizon)), model.params
+    if model_choice == "TBATS":
+        model = TBATS(seasonal_periods=MODEL_PARAMS["TBATS"]["seasonal_periods"]).fit(y)
+        return np.asarray(model.forecast(steps=horizon)), None
+    raise ValueError(f"Modèle non supporté pour le backtest : {model_choice}")
+
+
+def _run_folds(model_choice, dates, y, train_start, test_index, warm_start):
+    # Folds consécutifs d'un même worker : chaque ajustement part des paramètres du précédent
+    forecasts = np.full(test_index.shape, np.nan)
+    fit_times = np.zeros(len(train_start))
+    warm = None
+    for i, (start, idx) in enumerate(zip(train_start, test_index)):
+        end = idx[0]
+        t0 = time.perf_counter()
+        forecasts[i], params = fit_forecast(model_choice, dates[start:end], y[start:end], dates[idx],
+                                            warm if warm_start else None)
+        fit_times[i] = time.perf_counter() - t0
+        warm = params
+    return forecasts, fit_times
+
+
+def walk_forward(df, model_choice, initial=730, horizon=180, step=180, window=None,
+                 max_workers=None, warm_start=True):
+    """
+    Backtest walk-forward d'un modèle de prévision.
+
+    Les folds sont répartis en blocs contigus sur un pool de processus ; à l'intérieur
+    d'un bloc, les paramètres du fold précédent servent de point de départ (warm start).
+
+    :param df: DataFrame avec les colonnes 'Date' et 'Close'.
+    :return: (tableau par fold, courbe d'erreur par pas d'horizon, matrice des prévisions)
+    """
+    dates = pd.to_datetime(df['Date']).values
+    y = df['Close'].to_numpy(dtype=float)
+    train_start, test_start, test_index = make_folds(len(y), initial, horizon, step, window)
+    if len(test_start) == 0:
+        raise ValueError("Pas assez de données pour un seul fold")
+
+    n_workers = max_workers or min(len(test_start), multiprocessing.cpu_count())
+    chunks = [c for c in np.array_split(np.arange(len(test_start)), n_workers) if len(c)]
+    forecasts = np.full(test_index.shape, np.nan)
+    fit_times = np.zeros(len(test_start))
+    with ProcessPoolExecutor(max_workers=len(chunks), mp_context=multiprocessing.get_context("spawn")) as executor:
+        futures = {executor.submit(_run_folds, model_choice, dates, y, train_start[c], test_index[c], warm_start): c
+                   for c in chunks}
+        for future, c in futures.items():
+            forecasts[c], fit_times[c] = future.result()
+
+    actual = y[test_index]
+    errors = forecasts - actual
+    abs_pct = np.abs(errors) / np.abs(actual) * 100
+
+    folds = pd.DataFrame({
+        'fold': np.arange(len(test_start)),
+        'train_start': dates[train_start],
+        'train_end': dates[test_start - 1],
+        'test_end': dates[test_index[:, -1]],
+        'n_train': test_start - train_start,
+        'rmse': np.sqrt(np.mean(errors ** 2, axis=1)),
+        'mae': np.mean(np.abs(errors), axis=1),
+        'mape': np.mean(abs_pct, axis=1),
+        'fit_time': fit_times,
+    })
+    by_horizon = pd.DataFrame({
+        'step': np.arange(1, horizon + 1),
+        'rmse': np.sqrt(np.mean(errors ** 2, axis=0)),
+        'mae': np.mean(np.abs(errors), axis=0),
+        'mape': np.mean(abs_pct, axis=0),
+    })
+    return folds, by_horizon, forecasts
@@ -0,0 +1,94 @@
+import os
+import time
+import argparse
+import itertools
+import tracemalloc
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+from price_store import open_frame
+from train_evaluate_model import train_model, MODELS
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+ASSETS = {
+    'S&P 500': os.path.join(BASE_DIR, 'sp500_historical_data_cleaned.csv'),
+    'Bitcoin': os.path.join(BASE_DIR, 'bitcoin_historical_data_cleaned.csv'),
+    'Gold': os.path.join(BASE_DIR, 'gold_historical_data_cleaned.csv'),
+}
+
+
+def _run_one(asset, file_path, model_choice, pred_days, start_date=None, end_date=None, output_dir="model_coefficients",
+             trace_memory=True):
+    # Un ajustement (actif, modèle, horizon) dans un processus du pool
+    row = {"asset": asset, "model": model_choice, "horizon": pred_days}
+    df = open_frame(file_path)
+    if start_date is not None:
+        df = df[df['Date'] >= pd.to_datetime(start_date)]
+    if end_date is not None:
+        df = df[df['Date'] <= pd.to_datetime(end_date)]
+    df = df[['Date', 'Close']].copy()
+    row["rows"] = len(df)
+
+    # Temps mesuré sans tracemalloc : il intercepte chaque allocation et pénaliserait
+    # surtout les modèles qui allouent beaucoup, faussant la comparaison
+    start = time.perf_counter()
+    try:
+        model_path, mse, rmse = train_model(df, model_choice, pred_days=pred_days, output_dir=output_dir, refit=True)
+        row.update(mse=float(mse), rmse=float(rmse), model_path=model_path, error=None)
+    except Exception as e:
+        row.update(mse=None, rmse=None, model_path=None, error=repr(e))
+    row["fit_time"] = time.perf_counter() - start
+
+    # Mémoire maximale mesurée par un second ajustement, tracé celui-là
+    row["peak_memory_mb"] = None
+    if trace_memory and row["error"] is None:
+        tracemalloc.start()
+        try:
+            train_model(df, model_choice, pred_days=pred_days, output_dir=output_dir, refit=True)
+            row["peak_memory_mb"] = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+        finally:
+            tracemalloc.stop()
+    return row
+
+
+def run_benchmark(assets=None, models=None, horizons=(50,), max_workers=None, start_date=None, end_date=None,
+                  output_dir="model_coefficients", trace_memory=True):
+    """
+    Lance toutes les combinaisons (actif × modèle × horizon) en parallèle.
+
+    :param assets: Dictionnaire {nom de l'actif: chemin du CSV} (par défaut BTC, Or, S&P 500).
+    :param models: Liste des modèles de train_model (par défaut tous).
+    :param horizons: Horizons de prédiction en jours.
+    :param trace_memory: Mesure la mémoire maximale par un second ajustement sous tracemalloc
+                         (le temps est toujours mesuré sur l'ajustement non tracé).
+    :return: DataFrame de comparaison (MSE, RMSE, temps d'ajustement, mémoire maximale).
+    """
+    assets = assets or ASSETS
+    models = models or MODELS
+    combos = list(itertools.product(assets.items(), models, horizons))
+    rows = []
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        futures = [executor.submit(_run_one, asset, path, model, horizon, start_date, end_date, output_dir, trace_memory)
+                   for (asset, path), model, horizon in combos]
+        for future in as_completed(futures):
+            rows.append(future.result())
+    table = pd.DataFrame(rows)
+    return table.sort_values(["asset", "horizon", "rmse"], na_position="last").reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Comparaison des modèles de prédiction sur tous les actifs")
+    parser.add_argument("--models", nargs="+", default=MODELS)
+    parser.add_argument("--horizons", nargs="+", type=int, default=[50])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--start", default=None)
+    parser.add_argument("--end", default=None)
+    parser.add_argument("--output", default="benchmark_results.csv")
+    parser.add_argument("--no-memory", action="store_true", help="Ne pas mesurer la mémoire (un seul ajustement par combinaison)")
+    args = parser.parse_args()
+
+    results = run_benchmark(models=args.models, horizons=args.horizons, max_workers=args.workers,
+                            start_date=args.start, end_date=args.end, trace_memory=not args.no_memory)
+    results.to_csv(args.output, index=False)
+    print(results.to_string(index=False))
@@ -0,0 +1,50 @@
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+from downsampling import downsample_line, downsample_ohlc, DEFAULT_BUDGET
+
+# Indicateurs superposés aux prix ; les autres (oscillateurs) ont chacun leur panneau
+OVERLAYS = ("SMA", "EMA", "BB_Upper", "BB_Middle", "BB_Lower")
+OSCILLATORS = ("RSI", "MACD", "MDD", "Sharpe_Ratio")
+
+
+def detail_figure(df, indicators=(), title=None, budget=DEFAULT_BUDGET):
+    """
+    Graphique multi-panneaux de la vue Détails : chandeliers et indicateurs superposés,
+    volume, puis un panneau par oscillateur, sur un axe des dates commun.
+    Les séries sont réduites au budget de points (downsampling) avant la construction.
+
+    :param df: DataFrame avec Date, Open, High, Low, Close, Volume et les colonnes d'indicateurs.
+    :param indicators: Indicateurs à tracer (les colonnes absentes sont ignorées).
+    :return: go.Figure
+    """
+    indicators = [i for i in indicators if i in df.columns]
+    overlays = [i for i in indicators if i in OVERLAYS]
+    oscillators = [i for i in indicators if i not in OVERLAYS]
+    has_volume = "Volume" in df.columns
+
+    rows = 1 + has_volume + len(oscillators)
+    heights = [3] + [1] * has_volume + [1.5] * len(oscillators)
+    fig = make_subplots(rows=rows, cols=1, shared_xaxes=True, vertical_spacing=0.03,
+                        row_heights=[h / sum(heights) for h in heights])
+
+    bars = downsample_ohlc(df, budget)
+    fig.add_trace(go.Candlestick(x=bars["Date"], open=bars["Open"], high=bars["High"], low=bars["Low"],
+                                 close=bars["Close"], name="Chandeliers"), row=1, col=1)
+    for indicator in overlays:
+        x, y = downsample_line(df["Date"], df[indicator], budget)
+        fig.add_trace(go.Scatter(x=x, y=y, mode="lines", name=indicator), row=1, col=1)
+    fig.update_yaxes(title_text="Prix", row=1, col=1)
+
+    if has_volume:
+        fig.add_trace(go.Bar(x=bars["Date"], y=bars["Volume"], name="Volume", marker_color="grey"), row=2, col=1)
+        fig.update_yaxes(title_text="Volume", row=2, col=1)
+
+    for row, indicator in enumerate(oscillators, start=2 + has_volume):
+        x, y = downsample_line(df["Date"], df[indicator], budget)
+        fig.add_trace(go.Scatter(x=x, y=y, mode="lines", name=indicator), row=row, col=1)
+        fig.update_yaxes(title_text=indicator, row=row, col=1)
+
+    fig.update_layout(title=title, height=450 + 150 * (rows - 1), xaxis_rangeslider_visible=False,
+                      margin=dict(t=50 if title else 20, b=20))
+    fig.update_xaxes(tickformat="%d-%m-%Y", row=rows, col=1)
+    return fig
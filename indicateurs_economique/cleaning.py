@@ -0,0 +1,89 @@
+import os
+import sys
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Adj Close']
+
+
+def clean_frame(df):
+    """
+    Nettoyage vectorisé d'un DataFrame de prix (reprise de clean_data de Recup_data_yahoo.ipynb) :
+    lignes vides supprimées, valeurs manquantes remplacées par la médiane de la colonne,
+    doublons supprimés, prix arrondis à 2 décimales, volumes entiers.
+
+    :param df: DataFrame brut (colonne 'Date' optionnelle).
+    :return: (DataFrame nettoyé, rapport de qualité sous forme de dictionnaire)
+    """
+    df = df.copy()
+    df.columns = df.columns.str.strip()
+    report = {'rows_in': len(df)}
+
+    if 'Date' in df.columns:
+        df['Date'] = pd.to_datetime(df['Date'])
+        df = df.set_index('Date')
+
+    report['missing'] = {col: int(n) for col, n in df.isnull().sum().items() if n}
+    rows = len(df)
+    df = df.dropna(how='all')
+    report['empty_rows_dropped'] = rows - len(df)
+
+    num_cols = df.select_dtypes(include=['float64', 'int64']).columns
+    df[num_cols] = df[num_cols].fillna(df[num_cols].median())
+
+    # Doublons : une seule ligne par date (ou lignes identiques si le fichier n'a pas de date)
+    rows = len(df)
+    if df.index.name == 'Date':
+        df = df[~df.index.duplicated(keep='last')]
+    else:
+        df = df.drop_duplicates()
+    report['duplicates_dropped'] = rows - len(df)
+
+    price_cols = [col for col in PRICE_COLUMNS if col in df.columns]
+    df[price_cols] = df[price_cols].astype(float).round(2)
+    if 'Volume' in df.columns:
+        df['Volume'] = df['Volume'].fillna(0).astype(np.int64)
+
+    report['rows_out'] = len(df)
+    if df.index.name == 'Date' and len(df):
+        report['first_date'] = df.index.min().strftime('%Y-%m-%d')
+        report['last_date'] = df.index.max().strftime('%Y-%m-%d')
+    return df.reset_index() if df.index.name == 'Date' else df, report
+
+
+def clean_file(file_path, output_file):
+    # Étape unitaire exécutée dans un processus du pool ; les erreurs vont dans le rapport.
+    report = {'source': file_path, 'output': output_file}
+    try:
+        df, quality = clean_frame(pd.read_csv(file_path))
+        df.to_csv(output_file, index=False)
+        report.update(quality, error=None)
+    except Exception as e:
+        report['error'] = repr(e)
+    return report
+
+
+def clean_universe(files, output_dir=".", max_workers=None):
+    """
+    Nettoie un ensemble de fichiers en parallèle.
+
+    :param files: Dictionnaire {actif: chemin du CSV brut}.
+    :param output_dir: Dossier des fichiers '<actif>_historical_data_cleaned.csv'.
+    :return: Rapport de qualité (une ligne par actif).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        futures = {asset: executor.submit(clean_file, path,
+                                          os.path.join(output_dir, f"{asset}_historical_data_cleaned.csv"))
+                   for asset, path in files.items()}
+        reports = [dict(asset=asset, **future.result()) for asset, future in futures.items()]
+    return pd.DataFrame(reports).set_index('asset')
+
+
+if __name__ == "__main__":
+    # python indicateurs_economique/cleaning.py <dossier de sortie> <fichier brut>...
+    output_dir, paths = sys.argv[1], sys.argv[2:]
+    files = {os.path.basename(p).split('_historical_data')[0]: p for p in paths}
+    print(clean_universe(files, output_dir).to_string())
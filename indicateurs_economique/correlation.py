@@ -0,0 +1,161 @@
+from statistics import NormalDist
+import numpy as np
+import pandas as pd
+
+METHODS = ("pearson", "spearman")
+
+
+def _prepare(returns):
+    # Tableau dates × actifs sans lignes incomplètes (première ligne de rendements, actif non coté)
+    index = returns.index if isinstance(returns, pd.DataFrame) else None
+    x = np.asarray(returns, dtype=float)
+    if x.ndim == 1:
+        x = x[:, None]
+    keep = ~np.isnan(x).any(axis=1)
+    return x[keep], (index[keep] if index is not None else np.flatnonzero(keep))
+
+
+def _rank(x):
+    # Rangs moyens par colonne (ex aequo compris), pour la corrélation de Spearman
+    return pd.DataFrame(x).rank(method="average").to_numpy()
+
+
+def _from_moments(n, total, cross):
+    # Matrice de corrélation à partir de n, Σx et Σxxᵀ
+    cov = cross - np.outer(total, total) / n
+    std = np.sqrt(np.clip(np.diag(cov), 0, None))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = cov / np.outer(std, std)
+    np.clip(corr, -1, 1, out=corr)
+    np.fill_diagonal(corr, np.where(std > 0, 1.0, np.nan))
+    return corr
+
+
+def correlation_matrix(returns, method="pearson"):
+    """
+    Matrice de corrélation entre actifs sur toute la période.
+
+    :param returns: DataFrame (ou tableau) dates × actifs de rendements ; les lignes
+                    incomplètes sont ignorées.
+    :param method: 'pearson' ou 'spearman'.
+    :return: DataFrame actifs × actifs si returns est un DataFrame, sinon tableau numpy.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Méthode inconnue : {method} (attendu : {METHODS})")
+    x, _ = _prepare(returns)
+    if method == "spearman":
+        x = _rank(x)
+    corr = _from_moments(len(x), x.sum(axis=0), x.T @ x) if len(x) > 1 else np.full((x.shape[1],) * 2, np.nan)
+    if isinstance(returns, pd.DataFrame):
+        return pd.DataFrame(corr, index=returns.columns, columns=returns.columns)
+    return corr
+
+
+def critical_correlation(n, alpha=0.05):
+    # |r| minimal significatif au seuil alpha (test bilatéral, transformation de Fisher)
+    if n <= 3:
+        return 1.0
+    return float(np.tanh(NormalDist().inv_cdf(1 - alpha / 2) / np.sqrt(n - 3)))
+
+
+def significant(corr, n, threshold=0.5, alpha=0.05):
+    """
+    Ne garde que les corrélations fortes et significatives (les autres valent NaN),
+    comme le filtre |corr| > 0.5 de Matrice_cor.ipynb, complété d'un test sur n observations.
+    """
+    values = np.asarray(corr, dtype=float)
+    keep = np.abs(values) >= max(threshold, critical_correlation(n, alpha))
+    np.fill_diagonal(keep, False)
+    filtered = np.where(keep, values, np.nan)
+    if isinstance(corr, pd.DataFrame):
+        return pd.DataFrame(filtered, index=corr.index, columns=corr.columns)
+    return filtered
+
+
+class RollingCorrelation:
+    """
+    Corrélation de Pearson sur une fenêtre glissante, mise à jour incrémentale de Σx et Σxxᵀ.
+
+    Chaque bloc de lignes ajouté coûte O(k·N²) (ajout des nouvelles lignes, retrait des
+    lignes sorties de la fenêtre) au lieu de O(fenêtre·N²) pour un recalcul complet.
+    Les sommes sont recalculées depuis le tampon toutes les `window` lignes pour borner
+    l'erreur d'arrondi accumulée.
+    """
+
+    def __init__(self, n_assets, window=90):
+        self.window = window
+        self.buffer = np.zeros((window, n_assets))
+        self.count = 0
+        self.total = np.zeros(n_assets)
+        self.cross = np.zeros((n_assets, n_assets))
+        self._since_resync = 0
+
+    def __len__(self):
+        return min(self.count, self.window)
+
+    def _resync(self):
+        rows = self.buffer[:len(self)]
+        self.total = rows.sum(axis=0)
+        self.cross = rows.T @ rows
+        self._since_resync = 0
+
+    def update(self, rows):
+        rows = np.atleast_2d(np.asarray(rows, dtype=float))
+        if len(rows) >= self.window:
+            # La fenêtre est entièrement renouvelée : recalcul direct
+            start = self.count + len(rows) - self.window
+            self.buffer[(start + np.arange(self.window)) % self.window] = rows[-self.window:]
+            self.count += len(rows)
+            self._resync()
+            return self
+        position = self.count + np.arange(len(rows))
+        slots = position % self.window
+        old = self.buffer[slots[position >= self.window]]
+        self.total += rows.sum(axis=0) - old.sum(axis=0)
+        self.cross += rows.T @ rows - old.T @ old
+        self.buffer[slots] = rows
+        self.count += len(rows)
+        self._since_resync += len(rows)
+        if self._since_resync >= self.window:
+            self._resync()
+        return self
+
+    def matrix(self):
+        n = len(self)
+        if n < 2:
+            return np.full(self.cross.shape, np.nan)
+        return _from_moments(n, self.total, self.cross)
+
+
+def rolling_correlation(returns, window=90, method="pearson", step=1, min_periods=None, dtype=np.float32):
+    """
+    Matrices de corrélation sur fenêtre glissante, une toutes les `step` dates.
+
+    Pearson : une seule passe sur les données (RollingCorrelation, ajouts par blocs de `step`
+    lignes). Spearman : les rangs dépendent de la fenêtre, chaque matrice est donc calculée
+    sur les rangs de sa fenêtre.
+
+    :param returns: DataFrame (ou tableau) dates × actifs de rendements.
+    :param step: Pas entre deux matrices (ex. 5 pour une image par semaine dans une animation).
+    :param dtype: Type des matrices renvoyées (float32 : moitié moins de mémoire pour N² × images).
+    :return: (dates de fin de fenêtre, tableau images × actifs × actifs)
+    """
+    if method not in METHODS:
+        raise ValueError(f"Méthode inconnue : {method} (attendu : {METHODS})")
+    x, index = _prepare(returns)
+    min_periods = window if min_periods is None else min_periods
+    ends = np.arange(max(min_periods, 2) - 1, len(x), step)
+    frames = np.empty((len(ends), x.shape[1], x.shape[1]), dtype=dtype)
+
+    if method == "pearson":
+        engine = RollingCorrelation(x.shape[1], window)
+        done = 0
+        for i, end in enumerate(ends):
+            engine.update(x[done:end + 1])
+            done = end + 1
+            frames[i] = engine.matrix()
+    else:
+        for i, end in enumerate(ends):
+            ranks = _rank(x[max(0, end + 1 - window):end + 1])
+            frames[i] = _from_moments(len(ranks), ranks.sum(axis=0), ranks.T @ ranks)
+    return index[ends], frames
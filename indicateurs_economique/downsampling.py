@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+# Nombre maximal de points envoyés au navigateur par série (au-delà : agrégation / sous-échantillonnage)
+DEFAULT_BUDGET = 2000
+LINE_METHODS = ("lttb", "minmax")
+
+
+def _as_float(x):
+    # Dates converties en nombres (ns) pour les calculs d'aire de LTTB
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype("datetime64[ns]").astype(np.int64).astype(float)
+    return x.astype(float)
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets : indices des points à garder pour tracer y(x) avec
+    n_out points en conservant la forme visuelle de la courbe. Les NaN (début d'une
+    moyenne mobile par exemple) sont ignorés.
+    """
+    y = np.asarray(y, dtype=float)
+    finite = np.flatnonzero(~np.isnan(y))
+    if len(finite) <= n_out or n_out < 3:
+        return finite
+    xs, ys = _as_float(x)[finite], y[finite]
+    n = len(finite)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Sommet suivant : moyenne du seau suivant (ou dernier point)
+        nlo, nhi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        cx, cy = xs[nlo:nhi].mean(), ys[nlo:nhi].mean()
+        area = np.abs((xs[a] - cx) * (ys[lo:hi] - ys[a]) - (xs[a] - xs[lo:hi]) * (cy - ys[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return finite[keep]
+
+
+def minmax_indices(y, n_out):
+    """
+    Min/max par seau : indices du minimum et du maximum de chaque seau ((n_out - 2) // 2 seaux),
+    plus le premier et le dernier point. Garde tous les extrêmes (pics, creux de drawdown).
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= n_out or n_out < 4:
+        return np.arange(n)
+    n_buckets = (n_out - 2) // 2
+    size = -(-n // n_buckets)
+    padded = np.pad(y, (0, n_buckets * size - n), mode="edge").reshape(n_buckets, size)
+    offsets = np.arange(n_buckets) * size
+    lows = offsets + np.argmin(np.where(np.isnan(padded), np.inf, padded), axis=1)
+    highs = offsets + np.argmax(np.where(np.isnan(padded), -np.inf, padded), axis=1)
+    return np.unique(np.concatenate([[0, n - 1], np.minimum(lows, n - 1), np.minimum(highs, n - 1)]))
+
+
+def downsample_line(x, y, budget=DEFAULT_BUDGET, method="lttb"):
+    """
+    Réduit une série à au plus `budget` points.
+
+    :param x: Abscisses (dates ou nombres), triées.
+    :param method: 'lttb' (forme de la courbe) ou 'minmax' (extrêmes exacts).
+    :return: (x, y) réduits, ou les séries d'origine si elles tiennent dans le budget.
+    """
+    if method not in LINE_METHODS:
+        raise ValueError(f"Méthode inconnue : {method} (attendu : {LINE_METHODS})")
+    x, y = np.asarray(x), np.asarray(y, dtype=float)
+    if len(y) <= budget:
+        return x, y
+    idx = lttb_indices(x, y, budget) if method == "lttb" else minmax_indices(y, budget)
+    return x[idx], y[idx]
+
+
+def downsample_ohlc(df, budget=DEFAULT_BUDGET):
+    """
+    Agrège des barres OHLC consécutives en barres plus larges pour tenir dans `budget`
+    chandeliers : Open du premier jour, High max, Low min, Close du dernier jour, Volume cumulé.
+    La date d'une barre agrégée est celle de son premier jour.
+
+    :param df: DataFrame avec Date, Open, High, Low, Close (Volume optionnel).
+    :return: DataFrame agrégé (ou df inchangé s'il tient dans le budget).
+    """
+    n = len(df)
+    if n <= budget:
+        return df
+    size = -(-n // budget)
+    starts = np.arange(0, n, size)
+    ends = np.append(starts[1:], n) - 1
+    bars = {
+        "Date": df["Date"].to_numpy()[starts],
+        "Open": df["Open"].to_numpy(dtype=float)[starts],
+        "High": np.fmax.reduceat(df["High"].to_numpy(dtype=float), starts),
+        "Low": np.fmin.reduceat(df["Low"].to_numpy(dtype=float), starts),
+        "Close": df["Close"].to_numpy(dtype=float)[ends],
+    }
+    if "Volume" in df.columns:
+        bars["Volume"] = np.add.reduceat(df["Volume"].to_numpy(), starts)
+    return pd.DataFrame(bars)
@@ -0,0 +1,151 @@
+import os
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from risk_metrics import TRADING_DAYS
+
+RISK_FREE_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Rendement_sans_risque.csv")
+DAYS_PER_YEAR = 365
+
+
+@lru_cache(maxsize=4)
+def _risk_free_curve(path, mtime_ns):
+    """
+    Courbe de capitalisation du taux sans risque : dates de R_F (jours), taux annuels
+    continus log(1 + R_F/100) et logarithme cumulé de la richesse à chaque date de R_F.
+    mtime_ns fait partie de la clé du cache : un fichier modifié est relu.
+    """
+    df = pd.read_csv(path, parse_dates=["Date"]).dropna(subset=["R_F"]).sort_values("Date")
+    days = df["Date"].values.astype("datetime64[D]").astype(np.int64)
+    rates = np.log1p(df["R_F"].to_numpy(dtype=float) / 100) / DAYS_PER_YEAR
+    log_wealth = np.zeros(len(days))
+    np.cumsum(rates[:-1] * np.diff(days), out=log_wealth[1:])
+    return days, rates, log_wealth
+
+
+def risk_free_log_wealth(dates, path=RISK_FREE_CSV):
+    """
+    Logarithme de la richesse d'un placement au taux sans risque à chaque date (jointure as-of :
+    le dernier taux publié s'applique jusqu'à la publication suivante, week-ends compris).
+    NaN avant le début de la série R_F.
+    """
+    days, rates, log_wealth = _risk_free_curve(path, os.stat(path).st_mtime_ns)
+    t = pd.to_datetime(np.asarray(dates)).values.astype("datetime64[D]").astype(np.int64)
+    k = np.searchsorted(days, t, side="right") - 1
+    out = log_wealth[np.maximum(k, 0)] + rates[np.maximum(k, 0)] * (t - days[np.maximum(k, 0)])
+    out[k < 0] = np.nan
+    return out
+
+
+def risk_free_rates(dates, path=RISK_FREE_CSV):
+    """
+    Rendement sans risque de chaque période [date précédente, date] du calendrier d'un actif.
+    Le taux annuel en pourcentage est capitalisé sur les jours calendaires écoulés : un lundi
+    porte le week-end pour le S&P 500, un jour de BTC ne porte qu'un jour.
+
+    :param dates: Dates de cotation triées de l'actif.
+    :return: Tableau aligné sur dates (premier élément NaN, comme pct_change()).
+    """
+    log_wealth = risk_free_log_wealth(dates, path)
+    rates = np.full(len(log_wealth), np.nan)
+    rates[1:] = np.expm1(np.diff(log_wealth))
+    return rates
+
+
+def excess_returns(returns, path=RISK_FREE_CSV):
+    """
+    Rendements excédentaires d'une matrice dates × actifs (DataFrame indexé par date) dont
+    les actifs n'ont pas tous le même calendrier : pour chaque actif, le taux sans risque est
+    capitalisé entre ses deux cotations consécutives.
+    """
+    log_wealth = risk_free_log_wealth(returns.index, path)
+    values = returns.to_numpy(dtype=float)
+    rates = np.full(values.shape, np.nan)
+    for j in range(values.shape[1]):
+        idx = np.flatnonzero(~np.isnan(values[:, j]))
+        rates[idx[1:], j] = np.expm1(log_wealth[idx[1:]] - log_wealth[idx[:-1]])
+    return pd.DataFrame(values - rates, index=returns.index, columns=returns.columns)
+
+
+class ExcessReturns:
+    """
+    Rendements excédentaires d'un actif (et d'un indice de référence optionnel) avec sommes
+    cumulées précalculées : Sharpe, Sortino, alpha et bêta sur n'importe quelle période
+    en O(log n) (deux recherches dichotomiques et des différences de sommes).
+
+    :param dates: Dates de cotation triées de l'actif.
+    :param close: Clôtures de l'actif.
+    :param benchmark: DataFrame Date/Close de l'indice de référence (aligné en as-of).
+    """
+
+    def __init__(self, dates, close, benchmark=None, periods=TRADING_DAYS, path=RISK_FREE_CSV):
+        self.dates = pd.DatetimeIndex(dates)
+        self.periods = periods
+        close = np.asarray(close, dtype=float)
+        returns = np.full(len(close), np.nan)
+        returns[1:] = close[1:] / close[:-1] - 1
+        excess = returns - np.nan_to_num(risk_free_rates(self.dates, path))
+
+        columns = {"r": returns, "ex": excess, "neg": np.where(excess < 0, excess, np.nan)}
+        if benchmark is not None:
+            bench_days = pd.DatetimeIndex(benchmark["Date"])
+            k = bench_days.searchsorted(self.dates, side="right") - 1
+            bench_close = np.where(k >= 0, np.asarray(benchmark["Close"], dtype=float)[np.maximum(k, 0)], np.nan)
+            bench = np.full(len(bench_close), np.nan)
+            bench[1:] = bench_close[1:] / bench_close[:-1] - 1
+            bench_excess = bench - np.nan_to_num(risk_free_rates(self.dates, path))
+            both = ~np.isnan(excess) & ~np.isnan(bench_excess)
+            columns.update(pair=np.where(both, excess, np.nan), m=np.where(both, bench_excess, np.nan))
+            columns["pair_m"] = columns["pair"] * columns["m"]
+
+        # Sommes cumulées (n, Σx, Σx²) de chaque série, avec une ligne de zéros en tête
+        self._sums = {}
+        for name, x in columns.items():
+            valid = ~np.isnan(x)
+            x = np.where(valid, x, 0.0)
+            stack = np.column_stack([valid, x, x * x]).astype(float)
+            cum = np.zeros((len(x) + 1, 3))
+            np.cumsum(stack, axis=0, out=cum[1:])
+            self._sums[name] = cum
+
+    def _range(self, start, end):
+        # Comme sur un DataFrame filtré : le premier rendement de la période n'est pas compté
+        lo = self.dates.searchsorted(pd.Timestamp(start), side="left") + 1 if start is not None else 0
+        hi = self.dates.searchsorted(pd.Timestamp(end), side="right") if end is not None else len(self.dates)
+        return lo, max(lo, hi)
+
+    def _moments(self, name, lo, hi, ddof=1):
+        n, s, s2 = self._sums[name][hi] - self._sums[name][lo]
+        if n < 2:
+            return n, np.nan, np.nan
+        return n, s / n, max(s2 - s * s / n, 0.0) / (n - ddof)
+
+    def metrics(self, start=None, end=None):
+        """
+        Métriques sur la période [start, end] (bornes incluses, None = tout l'historique).
+
+        :return: Dictionnaire : Rendement Annuel, Rendement Excédentaire, Volatilité Annuelle,
+                 Sharpe Ratio, Sortino Ratio (+ Alpha, Bêta si un indice de référence est fourni).
+        """
+        lo, hi = self._range(start, end)
+        _, mean, var = self._moments("r", lo, hi)
+        _, ex_mean, ex_var = self._moments("ex", lo, hi)
+        # Écart-type des rendements négatifs sans correction (même définition que risk_metrics)
+        _, _, neg_var = self._moments("neg", lo, hi, ddof=0)
+        p = self.periods
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result = {
+                "Rendement Annuel": mean * p,
+                "Rendement Excédentaire": ex_mean * p,
+                "Volatilité Annuelle": np.sqrt(var * p),
+                "Sharpe Ratio": ex_mean * p / np.sqrt(ex_var * p),
+                "Sortino Ratio": ex_mean * p / np.sqrt(neg_var * p),
+            }
+            if "m" in self._sums:
+                n, a_mean, _ = self._moments("pair", lo, hi)
+                _, m_mean, m_var = self._moments("m", lo, hi)
+                cross = (self._sums["pair_m"][hi, 1] - self._sums["pair_m"][lo, 1] - n * a_mean * m_mean) / (n - 1)
+                beta = cross / m_var
+                result["Alpha"] = (a_mean - beta * m_mean) * p
+                result["Bêta"] = beta
+        return result
@@ -0,0 +1,104 @@
+import os
+import json
+import time
+import hashlib
+import numpy as np
+from model_registry import REGISTRY_DIR, data_fingerprint
+
+WARM_START_DIR = "warm_start"
+# Lignes de tête qui identifient une série : un ajout de barres les laisse intactes
+PREFIX_ROWS = 30
+
+COLD, UNCHANGED, APPEND, REWRITE = "cold", "unchanged", "append", "rewrite"
+
+
+def stan_init(model):
+    """
+    Paramètres optimisés d'un Prophet ajusté, au format attendu par fit(init=...)
+    (k, m, sigma_obs scalaires ; delta, beta vecteurs), convertis en types JSON.
+    """
+    init = {name: float(model.params[name][0][0]) for name in ("k", "m", "sigma_obs")}
+    init.update({name: np.asarray(model.params[name][0], dtype=float).tolist() for name in ("delta", "beta")})
+    return init
+
+
+def _fingerprint(df):
+    # Empreinte des colonnes Prophet (ds, y, régresseurs) : ds est traité comme une date
+    frame = df.rename(columns={"ds": "Date"})
+    return data_fingerprint(frame, list(frame.columns))
+
+
+class IncrementalProphet:
+    """
+    Réajustements incrémentaux de Prophet : les paramètres du dernier ajustement d'une série
+    servent de point de départ à l'optimisation suivante (fit(init=...)), ce qui ne coûte
+    qu'une fraction d'un ajustement à froid quand seules quelques barres ont été ajoutées.
+
+    Une série est suivie par lignée (configuration du modèle + empreinte des PREFIX_ROWS premières
+    lignes) dans model_coefficients/warm_start/<clé>.json. Un historique réécrit (lignes déjà vues
+    modifiées ou supprimées) invalide le point de départ : ajustement complet.
+    """
+
+    def __init__(self, root=REGISTRY_DIR, prefix_rows=PREFIX_ROWS):
+        self.root = os.path.join(root, WARM_START_DIR)
+        self.prefix_rows = prefix_rows
+        os.makedirs(self.root, exist_ok=True)
+
+    def lineage_key(self, df, config):
+        payload = json.dumps({
+            "config": config,
+            "prefix": _fingerprint(df.iloc[:self.prefix_rows]),
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+    def _path(self, key):
+        return os.path.join(self.root, f"{key}.json")
+
+    def state(self, key):
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def change(self, df, state):
+        # Nature du changement depuis le dernier ajustement : ajout pur ou historique réécrit
+        if state is None:
+            return COLD
+        rows = state["rows"]
+        if len(df) < rows or _fingerprint(df.iloc[:rows]) != state["fingerprint"]:
+            return REWRITE
+        return UNCHANGED if len(df) == rows else APPEND
+
+    def fit(self, df, make_model, config, **fit_kwargs):
+        """
+        Ajuste un Prophet sur df, à chaud si le dernier ajustement de la lignée s'applique.
+
+        :param df: DataFrame Prophet (ds, y et régresseurs éventuels), trié par date.
+        :param make_model: Fonction sans argument renvoyant un Prophet configuré non ajusté
+                           (saisonnalités, add_regressor...).
+        :param config: Description JSON de cette configuration (fait partie de la lignée).
+        :return: (modèle ajusté, mode : 'cold', 'unchanged', 'append' ou 'rewrite').
+        """
+        key = self.lineage_key(df, config)
+        state = self.state(key)
+        mode = self.change(df, state)
+        start = time.perf_counter()
+        model = None
+        if mode in (UNCHANGED, APPEND):
+            try:
+                model = make_model().fit(df, init=state["init"], **fit_kwargs)
+            except (RuntimeError, ValueError):
+                # Dimensions incompatibles (ex. configuration modifiée hors lignée) : repli à froid
+                model, mode = None, REWRITE
+        if model is None:
+            model = make_model().fit(df, **fit_kwargs)
+
+        state = {"key": key, "config": config, "rows": len(df), "fingerprint": _fingerprint(df),
+                 "last_date": str(df["ds"].iloc[-1]), "init": stan_init(model), "mode": mode,
+                 "fit_time": time.perf_counter() - start, "fitted_at": time.time()}
+        path = self._path(key)
+        with open(path + ".tmp", "w") as f:
+            json.dump(state, f, indent=4, default=str)
+        os.replace(path + ".tmp", path)
+        return model, mode
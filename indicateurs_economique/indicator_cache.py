@@ -0,0 +1,82 @@
+import threading
+from collections import OrderedDict
+import pandas as pd
+
+
+def make_key(asset, start_date, end_date, params):
+    # Clé normalisée : les dates sont ramenées au jour, les paramètres triés.
+    return (
+        asset,
+        pd.Timestamp(start_date).strftime("%Y-%m-%d"),
+        pd.Timestamp(end_date).strftime("%Y-%m-%d"),
+        tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in params.items())),
+    )
+
+
+class IndicatorCache:
+    """
+    Cache LRU des DataFrames d'indicateurs par (actif, date de début, date de fin, paramètres).
+    La mémoire est bornée par un nombre d'entrées et une taille totale en octets.
+    Les DataFrames renvoyés sont partagés : ils ne doivent pas être modifiés par l'appelant.
+    """
+
+    def __init__(self, max_entries=32, max_bytes=256 * 1024 ** 2):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def nbytes(self):
+        return sum(self._sizes.values())
+
+    def get(self, asset, start_date, end_date, params, compute):
+        """
+        :param compute: Fonction sans argument qui construit le DataFrame en cas d'absence.
+        :return: DataFrame des indicateurs (mis en cache).
+        """
+        key = make_key(asset, start_date, end_date, params)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        frame = compute()
+
+        with self._lock:
+            self._entries[key] = frame
+            self._entries.move_to_end(key)
+            self._sizes[key] = int(frame.memory_usage(index=True).sum())
+            self._evict()
+        return frame
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self.nbytes > self.max_bytes):
+            # On garde toujours l'entrée la plus récente, même si elle dépasse seule le budget.
+            if len(self._entries) == 1:
+                break
+            key, _ = self._entries.popitem(last=False)
+            self._sizes.pop(key, None)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.nbytes,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,279 @@
+import os
+import sys
+import glob
+import json
+import math
+from collections import deque
+import numpy as np
+import pandas as pd
+
+# Colonnes des fichiers *_with_indicators.csv (même ordre que les notebooks Indic_actif)
+PRICE_COLUMNS = ["Close", "High", "Low", "Open", "Volume"]
+FILE_COLUMNS = ["Log_Returns", "Volatility", "Daily_Return", "SMA_3", "EMA_3", "RSI_14",
+                "MACD", "Signal_MACD", "Upper_BB", "Lower_BB"]
+
+DEFAULT_PARAMS = {
+    "sma_window": 3,
+    "ema_span": 3,
+    "rsi_window": 14,
+    "rsi_mode": "simple",   # 'simple' (moyennes mobiles, notebooks) ou 'wilder'
+    "macd_fast": 12,
+    "macd_slow": 26,
+    "macd_signal": 9,
+    "bb_window": 20,
+    "bb_std": 2,
+    "vol_window": 30,
+}
+
+
+def _window_std(values):
+    # Écart-type échantillon (ddof=1), comme pandas rolling().std()
+    return float(np.std(np.fromiter(values, dtype=float), ddof=1))
+
+
+class IndicatorEngine:
+    """
+    Calcul incrémental des indicateurs techniques : chaque nouvelle barre met à jour
+    l'état (EMA, moyennes RSI, buffers circulaires des fenêtres, plus haut historique)
+    sans relire l'historique. Ajouter N barres coûte O(N).
+    """
+
+    def __init__(self, **params):
+        self.params = dict(DEFAULT_PARAMS, **params)
+        p = self.params
+        self.count = 0
+        self.prev_close = None
+        self.ema = None
+        self.ema_fast = None
+        self.ema_slow = None
+        self.signal = None
+        self.peak = None
+        self.avg_gain = None
+        self.avg_loss = None
+        self.sma_buf = deque(maxlen=p["sma_window"])
+        self.bb_buf = deque(maxlen=p["bb_window"])
+        self.vol_buf = deque(maxlen=p["vol_window"])
+        self.gain_buf = deque(maxlen=p["rsi_window"])
+        self.loss_buf = deque(maxlen=p["rsi_window"])
+
+    @property
+    def names(self):
+        p = self.params
+        return {
+            "sma": f"SMA_{p['sma_window']}",
+            "ema": f"EMA_{p['ema_span']}",
+            "rsi": f"RSI_{p['rsi_window']}",
+        }
+
+    def columns(self):
+        n = self.names
+        return ["Log_Returns", "Volatility", "Daily_Return", n["sma"], n["ema"], n["rsi"],
+                "MACD", "Signal_MACD", "Upper_BB", "Lower_BB", "MDD"]
+
+    @staticmethod
+    def _ema_step(previous, value, span):
+        if previous is None:
+            return value
+        alpha = 2.0 / (span + 1)
+        return alpha * value + (1 - alpha) * previous
+
+    def _rsi_step(self, delta):
+        p = self.params
+        n = p["rsi_window"]
+        gain = max(delta, 0.0)
+        loss = max(-delta, 0.0)
+        self.gain_buf.append(gain)
+        self.loss_buf.append(loss)
+        if p["rsi_mode"] == "wilder":
+            # Lissage de Wilder : amorçage par la moyenne simple des n premières variations
+            if self.avg_gain is None:
+                if len(self.gain_buf) < n:
+                    return math.nan
+                self.avg_gain = sum(self.gain_buf) / n
+                self.avg_loss = sum(self.loss_buf) / n
+            else:
+                self.avg_gain = (self.avg_gain * (n - 1) + gain) / n
+                self.avg_loss = (self.avg_loss * (n - 1) + loss) / n
+            avg_gain, avg_loss = self.avg_gain, self.avg_loss
+        else:
+            if len(self.gain_buf) < n:
+                return math.nan
+            avg_gain = sum(self.gain_buf) / n
+            avg_loss = sum(self.loss_buf) / n
+        if avg_loss == 0:
+            return 100.0 if avg_gain > 0 else math.nan
+        return 100 - 100 / (1 + avg_gain / avg_loss)
+
+    def step(self, close):
+        p = self.params
+        close = float(close)
+        nan = math.nan
+
+        if self.prev_close is None:
+            log_return = daily_return = nan
+            delta = 0.0
+        else:
+            log_return = math.log(close / self.prev_close)
+            daily_return = close / self.prev_close - 1
+            delta = close - self.prev_close
+            self.vol_buf.append(log_return)
+
+        volatility = nan
+        if len(self.vol_buf) == p["vol_window"]:
+            volatility = _window_std(self.vol_buf) * math.sqrt(252)
+
+        self.sma_buf.append(close)
+        sma = sum(self.sma_buf) / len(self.sma_buf) if len(self.sma_buf) == p["sma_window"] else nan
+
+        self.ema = self._ema_step(self.ema, close, p["ema_span"])
+        rsi = self._rsi_step(delta)
+
+        self.ema_fast = self._ema_step(self.ema_fast, close, p["macd_fast"])
+        self.ema_slow = self._ema_step(self.ema_slow, close, p["macd_slow"])
+        macd = self.ema_fast - self.ema_slow
+        self.signal = self._ema_step(self.signal, macd, p["macd_signal"])
+
+        self.bb_buf.append(close)
+        upper = lower = nan
+        if len(self.bb_buf) == p["bb_window"]:
+            mean = sum(self.bb_buf) / p["bb_window"]
+            std = _window_std(self.bb_buf)
+            upper = mean + p["bb_std"] * std
+            lower = mean - p["bb_std"] * std
+
+        self.peak = close if self.peak is None else max(self.peak, close)
+        mdd = (close / self.peak - 1) * 100
+
+        self.prev_close = close
+        self.count += 1
+        return (log_return, volatility, daily_return, sma, self.ema, rsi,
+                macd, self.signal, upper, lower, mdd)
+
+    def update(self, closes):
+        """
+        Ajoute de nouvelles barres et renvoie uniquement les indicateurs de ces barres.
+
+        :param closes: Séquence des nouveaux prix de clôture (ordre chronologique).
+        :return: DataFrame des indicateurs, une ligne par barre ajoutée.
+        """
+        rows = [self.step(close) for close in closes]
+        return pd.DataFrame(rows, columns=self.columns(), dtype=float)
+
+    def to_dict(self):
+        return {
+            "params": self.params,
+            "count": self.count,
+            "prev_close": self.prev_close,
+            "ema": self.ema,
+            "ema_fast": self.ema_fast,
+            "ema_slow": self.ema_slow,
+            "signal": self.signal,
+            "peak": self.peak,
+            "avg_gain": self.avg_gain,
+            "avg_loss": self.avg_loss,
+            "sma_buf": list(self.sma_buf),
+            "bb_buf": list(self.bb_buf),
+            "vol_buf": list(self.vol_buf),
+            "gain_buf": list(self.gain_buf),
+            "loss_buf": list(self.loss_buf),
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        engine = cls(**state["params"])
+        for key in ["count", "prev_close", "ema", "ema_fast", "ema_slow", "signal",
+                    "peak", "avg_gain", "avg_loss"]:
+            setattr(engine, key, state[key])
+        for key in ["sma_buf", "bb_buf", "vol_buf", "gain_buf", "loss_buf"]:
+            getattr(engine, key).extend(state[key])
+        return engine
+
+
+def state_path(indicators_csv):
+    return os.path.splitext(indicators_csv)[0] + ".state.json"
+
+
+def save_state(engine, indicators_csv, last_date):
+    state = engine.to_dict()
+    state["last_date"] = pd.Timestamp(last_date).strftime("%Y-%m-%d")
+    tmp_path = state_path(indicators_csv) + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=4)
+    os.replace(tmp_path, state_path(indicators_csv))
+
+
+def load_state(indicators_csv):
+    path = state_path(indicators_csv)
+    if not os.path.exists(path):
+        return None, None
+    with open(path) as f:
+        state = json.load(f)
+    return IndicatorEngine.from_dict(state), pd.Timestamp(state["last_date"])
+
+
+def _file_rows(bars, indicators):
+    out = bars[["Date"] + PRICE_COLUMNS].reset_index(drop=True).copy()
+    out["Date"] = pd.to_datetime(out["Date"]).dt.strftime("%Y-%m-%d")
+    for col in FILE_COLUMNS:
+        out[col] = indicators[col].values
+    return out
+
+
+def build_indicator_file(prices_csv, indicators_csv, **params):
+    """
+    Reconstruction complète d'un fichier *_with_indicators.csv et de son état.
+    À n'utiliser qu'une fois ; les rafraîchissements passent ensuite par append_bars.
+    """
+    prices = pd.read_csv(prices_csv)
+    prices["Date"] = pd.to_datetime(prices["Date"])
+    prices = prices.sort_values("Date")
+    engine = IndicatorEngine(**params)
+    indicators = engine.update(prices["Close"].values)
+    _file_rows(prices, indicators).to_csv(indicators_csv, index=False)
+    save_state(engine, indicators_csv, prices["Date"].iloc[-1])
+    return engine
+
+
+def append_bars(indicators_csv, bars):
+    """
+    Ajoute les nouvelles barres au fichier d'indicateurs en ne calculant que ces lignes.
+
+    :param indicators_csv: Fichier *_with_indicators.csv déjà construit.
+    :param bars: DataFrame (Date + OHLCV) ; les dates déjà présentes sont ignorées.
+    :return: Nombre de lignes ajoutées.
+    """
+    engine, last_date = load_state(indicators_csv)
+    if engine is None:
+        raise FileNotFoundError(f"Aucun état pour {indicators_csv} : lancer build_indicator_file d'abord")
+    bars = bars.copy()
+    bars["Date"] = pd.to_datetime(bars["Date"])
+    bars = bars[bars["Date"] > last_date].sort_values("Date")
+    if bars.empty:
+        return 0
+    indicators = engine.update(bars["Close"].values)
+    _file_rows(bars, indicators).to_csv(indicators_csv, mode="a", header=False, index=False)
+    save_state(engine, indicators_csv, bars["Date"].iloc[-1])
+    return len(bars)
+
+
+def refresh_indicator_file(prices_csv, indicators_csv, **params):
+    # Rafraîchissement quotidien : reconstruction si aucun état n'existe, sinon ajout incrémental.
+    if not os.path.exists(indicators_csv) or not os.path.exists(state_path(indicators_csv)):
+        build_indicator_file(prices_csv, indicators_csv, **params)
+        return None
+    prices = pd.read_csv(prices_csv)
+    return append_bars(indicators_csv, prices)
+
+
+if __name__ == "__main__":
+    # Rafraîchissement des fichiers d'indicateurs : python indicateurs_economique/indicator_engine.py [prix.csv indicateurs.csv]...
+    # Sans argument : chaque *_historical_data_cleaned.csv du dossier vers son *_with_indicators.csv
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    args = sys.argv[1:]
+    pairs = list(zip(args[::2], args[1::2])) or [
+        (prices_csv, prices_csv.replace("_historical_data_cleaned.csv", "_with_indicators.csv"))
+        for prices_csv in sorted(glob.glob(os.path.join(base_dir, "*_historical_data_cleaned.csv")))
+    ]
+    for prices_csv, indicators_csv in pairs:
+        added = refresh_indicator_file(prices_csv, indicators_csv)
+        print(f"{indicators_csv} : {'reconstruit' if added is None else f'{added} lignes ajoutées'}")
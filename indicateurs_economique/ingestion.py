@@ -0,0 +1,94 @@
+import os
+import re
+import sys
+import glob
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from price_store import STORE_DIR, append_frame, last_date
+
+# Ordre canonique des colonnes des fichiers *_historical_data_cleaned.csv
+CANONICAL_COLUMNS = ["Date", "Close", "High", "Low", "Open", "Volume"]
+NASDAQ_DATE_FORMAT = "%m/%d/%Y"
+CHUNK_SIZE = 100_000
+
+
+def nasdaq_symbol(csv_path):
+    # HistoricalData_GLD_ETF_1739197174861.csv -> 'GLD_ETF'
+    match = re.match(r"HistoricalData_(.+)_\d+\.csv$", os.path.basename(csv_path))
+    return match.group(1) if match else os.path.splitext(os.path.basename(csv_path))[0]
+
+
+def _to_number(series):
+    # Certains exports Nasdaq préfixent les prix par '$'
+    # Colonnes texte : dtype object (pandas < 3) ou StringDtype (read_csv(dtype=str) sous pandas 3)
+    if pd.api.types.is_string_dtype(series) or series.dtype == object:
+        series = series.str.replace(r"[$,\s]", "", regex=True)
+    return pd.to_numeric(series, errors="coerce")
+
+
+def normalize_nasdaq_chunk(chunk):
+    """
+    Met un bloc au format canonique : dates au format explicite MM/DD/YYYY,
+    'Close/Last' renommé en 'Close', volumes 'N/A' ou absents remplacés par 0.
+    """
+    chunk = chunk.rename(columns=lambda c: c.strip()).rename(columns={"Close/Last": "Close"})
+    out = pd.DataFrame({"Date": pd.to_datetime(chunk["Date"], format=NASDAQ_DATE_FORMAT)})
+    for col in ["Close", "High", "Low", "Open"]:
+        out[col] = _to_number(chunk[col]).astype(np.float64)
+    if "Volume" in chunk.columns:
+        out["Volume"] = _to_number(chunk["Volume"]).fillna(0).astype(np.int64)
+    else:
+        out["Volume"] = np.zeros(len(chunk), dtype=np.int64)
+    return out[CANONICAL_COLUMNS]
+
+
+def ingest_nasdaq_csv(csv_path, name=None, store_dir=STORE_DIR, chunksize=CHUNK_SIZE):
+    """
+    Ingestion par blocs d'un export Nasdaq (lignes les plus récentes en premier) vers le store.
+
+    Les blocs normalisés sont d'abord déversés sur disque, puis relus du dernier au premier
+    et inversés, de sorte que l'ajout au store se fait en ordre chronologique avec une
+    mémoire bornée par la taille d'un bloc, quelle que soit la taille du fichier.
+
+    :param name: Entrée du store à alimenter (par défaut 'nasdaq_<symbole>').
+    :return: Nombre de lignes ajoutées (seules les dates postérieures au store sont gardées).
+    """
+    name = name or f"nasdaq_{nasdaq_symbol(csv_path).lower()}"
+    since = last_date(name, store_dir)
+    spill_dir = tempfile.mkdtemp(prefix="ingestion_")
+    try:
+        spills = []
+        for i, chunk in enumerate(pd.read_csv(csv_path, chunksize=chunksize, na_values=["N/A"],
+                                              dtype=str, keep_default_na=True)):
+            chunk = normalize_nasdaq_chunk(chunk).dropna(subset=["Close"])
+            if since is not None:
+                chunk = chunk[chunk["Date"] > since]
+            if chunk.empty:
+                continue
+            spill = os.path.join(spill_dir, f"chunk_{i:06d}.pkl")
+            chunk.to_pickle(spill)
+            spills.append(spill)
+
+        added = 0
+        for spill in reversed(spills):
+            chunk = pd.read_pickle(spill).iloc[::-1]
+            # Doublons éventuels (même date sur deux lignes ou à cheval sur deux blocs)
+            chunk = chunk.drop_duplicates(subset="Date", keep="last").sort_values("Date", kind="stable")
+            current = last_date(name, store_dir)
+            if current is not None:
+                chunk = chunk[chunk["Date"] > current]
+            added += append_frame(chunk.reset_index(drop=True), name, store_dir)
+            os.remove(spill)
+        return added
+    finally:
+        shutil.rmtree(spill_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    # python indicateurs_economique/ingestion.py [fichiers...] (par défaut data_csv/HistoricalData_*.csv)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    paths = sys.argv[1:] or sorted(glob.glob(os.path.join(root, "data_csv", "HistoricalData_*.csv")))
+    for path in paths:
+        print(f"{os.path.basename(path)} : {ingest_nasdaq_csv(path)} lignes ajoutées")
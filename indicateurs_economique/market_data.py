@@ -0,0 +1,163 @@
+import os
+import time
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from cleaning import clean_frame
+from price_store import STORE_DIR, append_frame, last_date
+from registry import AssetRegistry
+from indicator_engine import build_indicator_file, append_bars, state_path
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Symbole Yahoo Finance -> entrée du store (mêmes actifs que Recup_data_yahoo.ipynb)
+SYMBOLS = {
+    "GC=F": "gold_historical_data_cleaned",
+    "^GSPC": "sp500_historical_data_cleaned",
+    "BTC-USD": "bitcoin_historical_data_cleaned",
+}
+DEFAULT_START = "2019-01-01"
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Fichiers d'indicateurs prolongés avec les nouvelles barres (moteur incrémental) : le S&P 500 du registre
+# est lu dans sp500_with_indicators.csv, pas dans l'entrée sp500_historical_data_cleaned du store
+INDICATOR_FILES = {
+    "GC=F": ("gold_historical_data_cleaned.csv", "gold_with_indicators.csv"),
+    "^GSPC": ("sp500_historical_data_cleaned.csv", "sp500_with_indicators.csv"),
+    "BTC-USD": ("bitcoin_historical_data_cleaned.csv", "bitcoin_with_indicators.csv"),
+}
+
+
+class MarketDataProvider(ABC):
+    """
+    Interface commune des sources de prix.
+    fetch renvoie {symbole: DataFrame Date/Close/High/Low/Open/Volume} pour [start, end[ ;
+    les symboles sont envoyés par lots, avec au plus max_concurrency requêtes simultanées.
+    Les sources concrètes (YahooProvider, ReplayProvider) implémentent _fetch_batch.
+    """
+
+    def __init__(self, batch_size=50, max_concurrency=4):
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+
+    @abstractmethod
+    def _fetch_batch(self, symbols, start, end):
+        # {symbole: DataFrame} pour un lot de symboles
+        ...
+
+    def fetch(self, symbols, start, end):
+        symbols = list(symbols)
+        batches = [symbols[i:i + self.batch_size] for i in range(0, len(symbols), self.batch_size)]
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            for batch in executor.map(lambda b: self._fetch_batch(b, start, end), batches):
+                results.update(batch)
+        return results
+
+
+class YahooProvider(MarketDataProvider):
+    def __init__(self, batch_size=50, max_concurrency=2):
+        super().__init__(batch_size, max_concurrency)
+        import yfinance as yf  # dépendance réseau, inutile pour le rejeu local
+        self._yf = yf
+
+    def _fetch_batch(self, symbols, start, end):
+        data = self._yf.download(symbols, start=start, end=end, group_by="ticker",
+                                 threads=False, progress=False, auto_adjust=False)
+        results = {}
+        for symbol in symbols:
+            frame = data[symbol] if isinstance(data.columns, pd.MultiIndex) else data
+            frame = frame.dropna(how="all").reset_index()
+            if not frame.empty:
+                results[symbol] = frame[["Date", "Close", "High", "Low", "Open", "Volume"]]
+        return results
+
+
+class ReplayProvider(MarketDataProvider):
+    """
+    Rejeu de fichiers CSV locaux (format *_historical_data_from_2019.csv), sans réseau.
+    Sert aux tests et aux mesures de l'ingestion ; latency simule le temps d'un appel distant.
+    """
+
+    def __init__(self, files=None, latency=0.0, batch_size=50, max_concurrency=4):
+        super().__init__(batch_size, max_concurrency)
+        self.files = files or {
+            "GC=F": os.path.join(ROOT_DIR, "ressources_ext", "gold_historical_data_from_2019.csv"),
+            "^GSPC": os.path.join(ROOT_DIR, "ressources_ext", "sp500_historical_data_from_2019.csv"),
+            "BTC-USD": os.path.join(ROOT_DIR, "ressources_ext", "bitcoin_historical_data_from_2019.csv"),
+        }
+        self.latency = latency
+        self.calls = 0
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    def _frame(self, symbol):
+        with self._lock:
+            if symbol not in self._frames:
+                df = pd.read_csv(self.files[symbol])
+                df["Date"] = pd.to_datetime(df["Date"])
+                self._frames[symbol] = df
+            return self._frames[symbol]
+
+    def _fetch_batch(self, symbols, start, end):
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        results = {}
+        for symbol in symbols:
+            if symbol not in self.files:
+                continue
+            df = self._frame(symbol)
+            frame = df[(df["Date"] >= pd.Timestamp(start)) & (df["Date"] < pd.Timestamp(end))]
+            if not frame.empty:
+                results[symbol] = frame.reset_index(drop=True)
+        return results
+
+
+def _extend_indicators(symbol, bars, directory=BASE_DIR):
+    # Ajoute les barres au fichier d'indicateurs du symbole (construit d'abord depuis le CSV de prix si besoin)
+    prices_csv, indicators_csv = (os.path.join(directory, name) for name in INDICATOR_FILES[symbol])
+    if not os.path.exists(indicators_csv) or not os.path.exists(state_path(indicators_csv)):
+        build_indicator_file(prices_csv, indicators_csv)
+    return append_bars(indicators_csv, bars)
+
+
+def refresh(provider, symbols=None, end=None, store_dir=STORE_DIR, default_start=DEFAULT_START, registry=None):
+    """
+    Mise à jour incrémentale du store : pour chaque symbole, seules les barres postérieures
+    à la dernière date stockée sont demandées. Les symboles ayant la même date de reprise
+    partagent un seul appel groupé.
+
+    :param symbols: Dictionnaire {symbole: entrée du store} (par défaut SYMBOLS).
+    :param end: Date de fin exclue (par défaut demain).
+    :param registry: AssetRegistry dont le manifeste est mis à jour après ajout (par défaut celui
+                     du store par défaut) : les nouvelles barres deviennent sélectionnables.
+                     Avec le store par défaut, les fichiers INDICATOR_FILES sont aussi prolongés.
+    :return: Rapport {symbole: lignes ajoutées}.
+    """
+    symbols = symbols or SYMBOLS
+    end = pd.Timestamp(end) if end is not None else pd.Timestamp.today().normalize() + pd.Timedelta(days=1)
+
+    by_start = {}
+    for symbol, name in symbols.items():
+        since = last_date(name, store_dir)
+        start = since + pd.Timedelta(days=1) if since is not None else pd.Timestamp(default_start)
+        if start < end:
+            by_start.setdefault(start, []).append(symbol)
+
+    report = {symbol: 0 for symbol in symbols}
+    for start, group in by_start.items():
+        for symbol, frame in provider.fetch(group, start, end).items():
+            clean, _ = clean_frame(frame)
+            report[symbol] = append_frame(clean, symbols[symbol], store_dir)
+            if report[symbol] and store_dir == STORE_DIR and symbol in INDICATOR_FILES:
+                _extend_indicators(symbol, clean)
+
+    if any(report.values()):
+        if registry is None and store_dir == STORE_DIR:
+            registry = AssetRegistry()
+        if registry is not None:
+            registry.refresh()
+    return report
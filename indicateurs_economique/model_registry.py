@@ -0,0 +1,171 @@
+import os
+import json
+import time
+import pickle
+import shutil
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+REGISTRY_DIR = "model_coefficients"
+META_FILE = "meta.json"
+MODEL_FILE = "model.pkl"
+# Modèles désérialisés gardés en mémoire par registre (les moins récemment utilisés sont oubliés)
+MAX_MODELS = 16
+
+
+def data_fingerprint(df, columns=("Date", "Close")):
+    # Empreinte du segment de données d'entraînement (valeurs, pas l'objet DataFrame).
+    digest = hashlib.sha256()
+    for col in columns:
+        if col not in df.columns:
+            continue
+        if col == "Date":
+            values = pd.to_datetime(df[col]).values.astype("datetime64[D]").astype(np.int64)
+        else:
+            values = df[col].to_numpy(dtype=np.float64)
+        digest.update(col.encode())
+        digest.update(np.ascontiguousarray(values).tobytes())
+    return digest.hexdigest()
+
+
+def registry_key(df, model_choice, params=None, columns=("Date", "Close")):
+    """
+    Clé de contenu d'un modèle : hash des données d'entraînement, du type de modèle
+    et des hyperparamètres.
+    """
+    payload = json.dumps({
+        "data": data_fingerprint(df, columns),
+        "model": model_choice,
+        "params": params or {},
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+class ModelRegistry:
+    """
+    Registre de modèles adressé par contenu : model_coefficients/<clé>/{model.pkl, meta.json}.
+    Les métadonnées (métriques, paramètres) sont lues sans désérialiser le modèle ;
+    le pickle n'est chargé qu'à la demande puis gardé en mémoire (au plus max_models modèles, LRU).
+    """
+
+    def __init__(self, root=REGISTRY_DIR, max_bytes=512 * 1024 ** 2, max_age_days=None, max_models=MAX_MODELS):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.max_models = max_models
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _entry_dir(self, key):
+        return os.path.join(self.root, key)
+
+    def _read_meta(self, key):
+        path = os.path.join(self._entry_dir(key), META_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def _write_meta(self, key, meta):
+        path = os.path.join(self._entry_dir(key), META_FILE)
+        with open(path + ".tmp", "w") as f:
+            json.dump(meta, f, indent=4, default=str)
+        os.replace(path + ".tmp", path)
+
+    def lookup(self, key):
+        # Renvoie les métadonnées (dont 'model_path', 'mse', 'rmse') ou None.
+        meta = self._read_meta(key)
+        if meta is None or not os.path.exists(meta["model_path"]):
+            return None
+        if self.max_age_days is not None and time.time() - meta["created"] > self.max_age_days * 86400:
+            self.remove(key)
+            return None
+        meta["last_access"] = time.time()
+        self._write_meta(key, meta)
+        return meta
+
+    def _remember(self, key, model):
+        with self._lock:
+            self._models[key] = model
+            self._models.move_to_end(key)
+            while len(self._models) > self.max_models:
+                self._models.popitem(last=False)
+
+    def load(self, key):
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key]
+        meta = self.lookup(key)
+        if meta is None:
+            raise KeyError(key)
+        with open(meta["model_path"], "rb") as f:
+            model = pickle.load(f)
+        self._remember(key, model)
+        return model
+
+    def store(self, key, model, metrics=None, **info):
+        """
+        Enregistre un modèle ajusté et ses métriques.
+
+        :param metrics: Dictionnaire de métriques (ex. {'mse': ..., 'rmse': ...}).
+        :param info: Informations libres (actif, modèle, paramètres, coefficients...).
+        :return: Métadonnées de l'entrée.
+        """
+        path = self._entry_dir(key)
+        os.makedirs(path, exist_ok=True)
+        model_path = os.path.join(path, MODEL_FILE)
+        with open(model_path + ".tmp", "wb") as f:
+            pickle.dump(model, f)
+        os.replace(model_path + ".tmp", model_path)
+        now = time.time()
+        meta = dict(info, key=key, model_path=model_path, created=now, last_access=now,
+                    size=os.path.getsize(model_path), **(metrics or {}))
+        self._write_meta(key, meta)
+        self._remember(key, model)
+        self.evict()
+        return meta
+
+    def remove(self, key):
+        with self._lock:
+            self._models.pop(key, None)
+        shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+
+    def entries(self):
+        metas = []
+        for key in os.listdir(self.root):
+            meta = self._read_meta(key) if os.path.isdir(self._entry_dir(key)) else None
+            if meta is not None:
+                metas.append(meta)
+        return metas
+
+    def evict(self):
+        # Suppression par âge, puis des entrées les moins récemment utilisées au-delà du budget disque.
+        metas = sorted(self.entries(), key=lambda m: m["last_access"])
+        now = time.time()
+        if self.max_age_days is not None:
+            for meta in [m for m in metas if now - m["created"] > self.max_age_days * 86400]:
+                self.remove(meta["key"])
+                metas.remove(meta)
+        total = sum(m["size"] for m in metas)
+        while len(metas) > 1 and total > self.max_bytes:
+            meta = metas.pop(0)
+            total -= meta["size"]
+            self.remove(meta["key"])
+
+
+_SHARED = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_registry(root=REGISTRY_DIR):
+    # Un registre par dossier et par processus : les modèles chargés sont réutilisés d'un appel à l'autre
+    path = os.path.abspath(root)
+    with _SHARED_LOCK:
+        if path not in _SHARED:
+            _SHARED[path] = ModelRegistry(root)
+        return _SHARED[path]
@@ -0,0 +1,166 @@
+import numpy as np
+import pandas as pd
+
+MODELS = ("gbm", "bootstrap")
+PERCENTILES = (5, 25, 50, 75, 95)
+MAX_MEMORY_MB = 64
+
+# Histogrammes par pas de temps sur l'écart réduit u = (x_t - m·t) / (s·√t) du log-rendement cumulé :
+# mémoire fixe (pas × actifs × N_BINS) quel que soit le nombre de trajectoires
+N_BINS = 2000
+Z_RANGE = 8.0
+
+
+def _simulate_chunk(model, params, n_paths, horizon, seed, n_samples):
+    """
+    Simule un bloc de trajectoires et le réduit en histogrammes. Exécuté dans un processus
+    du pool : le générateur est créé à partir de la graine propre au bloc.
+    """
+    rng = np.random.default_rng(seed)
+    k = len(params["mean"])
+    if model == "gbm":
+        # Log-rendements gaussiens corrélés (Cholesky de la covariance historique)
+        steps = rng.standard_normal((n_paths, horizon, k)) @ params["chol"].T
+        steps += params["mean"]
+    else:
+        # Bootstrap par blocs de jours consécutifs : mêmes dates pour tous les actifs,
+        # corrélations et agrégats de volatilité conservés
+        block = params["block"]
+        n_blocks = -(-horizon // block)
+        starts = rng.integers(0, len(params["returns"]) - block + 1, size=(n_paths, n_blocks))
+        idx = (starts[:, :, None] + np.arange(block)).reshape(n_paths, -1)[:, :horizon]
+        steps = params["returns"][idx]
+    paths = np.cumsum(steps, axis=1, out=steps)
+
+    u = (paths - params["centre"]) / params["scale"]
+    bins = np.clip(((u + Z_RANGE) * (N_BINS / (2 * Z_RANGE))).astype(np.int64), 0, N_BINS - 1)
+    bins += (np.arange(horizon * k).reshape(horizon, k) * N_BINS)
+    hist = np.bincount(bins.ravel(), minlength=horizon * k * N_BINS).reshape(horizon, k, N_BINS)
+    return hist, paths[:n_samples].astype(np.float32)
+
+
+class SimulationResult:
+    """
+    Distribution simulée des prix : histogrammes des log-rendements cumulés par pas de temps,
+    percentiles (graphique en éventail) et distribution des prix au terme de l'horizon.
+    """
+
+    def __init__(self, assets, last_prices, hist, centre, scale, samples, n_paths):
+        self.assets = list(assets)
+        self.last_prices = np.asarray(last_prices, dtype=float)
+        self.hist = hist
+        self.centre = centre
+        self.scale = scale
+        self.samples = samples
+        self.n_paths = n_paths
+
+    @property
+    def horizon(self):
+        return self.hist.shape[0]
+
+    def _prices(self, j, u, steps=slice(None)):
+        return self.last_prices[j] * np.exp(self.centre[steps, j] + u * self.scale[steps, j])
+
+    def percentiles(self, asset, q=PERCENTILES):
+        """
+        Percentiles des prix à chaque pas (interpolation linéaire dans la classe de l'histogramme).
+
+        :return: DataFrame (pas 0..horizon) × percentiles ; le pas 0 est le dernier prix observé.
+        """
+        j = self.assets.index(asset)
+        hist = self.hist[:, j, :]
+        cum = np.cumsum(hist, axis=1)
+        width = 2 * Z_RANGE / N_BINS
+        out = np.empty((self.horizon + 1, len(q)))
+        out[0] = self.last_prices[j]
+        rows = np.arange(self.horizon)
+        for i, p in enumerate(q):
+            target = p / 100 * self.n_paths
+            k = (cum >= target).argmax(axis=1)
+            before = np.where(k > 0, cum[rows, k - 1], 0)
+            frac = (target - before) / np.maximum(hist[rows, k], 1)
+            out[1:, i] = self._prices(j, -Z_RANGE + (k + frac) * width)
+        return pd.DataFrame(out, columns=list(q))
+
+    def terminal(self, asset, bins=100):
+        """
+        Distribution des prix au terme de l'horizon, regroupée en `bins` classes (N_BINS multiple de bins).
+
+        :return: (prix au centre des classes, probabilités)
+        """
+        j = self.assets.index(asset)
+        group = N_BINS // bins
+        probs = self.hist[-1, j, :group * bins].reshape(bins, group).sum(axis=1) / self.n_paths
+        centres = -Z_RANGE + (np.arange(bins) + 0.5) * group * 2 * Z_RANGE / N_BINS
+        return self._prices(j, centres, -1), probs
+
+    def sample_paths(self, asset):
+        # Quelques trajectoires brutes (trajectoires × pas 0..horizon) pour illustrer l'éventail
+        j = self.assets.index(asset)
+        paths = self.last_prices[j] * np.exp(self.samples[:, :, j].astype(float))
+        return np.column_stack([np.full(len(paths), self.last_prices[j]), paths])
+
+
+def future_dates(dates, horizon):
+    # Calendrier de l'horizon : jours calendaires si l'actif cote le week-end (BTC), jours ouvrés sinon
+    dates = pd.DatetimeIndex(dates)
+    freq = "D" if (dates.dayofweek >= 5).any() else "B"
+    return pd.date_range(dates[-1], periods=horizon + 1, freq=freq)
+
+
+def simulate(prices, horizon=50, n_paths=100_000, model="gbm", block=20, seed=None,
+             executor=None, max_memory_mb=MAX_MEMORY_MB, n_samples=20):
+    """
+    Simulation Monte Carlo de trajectoires de prix, par blocs vectorisés de taille bornée.
+
+    :param prices: DataFrame dates × actifs de clôtures alignées (plusieurs actifs : tirages conjoints).
+    :param horizon: Nombre de pas simulés (jours de cotation).
+    :param model: 'gbm' (mouvement brownien géométrique) ou 'bootstrap' (blocs de rendements historiques).
+    :param block: Longueur des blocs du bootstrap (jours).
+    :param seed: Graine : chaque bloc reçoit une graine dérivée (SeedSequence.spawn), le résultat ne
+                 dépend ni du nombre de processus ni de l'ordre d'exécution.
+    :param executor: Pool (ProcessPoolExecutor) répartissant les blocs ; None = processus courant.
+    :param max_memory_mb: Plafond de mémoire de travail d'un bloc.
+    :return: SimulationResult
+    """
+    if model not in MODELS:
+        raise ValueError(f"Modèle inconnu : {model} (attendu : {MODELS})")
+    if isinstance(prices, pd.Series):
+        prices = prices.to_frame()
+    values = prices.to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_returns = np.diff(np.log(values), axis=0)
+    log_returns = log_returns[np.isfinite(log_returns).all(axis=1)]
+    if len(log_returns) < max(2, block if model == "bootstrap" else 2):
+        raise ValueError("Historique trop court pour calibrer la simulation")
+
+    k = log_returns.shape[1]
+    mean = log_returns.mean(axis=0)
+    cov = np.cov(log_returns, rowvar=False, ddof=1).reshape(k, k)
+    t = np.arange(1, horizon + 1)[:, None]
+    params = {
+        "mean": mean,
+        # Petite régularisation : covariance semi-définie (actifs colinéaires) encore factorisable
+        "chol": np.linalg.cholesky(cov + np.eye(k) * 1e-12),
+        "returns": log_returns,
+        "block": block,
+        "centre": mean * t,
+        "scale": np.sqrt(np.diag(cov)) * np.sqrt(t),
+    }
+
+    # Environ quatre tableaux (trajectoires × horizon × actifs) de 8 octets par bloc
+    chunk = max(1, int(max_memory_mb * 1024 * 1024 // (horizon * k * 8 * 4)))
+    sizes = [chunk] * (n_paths // chunk) + ([n_paths % chunk] if n_paths % chunk else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    samples = [min(n_samples, size) if i == 0 else 0 for i, size in enumerate(sizes)]
+    args = ([model] * len(sizes), [params] * len(sizes), sizes, [horizon] * len(sizes), seeds, samples)
+    results = executor.map(_simulate_chunk, *args) if executor is not None else map(_simulate_chunk, *args)
+
+    hist, paths = None, None
+    for chunk_hist, chunk_paths in results:
+        if hist is None:
+            hist = chunk_hist
+        else:
+            hist += chunk_hist
+        paths = chunk_paths if paths is None else paths
+    return SimulationResult(prices.columns, values[-1], hist, params["centre"], params["scale"], paths, n_paths)
@@ -0,0 +1,199 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import warnings
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from model_registry import REGISTRY_DIR, data_fingerprint
+
+SEARCH_DIR = "order_search"
+CRITERIA = ("aic", "bic")
+SEARCHABLE = ("ARIMA", "Holt-Winters", "TBATS")
+
+# Espaces de recherche : d est fixé par tests de racine unitaire (les critères d'information
+# ne sont pas comparables entre séries différenciées différemment), puis (p, q) par complexité croissante.
+MAX_P, MAX_Q, MAX_D = 5, 3, 2
+# Périodes saisonnières candidates pour des prix journaliers : semaine ouvrée, semaine calendaire (BTC),
+# mois ouvré, mois calendaire, trimestre
+SEASONAL_PERIODS = (5, 7, 21, 30, 63)
+TBATS_PERIODS = ([5], [7], [21], [5, 21], [7, 30])
+
+
+def _differencing_order(values, max_d=MAX_D, alpha=0.05):
+    # Plus petit d tel que la série différenciée d fois rejette la racine unitaire (ADF)
+    from statsmodels.tsa.stattools import adfuller
+    x = np.asarray(values, dtype=float)
+    for d in range(max_d + 1):
+        if adfuller(x, autolag="AIC")[1] < alpha:
+            return d
+        x = np.diff(x)
+    return max_d
+
+
+def candidate_rounds(model_choice, values):
+    """
+    Candidats groupés par niveau de complexité : la recherche évalue un niveau entier en parallèle
+    puis s'arrête quand plusieurs niveaux successifs n'améliorent plus le critère.
+
+    :return: Liste de niveaux, chacun une liste de dictionnaires de paramètres (format MODEL_PARAMS).
+    """
+    if model_choice == "ARIMA":
+        d = _differencing_order(values)
+        return [[{"order": (p, d, c - p)} for p in range(min(c, MAX_P) + 1) if c - p <= MAX_Q]
+                for c in range(MAX_P + MAX_Q + 1)]
+    if model_choice == "Holt-Winters":
+        # Les périodes ne sont pas emboîtées : toutes les saisonnalités forment un seul niveau.
+        # Au moins deux cycles complets pour estimer une saisonnalité.
+        seasonal = [{"trend": trend, "seasonal": "add", "seasonal_periods": period}
+                    for period in SEASONAL_PERIODS if 2 * period < len(values) for trend in (None, "add")]
+        return [[{"trend": None, "seasonal": None, "seasonal_periods": None}],
+                [{"trend": "add", "seasonal": None, "seasonal_periods": None}], seasonal]
+    if model_choice == "TBATS":
+        return [[{"seasonal_periods": None}],
+                [{"seasonal_periods": periods} for periods in TBATS_PERIODS if 2 * max(periods) < len(values)]]
+    raise ValueError(f"Pas de recherche d'ordre pour le modèle {model_choice} (attendu : {SEARCHABLE})")
+
+
+def _fit_candidate(model_choice, values, params, criterion):
+    # Exécuté dans un processus du pool : renvoie (paramètres, critère) ou (paramètres, None) si l'ajustement échoue
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            if model_choice == "ARIMA":
+                from statsmodels.tsa.statespace.sarimax import SARIMAX
+                result = SARIMAX(values, order=params["order"]).fit(disp=False)
+            elif model_choice == "Holt-Winters":
+                from statsmodels.tsa.holtwinters import ExponentialSmoothing
+                result = ExponentialSmoothing(values, **params).fit()
+            else:
+                from tbats import TBATS
+                result = TBATS(seasonal_periods=params["seasonal_periods"], n_jobs=1).fit(values)
+        # TBATS n'expose que l'AIC
+        score = float(getattr(result, criterion, result.aic))
+        return params, score if np.isfinite(score) else None
+    except Exception:
+        return params, None
+
+
+def search_key(df, model_choice, criterion, column="Close"):
+    payload = json.dumps({
+        "data": data_fingerprint(df, ("Date", column)),
+        "model": model_choice,
+        "criterion": criterion,
+        "space": [MAX_P, MAX_Q, MAX_D, SEASONAL_PERIODS, TBATS_PERIODS],
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+class OrderSearch:
+    """
+    Sélection automatique des ordres ARIMA et des saisonnalités Holt-Winters / TBATS par critère
+    d'information, en parallèle sur un pool de processus, avec arrêt anticipé.
+
+    La configuration retenue est mise en cache sur disque par (modèle, empreinte des données,
+    critère) : model_coefficients/order_search/<clé>.json. Un nouvel ajustement sur les mêmes
+    données réutilise l'ordre choisi sans relancer la recherche.
+
+    :param patience: Nombre de niveaux de complexité successifs sans amélioration avant l'arrêt.
+    :param tolerance: Amélioration minimale du critère pour compter comme un progrès.
+    """
+
+    def __init__(self, root=REGISTRY_DIR, criterion="aic", patience=2, tolerance=1.0, max_workers=None):
+        if criterion not in CRITERIA:
+            raise ValueError(f"Critère inconnu : {criterion} (attendu : {CRITERIA})")
+        self.root = os.path.join(root, SEARCH_DIR)
+        self.criterion = criterion
+        self.patience = patience
+        self.tolerance = tolerance
+        self.max_workers = max_workers
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.root, f"{key}.json")
+
+    def lookup(self, key):
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            result = json.load(f)
+        # JSON ne connaît pas les tuples : l'ordre ARIMA redevient un tuple (clé du registre de modèles inchangée)
+        if "order" in result["params"]:
+            result["params"]["order"] = tuple(result["params"]["order"])
+        return result
+
+    def _store(self, key, result):
+        path = self._path(key)
+        with open(path + ".tmp", "w") as f:
+            json.dump(result, f, indent=4, default=str)
+        os.replace(path + ".tmp", path)
+
+    def search(self, values, model_choice, executor=None):
+        """
+        Évalue les niveaux de candidats dans l'ordre de complexité croissante.
+
+        :param executor: Pool existant ; par défaut un pool 'spawn' est créé pour la recherche.
+        :return: Dictionnaire : params, score, critère, candidats évalués, échecs, niveaux élagués.
+        """
+        values = np.asarray(values, dtype=float)
+        rounds = candidate_rounds(model_choice, values)
+        own = executor is None
+        if own:
+            executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        best, best_score, stale, fitted, failed, level = None, np.inf, 0, 0, 0, 0
+        try:
+            for level, candidates in enumerate(rounds):
+                n = len(candidates)
+                results = executor.map(_fit_candidate, [model_choice] * n, [values] * n, candidates, [self.criterion] * n)
+                improved = False
+                for params, score in results:
+                    fitted += 1
+                    if score is None:
+                        failed += 1
+                        continue
+                    if score < best_score - self.tolerance:
+                        improved = True
+                    if score < best_score:
+                        best, best_score = params, score
+                stale = 0 if improved else stale + 1
+                if best is not None and stale >= self.patience:
+                    break
+        finally:
+            if own:
+                executor.shutdown()
+        if best is None:
+            raise RuntimeError(f"Aucun candidat {model_choice} n'a pu être ajusté")
+        return {"params": best, "score": best_score, "criterion": self.criterion, "fitted": fitted,
+                "failed": failed, "pruned_levels": len(rounds) - level - 1}
+
+    def best(self, df, model_choice, asset=None, column="Close", executor=None):
+        """
+        Configuration retenue pour ces données : lue dans le cache, sinon recherchée puis enregistrée.
+
+        :return: Dictionnaire de paramètres au format MODEL_PARAMS.
+        """
+        key = search_key(df, model_choice, self.criterion, column)
+        cached = self.lookup(key)
+        if cached is not None:
+            return cached["params"]
+        start = time.time()
+        result = self.search(df[column].to_numpy(dtype=float), model_choice, executor)
+        result.update(key=key, model=model_choice, asset=asset, rows=len(df), search_time=time.time() - start,
+                      start=str(df['Date'].iloc[0]), end=str(df['Date'].iloc[-1]))
+        self._store(key, result)
+        return result["params"]
+
+
+if __name__ == "__main__":
+    # Préchauffage du cache : python indicateurs_economique/order_search.py [modèles...]
+    from registry import AssetRegistry
+    assets = AssetRegistry()
+    searcher = OrderSearch()
+    with ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn")) as pool:
+        for symbol in assets.symbols():
+            df = assets.frame(symbol)[["Date", "Close"]]
+            for model_choice in sys.argv[1:] or SEARCHABLE:
+                print(f"{symbol} / {model_choice} : {searcher.best(df, model_choice, asset=symbol, executor=pool)}")
@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+
+# inner : dates communes à tous les actifs
+# ffill : union des calendriers, dernière valeur connue reportée (BTC cote 7 j/7, SPX/Or 5 j/7)
+# bday  : jours ouvrés uniquement, jours fériés comblés par la dernière valeur connue
+ALIGNMENTS = ("inner", "ffill", "bday")
+
+
+def _ffill(values):
+    # Report de la dernière valeur valide le long de l'axe des dates, sans boucle Python
+    valid = ~np.isnan(values)
+    idx = np.where(valid, np.arange(values.shape[0]).reshape((-1,) + (1,) * (values.ndim - 1)), 0)
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    filled = np.take_along_axis(values, idx, axis=0)
+    # Avant la première cotation d'un actif, pas de valeur à reporter
+    filled[np.cumsum(valid, axis=0) == 0] = np.nan
+    return filled
+
+
+class AssetPanel:
+    """
+    Panel aligné de plusieurs actifs : un DatetimeIndex commun et un tableau
+    dates × actifs × champs (float64). Les tranches de dates sont des vues.
+    """
+
+    def __init__(self, dates, assets, fields, values):
+        self.dates = pd.DatetimeIndex(dates)
+        self.assets = list(assets)
+        self.fields = list(fields)
+        self.values = values
+
+    def __len__(self):
+        return len(self.dates)
+
+    def field(self, name):
+        # Matrice dates × actifs d'un champ (vue sur le tableau du panel)
+        return self.values[:, :, self.fields.index(name)]
+
+    def frame(self, name):
+        return pd.DataFrame(self.field(name), index=self.dates, columns=self.assets)
+
+    def slice(self, start_date, end_date):
+        # Recherche dichotomique sur l'index trié : O(log n), sans copie
+        lo = self.dates.searchsorted(pd.Timestamp(start_date), side="left")
+        hi = self.dates.searchsorted(pd.Timestamp(end_date), side="right")
+        return AssetPanel(self.dates[lo:hi], self.assets, self.fields, self.values[lo:hi])
+
+    def select(self, assets):
+        cols = [self.assets.index(a) for a in assets]
+        return AssetPanel(self.dates, assets, self.fields, self.values[:, cols])
+
+    def normalize(self, name="Close", scale=1000):
+        # Normalisation min-max de chaque actif sur la période, en une opération
+        x = self.field(name)
+        lo, hi = np.nanmin(x, axis=0), np.nanmax(x, axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return (x - lo) / (hi - lo) * scale
+
+    def log(self, name="Close"):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.log(self.field(name))
+
+    def returns(self, name="Close"):
+        x = self.field(name)
+        out = np.full(x.shape, np.nan)
+        out[1:] = x[1:] / x[:-1] - 1
+        return out
+
+    def correlation(self, name="Close", on_returns=True):
+        # Corrélation de Pearson entre actifs sur les dates où tous ont une valeur
+        x = self.returns(name) if on_returns else self.field(name)
+        x = x[~np.isnan(x).any(axis=1)]
+        return pd.DataFrame(np.corrcoef(x, rowvar=False), index=self.assets, columns=self.assets)
+
+
+def build_panel(frames, fields=("Close", "Open", "High", "Low", "Volume"), alignment="ffill"):
+    """
+    Construit un panel aligné à partir de DataFrames (colonne 'Date' + champs).
+
+    :param frames: Dictionnaire {actif: DataFrame}.
+    :param alignment: 'inner', 'ffill' ou 'bday' (voir ALIGNMENTS).
+    :return: AssetPanel
+    """
+    if alignment not in ALIGNMENTS:
+        raise ValueError(f"Alignement inconnu : {alignment} (attendu : {ALIGNMENTS})")
+    assets = list(frames)
+    fields = [f for f in fields if all(f in df.columns for df in frames.values())]
+    days = {a: pd.to_datetime(df["Date"]).values.astype("datetime64[D]") for a, df in frames.items()}
+
+    if alignment == "inner":
+        calendar = days[assets[0]]
+        for a in assets[1:]:
+            calendar = np.intersect1d(calendar, days[a])
+    else:
+        calendar = np.unique(np.concatenate(list(days.values())))
+    if alignment == "bday":
+        span = np.arange(calendar[0], calendar[-1] + np.timedelta64(1, "D"))
+        calendar = np.union1d(calendar, span[np.is_busday(span)])
+
+    values = np.full((len(calendar), len(assets), len(fields)), np.nan)
+    for j, asset in enumerate(assets):
+        pos = np.searchsorted(calendar, days[asset])
+        keep = (pos < len(calendar)) & (calendar[np.minimum(pos, len(calendar) - 1)] == days[asset])
+        values[pos[keep], j, :] = frames[asset][fields].to_numpy(dtype=float)[keep]
+
+    if alignment in ("ffill", "bday"):
+        values = _ffill(values)
+    if alignment == "bday":
+        business = np.is_busday(calendar)
+        calendar, values = calendar[business], values[business]
+
+    return AssetPanel(calendar.astype("datetime64[ns]"), assets, fields, values)
@@ -0,0 +1,177 @@
+from itertools import combinations
+import numpy as np
+import pandas as pd
+from risk_metrics import TRADING_DAYS
+
+# Rééquilibrage des backtests : fréquence pandas des périodes, None = achat-conservation
+REBALANCING = {"Quotidien": "D", "Hebdomadaire": "W", "Mensuel": "M", "Trimestriel": "Q", "Jamais": None}
+STATS_COLUMNS = ["Rendement Annuel", "Volatilité Annuelle", "Sharpe Ratio"]
+
+
+def random_weights(n_portfolios, n_assets, seed=None):
+    # Poids tirés uniformément sur le simplexe (loi de Dirichlet(1, ..., 1)) : portefeuilles long-only
+    return np.random.default_rng(seed).dirichlet(np.ones(n_assets), size=n_portfolios)
+
+
+def grid_weights(n_assets, steps=20):
+    """
+    Grille régulière du simplexe : tous les poids multiples de 1/steps dont la somme vaut 1.
+
+    :return: Tableau (C(steps + n_assets - 1, n_assets - 1), n_assets).
+    """
+    # Étoiles et barres : chaque combinaison de n_assets - 1 séparateurs donne une répartition
+    bars = np.array(list(combinations(range(steps + n_assets - 1), n_assets - 1))).reshape(-1, n_assets - 1)
+    edges = np.column_stack([np.full(len(bars), -1), bars, np.full(len(bars), steps + n_assets - 1)])
+    return (np.diff(edges, axis=1) - 1) / steps
+
+
+def _project(v, a):
+    """
+    Projection euclidienne de v sur {y >= 0, a'y = 1} (a = 1 : simplexe).
+    y(λ) = max(v - λa, 0) et a'y(λ) est affine par morceaux et décroissante en λ :
+    on évalue tous les points de rupture v_i / a_i d'un coup, puis on résout sur le bon segment.
+    """
+    nz = a != 0
+    breaks = np.sort(v[nz] / a[nz])
+    active = (v[None, :] - breaks[:, None] * a[None, :]) > 0
+    f = (active * a * (v[None, :] - breaks[:, None] * a[None, :])).sum(axis=1) - 1
+    # Premier point de rupture où la contrainte passe sous 1 : la racine est juste avant
+    k = np.searchsorted(-f, 0.0, side="left")
+    probe = breaks[k] - 1.0 if k == 0 else (breaks[k - 1] + breaks[k]) / 2 if k < len(breaks) else breaks[-1] + 1.0
+    act = (v - probe * a > 0) & nz
+    lam = ((a * v)[act].sum() - 1) / (a[act] ** 2).sum()
+    return np.maximum(v - lam * a, 0.0)
+
+
+def _solve(cov, linear, a, long_only=True, start=None, max_iter=20000, tol=1e-12):
+    """
+    min w'Σw - linear'w  sous a'w = 1 (et w >= 0 si long_only).
+    Sans contrainte de signe : système KKT. Long-only : gradient projeté accéléré (FISTA),
+    le problème est convexe et la projection exacte.
+    """
+    n = len(a)
+    if not long_only:
+        kkt = np.block([[2 * cov, a[:, None]], [a[None, :], np.zeros((1, 1))]])
+        return np.linalg.solve(kkt, np.append(linear, 1.0))[:n]
+    step = 1 / (2 * np.linalg.eigvalsh(cov)[-1])
+    w = _project(np.full(n, 1 / n) if start is None else start, a)
+    y, t = w, 1.0
+    for _ in range(max_iter):
+        w_next = _project(y - step * (2 * cov @ y - linear), a)
+        if np.abs(w_next - w).max() < tol:
+            return w_next
+        t_next = (1 + np.sqrt(1 + 4 * t * t)) / 2
+        y = w_next + (t - 1) / t_next * (w_next - w)
+        w, t = w_next, t_next
+    return w
+
+
+class PortfolioEngine:
+    """
+    Moyennes et covariance annualisées des rendements d'un panel aligné : évaluation vectorisée
+    de lots de portefeuilles, portefeuilles de variance minimale et de Sharpe maximal,
+    frontière efficiente.
+
+    :param returns: DataFrame dates × actifs de rendements (lignes incomplètes ignorées).
+    :param risk_free: Taux annuel scalaire, ou taux par période alignés sur les dates
+                      (excess_returns.risk_free_rates) : le Sharpe porte sur les excédents.
+    """
+
+    def __init__(self, returns, risk_free=0.0, periods=TRADING_DAYS):
+        self.assets = list(returns.columns)
+        self.periods = periods
+        values = returns.to_numpy(dtype=float)
+        keep = ~np.isnan(values).any(axis=1)
+        x = values[keep]
+        self.n_obs = len(x)
+        self.mean = x.mean(axis=0) * periods
+        self.cov = np.cov(x, rowvar=False, ddof=1).reshape(len(self.assets), -1) * periods
+        if np.ndim(risk_free) == 0:
+            self.excess = self.mean - float(risk_free)
+        else:
+            rates = np.nan_to_num(np.asarray(risk_free, dtype=float))
+            rates = rates[:, None] if rates.ndim == 1 else rates
+            self.excess = (x - rates[keep]).mean(axis=0) * periods
+
+    @classmethod
+    def from_panel(cls, panel, field="Close", **kwargs):
+        return cls(pd.DataFrame(panel.returns(field), index=panel.dates, columns=panel.assets), **kwargs)
+
+    def evaluate(self, weights):
+        """
+        Rendement, volatilité et Sharpe d'un lot de portefeuilles en un produit matriciel.
+
+        :param weights: Tableau (portefeuilles × actifs) ou vecteur de poids.
+        :return: Tableau (portefeuilles × 3) dans l'ordre de STATS_COLUMNS.
+        """
+        w = np.atleast_2d(np.asarray(weights, dtype=float))
+        ret = w @ self.mean
+        vol = np.sqrt(np.maximum(np.einsum("ij,ij->i", w @ self.cov, w), 0.0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe = (w @ self.excess) / vol
+        return np.column_stack([ret, vol, sharpe])
+
+    def stats(self, weights):
+        return pd.DataFrame(self.evaluate(weights), columns=STATS_COLUMNS)
+
+    def min_variance(self, long_only=True):
+        n = len(self.assets)
+        return _solve(self.cov, np.zeros(n), np.ones(n), long_only)
+
+    def max_sharpe(self, long_only=True):
+        # Sharpe maximal : min y'Σy sous excess'y = 1 (y >= 0), puis normalisation w = y / Σy
+        if not (self.excess > 0).any():
+            raise ValueError("Aucun actif n'a de rendement excédentaire positif : Sharpe maximal non défini")
+        y = _solve(self.cov, np.zeros(len(self.assets)), self.excess, long_only)
+        return y / y.sum()
+
+    def frontier(self, n_points=50, long_only=True):
+        """
+        Frontière efficiente : min w'Σw - q·μ'w pour q croissant, de la variance minimale
+        (q = 0) jusqu'à l'actif de plus fort rendement. Chaque point repart du précédent.
+
+        :return: (poids (points × actifs), statistiques (points × 3)).
+        """
+        n = len(self.assets)
+        j = int(np.argmax(self.mean))
+        gaps = self.mean[j] - self.mean
+        others = gaps > 0
+        # q à partir duquel l'actif j seul est optimal (conditions KKT au sommet du simplexe)
+        q_max = (2 * (self.cov[j, j] - self.cov[j, others]) / gaps[others]).max() if others.any() else 0.0
+        weights, w = [], None
+        for q in q_max * np.linspace(0, 1, n_points) ** 2:
+            w = _solve(self.cov, q * self.mean, np.ones(n), long_only, start=w)
+            weights.append(w)
+        weights = np.array(weights)
+        return weights, self.evaluate(weights)
+
+
+def backtest(returns, weights, rebalance="M"):
+    """
+    Backtest vectorisé de portefeuilles rééquilibrés : entre deux rééquilibrages les poids
+    dérivent avec les prix, la croissance de chaque période s'obtient par différence des
+    log-rendements cumulés et un seul produit matriciel pour tous les portefeuilles.
+
+    :param returns: DataFrame dates × actifs de rendements (NaN = rendement nul).
+    :param weights: Vecteur de poids ou tableau (portefeuilles × actifs).
+    :param rebalance: Fréquence pandas ('D', 'W', 'M', 'Q') ou None (achat-conservation).
+    :return: DataFrame dates × portefeuilles de la richesse (1 avant la première date).
+    """
+    w = np.atleast_2d(np.asarray(weights, dtype=float))
+    r = np.nan_to_num(returns.to_numpy(dtype=float))
+    log_wealth = np.zeros((len(r) + 1, r.shape[1]))
+    np.cumsum(np.log1p(r), axis=0, out=log_wealth[1:])
+
+    if rebalance is None:
+        period = np.zeros(len(r), dtype=int)
+    else:
+        labels = pd.DatetimeIndex(returns.index).to_period(rebalance).asi8
+        period = np.concatenate([[0], np.cumsum(labels[1:] != labels[:-1])])
+    starts = np.flatnonzero(np.diff(period, prepend=-1))
+    ends = np.append(starts[1:] - 1, len(r) - 1)
+
+    # Croissance de chaque actif depuis le dernier rééquilibrage, puis du portefeuille
+    growth = np.exp(log_wealth[1:] - log_wealth[starts[period]]) @ w.T
+    # Richesse au début de chaque période = produit des croissances des périodes précédentes
+    carried = np.concatenate([np.ones((1, len(w))), np.cumprod(growth[ends], axis=0)[:-1]])
+    return pd.DataFrame(carried[period] * growth, index=returns.index)
@@ -0,0 +1,232 @@
+import io
+import os
+import sys
+import glob
+import json
+import time
+import numpy as np
+import pandas as pd
+
+# Stockage colonnaire des séries OHLCV : un fichier .npy par colonne, lu en memory-map.
+# Les dates sont stockées en int64 (nombre de jours depuis 1970-01-01).
+STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "price_store")
+CSV_PATTERNS = ["*_historical_data_cleaned.csv", "*_with_indicators.csv"]
+META_FILE = "meta.json"
+
+
+def store_name(csv_path):
+    # Les copies d'un même fichier (FINTECH/, indicateurs_economique/, Web application...)
+    # partagent une seule entrée du store, donc les mêmes pages en cache OS.
+    return os.path.splitext(os.path.basename(csv_path.replace("\\", "/")))[0]
+
+
+def entry_dir(name, store_dir=STORE_DIR):
+    return os.path.join(store_dir, name)
+
+
+def _save_array(path, array):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, np.ascontiguousarray(array))
+    os.replace(tmp_path, path)
+
+
+def write_frame(df, name, store_dir=STORE_DIR, source=None):
+    """
+    Écrit un DataFrame (colonne 'Date' + colonnes numériques) dans le store.
+
+    :param df: DataFrame contenant une colonne 'Date'.
+    :param name: Nom de l'entrée (ex. 'bitcoin_historical_data_cleaned').
+    :param source: Chemin du CSV d'origine, conservé dans les métadonnées.
+    :return: Chemin du dossier de l'entrée.
+    """
+    path = entry_dir(name, store_dir)
+    os.makedirs(path, exist_ok=True)
+
+    dates = pd.to_datetime(df["Date"]).values.astype("datetime64[D]").astype(np.int64)
+    _save_array(os.path.join(path, "Date.npy"), dates)
+
+    columns = []
+    for i, col in enumerate(c for c in df.columns if c != "Date"):
+        values = df[col].to_numpy()
+        if values.dtype.kind in "iub":
+            values = values.astype(np.int64)
+        elif values.dtype.kind == "f":
+            values = values.astype(np.float64)
+        else:
+            raise ValueError(f"Colonne non numérique '{col}' dans {name}")
+        file_name = f"col_{i:03d}.npy"
+        _save_array(os.path.join(path, file_name), values)
+        columns.append({"name": col, "file": file_name, "dtype": values.dtype.str})
+
+    # Les métadonnées sont écrites en dernier : un lecteur ne voit jamais une entrée incomplète.
+    meta = {
+        "name": name,
+        "source": source,
+        "rows": int(len(dates)),
+        "columns": columns,
+        "converted_at": time.time(),
+    }
+    tmp_meta = os.path.join(path, META_FILE + ".tmp")
+    with open(tmp_meta, "w") as f:
+        json.dump(meta, f, indent=4)
+    os.replace(tmp_meta, os.path.join(path, META_FILE))
+    return path
+
+
+def _append_array(path, values):
+    # Ajout en fin de fichier .npy : les données sont écrites avant l'en-tête, un lecteur
+    # concurrent ne voit donc jamais plus de lignes qu'il n'en existe.
+    if not os.path.exists(path):
+        _save_array(path, values)
+        return
+    with open(path, "r+b") as f:
+        version = np.lib.format.read_magic(f)
+        if version != (1, 0):
+            f.close()
+            _save_array(path, np.concatenate([np.load(path), values]))
+            return
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        header_len = f.tell()
+        header = io.BytesIO()
+        np.lib.format.write_array_header_1_0(header, {
+            "descr": np.lib.format.dtype_to_descr(dtype),
+            "fortran_order": fortran_order,
+            "shape": (shape[0] + len(values),),
+        })
+        if header.tell() != header_len:
+            # En-tête plus long que l'espace réservé : réécriture complète (rare)
+            f.close()
+            _save_array(path, np.concatenate([np.load(path), values.astype(dtype)]))
+            return
+        f.seek(0, os.SEEK_END)
+        f.write(np.ascontiguousarray(values.astype(dtype)).tobytes())
+        f.flush()
+        f.seek(0)
+        f.write(header.getvalue())
+
+
+def append_frame(df, name, store_dir=STORE_DIR):
+    """
+    Ajoute des lignes à la fin d'une entrée du store (créée si absente).
+    Les dates doivent être strictement postérieures à la dernière date stockée.
+
+    :param df: DataFrame avec 'Date' et les mêmes colonnes que l'entrée.
+    :return: Nombre de lignes ajoutées.
+    """
+    meta = read_meta(name, store_dir)
+    if meta is None:
+        write_frame(df, name, store_dir)
+        return len(df)
+    if df.empty:
+        return 0
+    path = entry_dir(name, store_dir)
+    dates = pd.to_datetime(df["Date"]).values.astype("datetime64[D]").astype(np.int64)
+    last = np.load(os.path.join(path, "Date.npy"), mmap_mode="r")
+    if len(last) and dates[0] <= last[-1]:
+        raise ValueError(f"Les nouvelles lignes de {name} doivent être postérieures à la dernière date stockée")
+    missing = [c["name"] for c in meta["columns"] if c["name"] not in df.columns]
+    if missing:
+        raise ValueError(f"Colonnes manquantes pour {name} : {missing}")
+
+    for col in meta["columns"]:
+        _append_array(os.path.join(path, col["file"]), df[col["name"]].to_numpy())
+    _append_array(os.path.join(path, "Date.npy"), dates)
+
+    meta["rows"] += len(df)
+    meta["converted_at"] = time.time()
+    tmp_meta = os.path.join(path, META_FILE + ".tmp")
+    with open(tmp_meta, "w") as f:
+        json.dump(meta, f, indent=4)
+    os.replace(tmp_meta, os.path.join(path, META_FILE))
+    return len(df)
+
+
+def last_date(name, store_dir=STORE_DIR):
+    meta = read_meta(name, store_dir)
+    if meta is None or meta["rows"] == 0:
+        return None
+    dates = np.load(os.path.join(entry_dir(name, store_dir), "Date.npy"), mmap_mode="r")
+    return pd.Timestamp(np.datetime64(int(dates[-1]), "D"))
+
+
+def convert_csv(csv_path, store_dir=STORE_DIR):
+    df = pd.read_csv(csv_path)
+    df = df.loc[:, ~df.columns.str.startswith("Unnamed")]
+    return write_frame(df, store_name(csv_path), store_dir, source=os.path.abspath(csv_path))
+
+
+def read_meta(name, store_dir=STORE_DIR):
+    meta_path = os.path.join(entry_dir(name, store_dir), META_FILE)
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path) as f:
+        return json.load(f)
+
+
+def is_stale(csv_path, store_dir=STORE_DIR):
+    meta = read_meta(store_name(csv_path), store_dir)
+    if meta is None:
+        return True
+    return os.path.exists(csv_path) and os.path.getmtime(csv_path) > meta["converted_at"]
+
+
+def open_columns(name, store_dir=STORE_DIR):
+    # Renvoie les tableaux memory-mappés (lecture seule), sans copie.
+    # Tronqués au nombre de lignes des métadonnées : un ajout en cours reste invisible.
+    meta = read_meta(name, store_dir)
+    if meta is None:
+        raise FileNotFoundError(f"Entrée '{name}' absente du store {store_dir}")
+    path = entry_dir(name, store_dir)
+    rows = meta["rows"]
+    columns = {"Date": np.load(os.path.join(path, "Date.npy"), mmap_mode="r")[:rows]}
+    for col in meta["columns"]:
+        columns[col["name"]] = np.load(os.path.join(path, col["file"]), mmap_mode="r")[:rows]
+    return columns
+
+
+def open_frame(csv_path, store_dir=STORE_DIR):
+    """
+    Ouvre un fichier de prix via le store colonnaire (conversion au premier accès
+    ou si le CSV a été modifié depuis).
+
+    :param csv_path: Chemin du CSV d'origine (séparateurs '/' ou '\\').
+    :return: DataFrame dont les colonnes numériques pointent sur les fichiers mappés.
+    """
+    csv_path = csv_path.replace("\\", "/")
+    if is_stale(csv_path, store_dir):
+        convert_csv(csv_path, store_dir)
+    return open_entry(store_name(csv_path), store_dir)
+
+
+def open_entry(name, store_dir=STORE_DIR):
+    # Ouvre une entrée du store par son nom (entrées alimentées sans CSV, ex. ingestion)
+    columns = open_columns(name, store_dir)
+    data = {"Date": pd.to_datetime(np.asarray(columns.pop("Date")), unit="D")}
+    data.update(columns)
+    return pd.DataFrame(data, copy=False)
+
+
+def convert_all(directories, store_dir=STORE_DIR):
+    converted = {}
+    for directory in directories:
+        for pattern in CSV_PATTERNS:
+            for csv_path in sorted(glob.glob(os.path.join(directory, pattern))):
+                name = store_name(csv_path)
+                if name not in converted:
+                    convert_csv(csv_path, store_dir)
+                    converted[name] = csv_path
+    return converted
+
+
+if __name__ == "__main__":
+    # Conversion ponctuelle : python indicateurs_economique/price_store.py [dossiers...]
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    dirs = sys.argv[1:] or [
+        os.path.join(root, "indicateurs_economique"),
+        os.path.join(root, "Data_csv_cleaned"),
+        os.path.join(root, "FINTECH"),
+        os.path.join(root, "Web application final version"),
+    ]
+    for name, csv_path in convert_all(dirs).items():
+        print(f"{name} <- {csv_path}")
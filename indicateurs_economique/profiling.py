@@ -0,0 +1,166 @@
+import io
+import os
+import json
+import time
+import pstats
+import cProfile
+import tracemalloc
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+import pandas as pd
+
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiling")
+# Au-delà, profiling/<app>.jsonl est renommé en <app>.jsonl.1 (remplace l'archive précédente)
+MAX_EXPORT_BYTES = 5 * 1024 * 1024
+HISTORY_ROWS = 200
+
+# Budgets par étape (secondes) : les dépassements sont signalés dans le panneau et l'export
+STAGE_BUDGETS = {
+    "Chargement": 0.05,
+    "Filtrage des dates": 0.01,
+    "Indicateurs": 0.2,
+    "Overview": 0.2,
+    "Détails": 0.3,
+    "Comparaisons": 0.3,
+    "Corrélations": 0.5,
+    "Portefeuille": 0.5,
+    "Prédiction": 1.0,
+    "Sérialisation Plotly": 0.15,
+}
+
+
+class RerunProfiler:
+    """
+    Instrumentation d'une exécution du script Streamlit : durée et variation de mémoire
+    (tracemalloc, optionnel) par étape, capture cProfile optionnelle, export en JSON lines.
+    Les étapes peuvent être imbriquées et répétées : leurs durées s'additionnent.
+
+    tracemalloc et cProfile ne sont actifs qu'à l'intérieur du bloc `with prof:` : ils sont
+    arrêtés à la sortie du bloc même si le script est interrompu (st.rerun, st.stop, exception).
+    """
+
+    def __init__(self, app, budgets=None, trace_memory=False, cprofile=False):
+        self.app = app
+        self.budgets = STAGE_BUDGETS if budgets is None else budgets
+        self.stages = OrderedDict()
+        self.trace_memory = trace_memory
+        self.cprofile = cprofile
+        self.peak_memory_kb = None
+        self.cprofile_stats = None
+        self._start = time.perf_counter()
+        self._end = None
+        self._owns_trace = False
+        self._profile = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        # tracemalloc est global au processus : on ne l'arrête que si on l'a démarré
+        self._owns_trace = self.trace_memory and not tracemalloc.is_tracing()
+        if self._owns_trace:
+            tracemalloc.start()
+        if self.cprofile:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def stop(self, top=25):
+        """
+        Désactive cProfile et tracemalloc (s'ils ont été démarrés ici) et conserve leurs résultats.
+        Idempotent : appelé à la sortie du bloc `with` puis éventuellement par finish().
+
+        :param top: Nombre de fonctions du rapport cProfile (tri par temps cumulé).
+        """
+        if self._end is None:
+            self._end = time.perf_counter()
+        if self._profile is not None:
+            self._profile.disable()
+            out = io.StringIO()
+            pstats.Stats(self._profile, stream=out).sort_stats("cumulative").print_stats(top)
+            self.cprofile_stats = out.getvalue()
+            self._profile = None
+        if self._owns_trace:
+            self.peak_memory_kb = tracemalloc.get_traced_memory()[1] / 1024
+            tracemalloc.stop()
+            self._owns_trace = False
+
+    def record(self, name, seconds, memory_kb=0.0):
+        stage = self.stages.setdefault(name, {"seconds": 0.0, "calls": 0, "memory_kb": 0.0})
+        stage["seconds"] += seconds
+        stage["calls"] += 1
+        stage["memory_kb"] += memory_kb
+
+    @contextmanager
+    def stage(self, name):
+        tracing = tracemalloc.is_tracing()
+        memory = tracemalloc.get_traced_memory()[0] if tracing else 0
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            delta = (tracemalloc.get_traced_memory()[0] - memory) / 1024 if tracing else 0.0
+            self.record(name, time.perf_counter() - start, delta)
+
+    def _rows(self):
+        rows = []
+        for name, stage in self.stages.items():
+            budget = self.budgets.get(name)
+            rows.append({"Étape": name, "Durée (s)": round(stage["seconds"], 4), "Appels": stage["calls"],
+                         "Mémoire (Ko)": round(stage["memory_kb"], 1), "Budget (s)": budget,
+                         "Dépassement": budget is not None and stage["seconds"] > budget})
+        return rows
+
+    def summary(self):
+        # Étapes × (durée, appels, mémoire, budget, dépassement)
+        return pd.DataFrame(self._rows(), columns=["Étape", "Durée (s)", "Appels", "Mémoire (Ko)", "Budget (s)", "Dépassement"])
+
+    def finish(self, caches=None):
+        """
+        Clôt la mesure de l'exécution (arrête les sondes si le bloc `with` ne l'a pas déjà fait).
+
+        :param caches: Statistiques de cache à joindre ({nom: {'hits', 'misses', ...}}).
+        :return: Enregistrement (dictionnaire sérialisable en JSON).
+        """
+        self.stop()
+        record = {
+            "app": self.app,
+            "timestamp": time.time(),
+            "total": self._end - self._start,
+            "stages": self._rows(),
+            "caches": caches or {},
+        }
+        if self.cprofile_stats is not None:
+            record["cprofile"] = self.cprofile_stats
+        if self.peak_memory_kb is not None:
+            record["peak_memory_kb"] = self.peak_memory_kb
+        return record
+
+    def export(self, record, directory=PROFILE_DIR, max_bytes=MAX_EXPORT_BYTES):
+        # Une ligne JSON par exécution dans profiling/<app>.jsonl (suivi des régressions de latence),
+        # avec rotation au-delà de max_bytes : le fichier relu à chaque rerun reste borné
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self.app}.jsonl")
+        if os.path.exists(path) and os.path.getsize(path) > max_bytes:
+            os.replace(path, path + ".1")
+        with open(path, "a") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def load_records(app, directory=PROFILE_DIR, n=HISTORY_ROWS):
+    # Relit les n dernières exécutions exportées : une ligne par exécution, une colonne par étape (durée).
+    # Seules ces n lignes sont décodées en JSON.
+    path = os.path.join(directory, f"{app}.jsonl")
+    if not os.path.exists(path):
+        return pd.DataFrame()
+    with open(path) as f:
+        lines = deque(f, maxlen=n)
+    rows = []
+    for line in lines:
+        record = json.loads(line)
+        row = {"timestamp": pd.Timestamp(record["timestamp"], unit="s"), "total": record["total"]}
+        row.update({stage["Étape"]: stage["Durée (s)"] for stage in record["stages"]})
+        rows.append(row)
+    return pd.DataFrame(rows).set_index("timestamp")
@@ -0,0 +1,216 @@
+import os
+import sys
+import glob
+import json
+import time
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from price_store import STORE_DIR, store_name, is_stale, convert_csv, open_columns, open_entry, read_meta
+from timeseries import TimeSeries
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BASE_DIR)
+REGISTRY_FILE = os.path.join(STORE_DIR, "registry.json")
+MEMORY_BUDGET_MB = 256
+
+# Univers initial (anciens dictionnaires data_files des applications) : symbole -> (CSV, classe d'actifs)
+DEFAULT_ASSETS = {
+    "S&P 500": ("indicateurs_economique/sp500_with_indicators.csv", "Indice"),
+    "Bitcoin": ("indicateurs_economique/bitcoin_historical_data_cleaned.csv", "Crypto-actif"),
+    "Gold": ("indicateurs_economique/gold_historical_data_cleaned.csv", "Matière première"),
+}
+
+
+def _relative(path):
+    # Chemins du manifeste relatifs à la racine du dépôt, toujours avec des '/'
+    return os.path.relpath(os.path.abspath(path.replace("\\", "/")), ROOT_DIR).replace(os.sep, "/")
+
+
+def _describe(symbol, csv_path, asset_class):
+    # Convertit le CSV dans le store si nécessaire puis lit les bornes sur les dates memory-mappées
+    if is_stale(csv_path):
+        convert_csv(csv_path)
+    dates = open_columns(store_name(csv_path))["Date"]
+    bounds = [pd.Timestamp(np.datetime64(int(d), "D")).strftime("%Y-%m-%d") for d in (dates[0], dates[-1])] if len(dates) else [None, None]
+    return {
+        "symbol": symbol,
+        "asset_class": asset_class,
+        "path": _relative(csv_path),
+        "start": bounds[0],
+        "end": bounds[1],
+        "rows": int(len(dates)),
+        "mtime_ns": os.stat(csv_path).st_mtime_ns,
+    }
+
+
+class AssetRegistry:
+    """
+    Registre des actifs adossé à un manifeste sur disque (symbole, classe d'actifs, chemin,
+    bornes de dates, nombre de lignes). Les listes d'actifs et les bornes se lisent dans le
+    manifeste seul ; une série n'est ouverte qu'au premier accès et les séries les moins
+    récemment utilisées sont évincées au-delà du budget mémoire.
+
+    :param path: Fichier du manifeste (créé avec DEFAULT_ASSETS s'il est absent).
+    :param memory_budget_mb: Budget des séries ouvertes (taille des colonnes, en Mo).
+    """
+
+    def __init__(self, path=REGISTRY_FILE, memory_budget_mb=MEMORY_BUDGET_MB):
+        self.path = path
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self._loaded = OrderedDict()
+        self._memory = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        # Partagé entre sessions Streamlit (st.cache_resource)
+        self._lock = threading.RLock()
+        if os.path.exists(path):
+            with open(path) as f:
+                self._entries = json.load(f)["assets"]
+            # CSV modifiés ou entrées du store complétées depuis l'écriture du manifeste
+            self.refresh()
+        else:
+            self._entries = {}
+            for symbol, (csv_path, asset_class) in DEFAULT_ASSETS.items():
+                self._entries[symbol] = _describe(symbol, os.path.join(ROOT_DIR, csv_path), asset_class)
+            self.save()
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"assets": self._entries, "updated_at": time.time()}, f, indent=4, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def register(self, symbol, csv_path, asset_class, save=True):
+        with self._lock:
+            self._entries[symbol] = _describe(symbol, csv_path, asset_class)
+            self._evict(symbol)
+            if save:
+                self.save()
+        return self._entries[symbol]
+
+    def register_directory(self, directory, asset_class, pattern="*_historical_data_cleaned.csv"):
+        """
+        Enregistre tous les CSV d'un dossier (un fichier par ticker, symbole = préfixe du nom).
+
+        :return: Symboles enregistrés.
+        """
+        suffix = pattern.lstrip("*")
+        symbols = []
+        for csv_path in sorted(glob.glob(os.path.join(directory, pattern))):
+            symbol = os.path.basename(csv_path)[:-len(suffix)].upper()
+            self.register(symbol, csv_path, asset_class, save=False)
+            symbols.append(symbol)
+        self.save()
+        return symbols
+
+    def _changed(self, entry):
+        # CSV modifié (mtime) ou entrée du store complétée par ajout (market_data.refresh, ingestion)
+        csv_path = os.path.join(ROOT_DIR, entry["path"])
+        if not os.path.exists(csv_path):
+            return False
+        if os.stat(csv_path).st_mtime_ns != entry["mtime_ns"]:
+            return True
+        meta = read_meta(store_name(csv_path))
+        return meta is not None and meta["rows"] != entry["rows"]
+
+    def _check(self, symbol, save=True):
+        # Redécrit l'actif si sa source a changé (bornes et nombre de lignes à jour) ; True si mis à jour
+        with self._lock:
+            entry = self.info(symbol)
+            if not self._changed(entry):
+                return False
+            self._entries[symbol] = _describe(symbol, os.path.join(ROOT_DIR, entry["path"]), entry["asset_class"])
+            self._evict(symbol)
+            if save:
+                self.save()
+            return True
+
+    def refresh(self):
+        # Redécrit les actifs dont le CSV ou l'entrée du store a changé ; renvoie les symboles mis à jour
+        with self._lock:
+            updated = [symbol for symbol in list(self._entries) if self._check(symbol, save=False)]
+            if updated:
+                self.save()
+        return updated
+
+    # Lectures du manifeste seul (aucune série ouverte, sauf bounds qui revérifie la source)
+
+    def symbols(self, asset_class=None):
+        return [s for s, e in self._entries.items() if asset_class is None or e["asset_class"] == asset_class]
+
+    def classes(self):
+        return sorted({e["asset_class"] for e in self._entries.values()})
+
+    def info(self, symbol):
+        if symbol not in self._entries:
+            raise KeyError(f"Actif absent du registre : {symbol}")
+        return self._entries[symbol]
+
+    def bounds(self, symbol):
+        # Revérifiées à chaque appel (un stat et un meta.json) : de nouvelles barres deviennent sélectionnables
+        self._check(symbol)
+        entry = self.info(symbol)
+        return pd.Timestamp(entry["start"]), pd.Timestamp(entry["end"])
+
+    # Chargement paresseux et éviction
+
+    def _evict(self, symbol):
+        frame, _ = self._loaded.pop(symbol, (None, None))
+        if frame is not None:
+            self._memory -= int(frame.memory_usage(index=False).sum())
+            self._evictions += 1
+
+    def _load(self, symbol):
+        with self._lock:
+            if symbol in self._loaded:
+                self._loaded.move_to_end(symbol)
+                self._hits += 1
+                return self._loaded[symbol]
+        self._check(symbol)
+        entry = self.info(symbol)
+        csv_path = os.path.join(ROOT_DIR, entry["path"])
+        if is_stale(csv_path):
+            convert_csv(csv_path)
+        frame = open_entry(store_name(csv_path))
+        loaded = (frame, TimeSeries.from_frame(frame))
+        with self._lock:
+            self._misses += 1
+            if symbol not in self._loaded:
+                self._loaded[symbol] = loaded
+                self._memory += int(frame.memory_usage(index=False).sum())
+            # Au moins la série demandée reste ouverte, même si elle dépasse le budget à elle seule
+            while self._memory > self.memory_budget and len(self._loaded) > 1:
+                self._evict(next(iter(self._loaded)))
+            return self._loaded.get(symbol, loaded)
+
+    def frame(self, symbol):
+        # DataFrame de l'actif (colonnes memory-mappées du store)
+        return self._load(symbol)[0]
+
+    def series(self, symbol):
+        # TimeSeries de l'actif : périodes par recherche dichotomique, sans copie
+        return self._load(symbol)[1]
+
+    def stats(self):
+        with self._lock:
+            calls = self._hits + self._misses
+            return {"calls": calls, "hits": self._hits, "misses": self._misses,
+                    "hit_rate": self._hits / calls if calls else 0.0, "evictions": self._evictions,
+                    "loaded": len(self._loaded), "memory_mb": self._memory / 1024 / 1024}
+
+
+if __name__ == "__main__":
+    # python indicateurs_economique/registry.py [dossier classe_d_actifs]...
+    registry = AssetRegistry()
+    args = sys.argv[1:]
+    for directory, asset_class in zip(args[::2], args[1::2]):
+        print(f"{asset_class} : {len(registry.register_directory(directory, asset_class))} actifs <- {directory}")
+    for symbol in registry.refresh():
+        print(f"{symbol} mis à jour")
+    for symbol in registry.symbols():
+        entry = registry.info(symbol)
+        print(f"{symbol} [{entry['asset_class']}] {entry['start']} -> {entry['end']} ({entry['rows']} lignes) {entry['path']}")
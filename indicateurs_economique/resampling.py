@@ -0,0 +1,142 @@
+import os
+import sys
+import json
+import time
+import pandas as pd
+from price_store import STORE_DIR, open_entry, write_frame
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CUBE_DIR = os.path.join(STORE_DIR, "cube")
+MANIFEST_FILE = "manifest.json"
+
+# Fréquences du cube (mêmes règles que Indic_actif.ipynb : semaines au lundi, fins de mois)
+FREQUENCIES = {"D": None, "W": "W-MON", "M": "ME", "Q": "QE"}
+
+# Séries sources : macro (moyenne par période) ou OHLCV (prix moyens, volumes cumulés)
+SOURCES = {
+    "R_F": (os.path.join(BASE_DIR, "Rendement_sans_risque.csv"), "macro"),
+    "VIX": (os.path.join(BASE_DIR, "VIX_index.csv"), "macro"),
+    "Bitcoin": (os.path.join(BASE_DIR, "bitcoin_historical_data_cleaned.csv"), "ohlcv"),
+    "Gold": (os.path.join(BASE_DIR, "gold_historical_data_cleaned.csv"), "ohlcv"),
+    "SP500": (os.path.join(BASE_DIR, "sp500_historical_data_cleaned.csv"), "ohlcv"),
+}
+OHLCV_AGG = {"Close": "mean", "High": "mean", "Low": "mean", "Open": "mean", "Volume": "sum"}
+
+
+def _fingerprint(path):
+    stat = os.stat(path)
+    return {"path": os.path.abspath(path), "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def _read_source(name, path, kind):
+    # Colonnes préfixées par la source ('Bitcoin_Close'...), série macro sous son propre nom
+    df = pd.read_csv(path, parse_dates=["Date"]).set_index("Date").sort_index()
+    if kind == "macro":
+        return df[[df.columns[0]]].rename(columns={df.columns[0]: name}).astype(float)
+    return df[list(OHLCV_AGG)].add_prefix(f"{name}_")
+
+
+def _aggregate(frame, kind, rule):
+    if rule is None:
+        return frame
+    resampler = frame.resample(rule)
+    if kind == "macro":
+        return resampler.mean()
+    # min_count=1 : une période sans cotation donne un volume NaN (et non 0), comme les prix
+    sums = [col for col in frame.columns if OHLCV_AGG[col.rsplit("_", 1)[1]] == "sum"]
+    means = [col for col in frame.columns if col not in sums]
+    return pd.concat([resampler[means].mean(), resampler[sums].sum(min_count=1)], axis=1)[list(frame.columns)]
+
+
+class ResamplingCube:
+    """
+    Agrégats précalculés (quotidien, hebdomadaire, mensuel, trimestriel) des prix, volumes,
+    R_F et VIX, stockés dans le store colonnaire (une entrée par fréquence).
+
+    Le cube est reconstruit automatiquement quand une source change (date de modification
+    ou taille différente de celles du manifeste).
+    """
+
+    def __init__(self, sources=None, cube_dir=CUBE_DIR):
+        self.sources = sources or SOURCES
+        self.cube_dir = cube_dir
+        self._frames = {}
+
+    def _manifest_path(self):
+        return os.path.join(self.cube_dir, MANIFEST_FILE)
+
+    def _read_manifest(self):
+        if not os.path.exists(self._manifest_path()):
+            return None
+        with open(self._manifest_path()) as f:
+            return json.load(f)
+
+    def is_stale(self):
+        manifest = self._read_manifest()
+        if manifest is None or set(manifest["frequencies"]) != set(FREQUENCIES):
+            return True
+        if set(manifest["sources"]) != set(self.sources):
+            return True
+        return any(manifest["sources"][name] != _fingerprint(path) for name, (path, _) in self.sources.items())
+
+    def build(self):
+        os.makedirs(self.cube_dir, exist_ok=True)
+        fingerprints = {name: _fingerprint(path) for name, (path, _) in self.sources.items()}
+        frames = {name: (_read_source(name, path, kind), kind) for name, (path, kind) in self.sources.items()}
+        for freq, rule in FREQUENCIES.items():
+            cube = pd.concat([_aggregate(frame, kind, rule) for frame, kind in frames.values()], axis=1).sort_index()
+            write_frame(cube.rename_axis("Date").reset_index(), f"cube_{freq}", self.cube_dir)
+
+        # Manifeste écrit en dernier : une construction interrompue sera refaite
+        tmp_path = self._manifest_path() + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"sources": fingerprints, "frequencies": list(FREQUENCIES), "built_at": time.time()}, f, indent=4)
+        os.replace(tmp_path, self._manifest_path())
+        self._frames.clear()
+
+    def refresh(self, force=False):
+        # Reconstruit le cube si nécessaire ; renvoie True si une reconstruction a eu lieu
+        if force or self.is_stale():
+            self.build()
+            return True
+        return False
+
+    def frame(self, freq):
+        if freq not in FREQUENCIES:
+            raise ValueError(f"Fréquence inconnue : {freq} (attendu : {list(FREQUENCIES)})")
+        self.refresh()
+        if freq not in self._frames:
+            self._frames[freq] = open_entry(f"cube_{freq}", self.cube_dir).set_index("Date")
+        return self._frames[freq]
+
+    def query(self, freq="M", series=None, start=None, end=None):
+        """
+        Lecture d'agrégats du cube.
+
+        :param freq: 'D', 'W', 'M' ou 'Q'.
+        :param series: Sources ('Bitcoin', 'VIX'...) ou colonnes ('Bitcoin_Close'...) ; toutes par défaut.
+        :param start: Date de début incluse (optionnelle).
+        :param end: Date de fin incluse (optionnelle).
+        :return: DataFrame indexé par date.
+        """
+        frame = self.frame(freq)
+        if series is not None:
+            columns = []
+            for name in series:
+                matches = [name] if name in frame.columns else [c for c in frame.columns if c.startswith(f"{name}_")]
+                if not matches:
+                    raise KeyError(f"Série absente du cube : {name}")
+                columns.extend(matches)
+            frame = frame[columns]
+        lo = frame.index.searchsorted(pd.Timestamp(start), side="left") if start is not None else 0
+        hi = frame.index.searchsorted(pd.Timestamp(end), side="right") if end is not None else len(frame)
+        return frame.iloc[lo:hi]
+
+
+if __name__ == "__main__":
+    # python indicateurs_economique/resampling.py [--force]
+    cube = ResamplingCube()
+    rebuilt = cube.refresh(force="--force" in sys.argv[1:])
+    print(f"Cube {'reconstruit' if rebuilt else 'à jour'} : {cube.cube_dir}")
+    for freq in FREQUENCIES:
+        print(f"{freq} : {len(cube.frame(freq))} lignes, {len(cube.frame(freq).columns)} colonnes")
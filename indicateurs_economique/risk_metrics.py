@@ -0,0 +1,216 @@
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+METRIC_COLUMNS = ["Rendement Annuel", "Volatilité Quotidienne", "Volatilité Annuelle",
+                  "Sharpe Ratio", "Sortino Ratio", "Ulcer Index", "Max Drawdown"]
+
+
+def to_returns(prices):
+    """
+    Rendements simples d'une matrice de prix (dates × actifs).
+    La première ligne vaut NaN, comme pct_change().
+    """
+    prices = np.asarray(prices, dtype=float)
+    if prices.ndim == 1:
+        prices = prices[:, None]
+    returns = np.full(prices.shape, np.nan)
+    returns[1:] = prices[1:] / prices[:-1] - 1
+    return returns
+
+
+def drawdown(returns):
+    # Drawdown en pourcentage de la richesse cumulée ; NaN là où l'actif n'a pas de cotation.
+    returns = np.asarray(returns, dtype=float)
+    wealth = np.cumprod(1 + np.nan_to_num(returns), axis=0)
+    dd = (wealth / np.maximum.accumulate(wealth, axis=0) - 1) * 100
+    dd[np.isnan(returns)] = np.nan
+    return dd
+
+
+def _excess(returns, risk_free):
+    # Taux annuel scalaire : retranché au rendement annualisé. Tableau de taux par période
+    # (excess_returns.risk_free_rates, par date ou par date × actif) : retranché rendement par rendement.
+    if np.ndim(risk_free) == 0:
+        return returns, float(risk_free)
+    rates = np.nan_to_num(np.asarray(risk_free, dtype=float))
+    if rates.ndim == 1:
+        rates = rates[:, None]
+    return returns - rates, 0.0
+
+
+def compute_risk_metrics(returns, risk_free=0.0, periods=TRADING_DAYS, assets=None):
+    """
+    Calcule toutes les métriques de risque pour tous les actifs en une passe NumPy.
+
+    :param returns: Matrice des rendements quotidiens (dates × actifs), NaN autorisés.
+    :param risk_free: Taux sans risque annuel (ex. 0.01), ou taux par période alignés sur
+                      les rendements (voir excess_returns) : Sharpe et Sortino sur les excédents.
+    :param periods: Nombre de périodes par an.
+    :param assets: Noms des actifs (index du résultat).
+    :return: DataFrame actifs × métriques.
+    """
+    if isinstance(returns, pd.DataFrame):
+        assets = assets if assets is not None else list(returns.columns)
+        returns = returns.to_numpy(dtype=float)
+    returns = np.asarray(returns, dtype=float)
+    if returns.ndim == 1:
+        returns = returns[:, None]
+
+    annual_return = np.nanmean(returns, axis=0) * periods
+    daily_vol = np.nanstd(returns, axis=0, ddof=1)
+    annual_vol = daily_vol * np.sqrt(periods)
+    excess, risk_free = _excess(returns, risk_free)
+    annual_excess = np.nanmean(excess, axis=0) * periods - risk_free
+    excess_vol = annual_vol if excess is returns else np.nanstd(excess, axis=0, ddof=1) * np.sqrt(periods)
+    downside = np.nanstd(np.where(excess < 0, excess, np.nan), axis=0)
+    dd = drawdown(returns)
+    ulcer = np.sqrt(np.nanmean(dd ** 2, axis=0))
+    max_dd = np.nanmin(dd, axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = annual_excess / excess_vol
+        sortino = annual_excess / (downside * np.sqrt(periods))
+
+    return pd.DataFrame(
+        np.column_stack([annual_return, daily_vol, annual_vol, sharpe, sortino, ulcer, max_dd]),
+        index=assets if assets is not None else range(returns.shape[1]),
+        columns=METRIC_COLUMNS,
+    )
+
+
+ROLLING_WINDOWS = (30, 90, 252)
+ROLLING_COLUMNS = ["Rendement Annuel", "Volatilité Annuelle", "Sharpe Ratio", "Sortino Ratio",
+                   "Max Drawdown", "Ulcer Index"]
+
+
+def _rolling_sum(x, window):
+    # Somme glissante par différence de sommes cumulées : O(n) quel que soit la fenêtre.
+    c = np.zeros((x.shape[0] + 1,) + x.shape[1:])
+    np.cumsum(x, axis=0, out=c[1:])
+    idx = np.arange(1, x.shape[0] + 1)
+    return c[idx] - c[np.maximum(idx - window, 0)]
+
+
+def _rolling_max(x, window):
+    """
+    Maximum glissant en O(n) (algorithme de van Herk / Gil-Werman) : maxima préfixes
+    et suffixes par blocs de taille window, vectorisés sur tous les actifs.
+    Les premières lignes utilisent une fenêtre partielle.
+    """
+    n = x.shape[0]
+    n_blocks = -(-n // window)
+    padded = np.full((n_blocks * window,) + x.shape[1:], -np.inf)
+    padded[:n] = x
+    blocks = padded.reshape((n_blocks, window) + x.shape[1:])
+    prefix = np.maximum.accumulate(blocks, axis=1).reshape(padded.shape)
+    suffix = np.maximum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].reshape(padded.shape)
+    out = prefix[:n].copy()
+    t = np.arange(window - 1, n)
+    out[t] = np.maximum(suffix[t - window + 1], prefix[t])
+    return out
+
+
+def _rolling_max_drawdown(wealth, window, max_memory_mb=32):
+    """
+    Max Drawdown de chaque fenêtre, mesuré depuis le plus haut atteint dans cette même fenêtre :
+    vue glissante (dates × actifs × window) sans copie, plus haut courant par np.maximum.accumulate,
+    traitée par blocs de lignes pour borner la mémoire. Les premières lignes utilisent une fenêtre partielle.
+    """
+    n = wealth.shape[0]
+    out = np.empty(wealth.shape)
+    head = wealth[:min(window - 1, n)]
+    out[:len(head)] = np.minimum.accumulate(head / np.maximum.accumulate(head, axis=0), axis=0)
+    if n >= window:
+        views = np.lib.stride_tricks.sliding_window_view(wealth, window, axis=0)
+        chunk = max(1, int(max_memory_mb * 1024 * 1024 // (8 * window * wealth.shape[1])))
+        for start in range(0, len(views), chunk):
+            v = views[start:start + chunk]
+            out[window - 1 + start:window - 1 + start + len(v)] = (v / np.maximum.accumulate(v, axis=-1)).min(axis=-1)
+    return (out - 1) * 100
+
+
+def rolling_risk_metrics(returns, window, risk_free=0.0, periods=TRADING_DAYS, min_periods=None):
+    """
+    Métriques glissantes en une passe linéaire pour tous les actifs : moyennes et variances
+    par sommes cumulées (r, r², rendements négatifs), drawdown par maximum glissant.
+
+    Le drawdown de l'Ulcer Index est mesuré par rapport au plus haut des window derniers jours ;
+    le Max Drawdown est celui de la fenêtre seule (plus haut repris au début de chaque fenêtre),
+    comme compute_risk_metrics sur la même tranche de rendements.
+
+    :param returns: Matrice des rendements (dates × actifs) ou DataFrame.
+    :param window: Taille de la fenêtre en jours (ex. 30, 90, 252).
+    :param risk_free: Taux annuel scalaire ou taux par période (voir compute_risk_metrics).
+    :param min_periods: Nombre minimal d'observations valides (par défaut window).
+    :return: Dictionnaire {métrique: DataFrame dates × actifs}.
+    """
+    index = columns = None
+    if isinstance(returns, pd.DataFrame):
+        index, columns = returns.index, returns.columns
+        returns = returns.to_numpy(dtype=float)
+    r = np.asarray(returns, dtype=float)
+    if r.ndim == 1:
+        r = r[:, None]
+    min_periods = min_periods or window
+    valid = ~np.isnan(r)
+
+    # Centrage par la moyenne globale : même variance, sommes de carrés mieux conditionnées
+    centre = np.nanmean(r, axis=0) if valid.any() else 0.0
+    rc = np.where(valid, r - centre, 0.0)
+    count = _rolling_sum(valid.astype(float), window)
+    total = _rolling_sum(rc, window)
+    total_sq = _rolling_sum(rc ** 2, window)
+
+    # Sharpe et Sortino sur les rendements excédentaires quand un taux par période est fourni
+    excess, risk_free = _excess(r, risk_free)
+    if excess is not r:
+        ec = np.where(valid, excess - centre, 0.0)
+        ex_total = _rolling_sum(ec, window)
+        ex_total_sq = _rolling_sum(ec ** 2, window)
+
+    neg = valid & (excess < 0)
+    rn = np.where(neg, excess, 0.0)
+    neg_count = _rolling_sum(neg.astype(float), window)
+    neg_total = _rolling_sum(rn, window)
+    neg_total_sq = _rolling_sum(rn ** 2, window)
+
+    wealth = np.cumprod(1 + np.where(valid, r, 0.0), axis=0)
+    dd = (wealth / _rolling_max(wealth, window) - 1) * 100
+    dd_sq_total = _rolling_sum(np.where(valid, dd ** 2, 0.0), window)
+    max_dd = _rolling_max_drawdown(wealth, window)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = total / count + centre
+        var = (total_sq - total ** 2 / count) / (count - 1)
+        neg_var = neg_total_sq / neg_count - (neg_total / neg_count) ** 2
+        annual_return = mean * periods
+        annual_vol = np.sqrt(np.maximum(var, 0)) * np.sqrt(periods)
+        annual_excess, excess_vol = annual_return - risk_free, annual_vol
+        if excess is not r:
+            annual_excess = (ex_total / count + centre) * periods
+            excess_vol = np.sqrt(np.maximum((ex_total_sq - ex_total ** 2 / count) / (count - 1), 0)) * np.sqrt(periods)
+        downside = np.sqrt(np.maximum(neg_var, 0)) * np.sqrt(periods)
+        metrics = {
+            "Rendement Annuel": annual_return,
+            "Volatilité Annuelle": annual_vol,
+            "Sharpe Ratio": annual_excess / excess_vol,
+            "Sortino Ratio": annual_excess / downside,
+            "Max Drawdown": max_dd,
+            "Ulcer Index": np.sqrt(dd_sq_total / count),
+        }
+
+    mask = (count < min_periods) | ~valid
+    return {name: pd.DataFrame(np.where(mask, np.nan, values), index=index, columns=columns)
+            for name, values in metrics.items()}
+
+
+def rolling_risk_panel(returns, windows=ROLLING_WINDOWS, risk_free=0.0, periods=TRADING_DAYS):
+    # Toutes les fenêtres demandées : {fenêtre: {métrique: DataFrame}}
+    return {window: rolling_risk_metrics(returns, window, risk_free, periods) for window in windows}
+
+
+def summary_metrics(close, risk_free=0.0, periods=TRADING_DAYS):
+    # Métriques d'un seul actif à partir de sa série de clôture (onglet Overview des dashboards).
+    return compute_risk_metrics(to_returns(close), risk_free, periods).iloc[0].to_dict()
@@ -0,0 +1,66 @@
+import threading
+from collections import OrderedDict
+import pandas as pd
+
+
+class TimeSeries:
+    """
+    Série d'un actif indexée par dates triées. Les colonnes brutes (tableaux memory-mappés
+    du store, en lecture seule) ne sont jamais modifiées : une période s'obtient par recherche
+    dichotomique en O(log n) et renvoie des vues, les colonnes dérivées (indicateurs) sont
+    ajoutées au DataFrame de la période, pas aux données brutes.
+    """
+
+    def __init__(self, dates, columns, max_ranges=256):
+        self.dates = pd.DatetimeIndex(dates)
+        if not self.dates.is_monotonic_increasing:
+            raise ValueError("Les dates d'une TimeSeries doivent être triées")
+        self.columns = dict(columns)
+        self.max_ranges = max_ranges
+        self._bounds = OrderedDict()
+        # Partagée entre sessions Streamlit (st.cache_resource) : cache des bornes protégé
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, df, **kwargs):
+        # Sans copie : les colonnes gardent les tableaux du DataFrame (mmap du store)
+        return cls(df["Date"], {col: df[col].to_numpy() for col in df.columns if col != "Date"}, **kwargs)
+
+    def __len__(self):
+        return len(self.dates)
+
+    def bounds(self, start=None, end=None):
+        """
+        Indices [lo, hi[ de la période [start, end] (bornes incluses, None = sans borne).
+        La conversion des bornes et les deux recherches sont mises en cache par période.
+        """
+        key = (start, end)
+        with self._lock:
+            if key in self._bounds:
+                self._bounds.move_to_end(key)
+                return self._bounds[key]
+        lo = self.dates.searchsorted(pd.Timestamp(start), side="left") if start is not None else 0
+        hi = self.dates.searchsorted(pd.Timestamp(end), side="right") if end is not None else len(self.dates)
+        bounds = (int(lo), int(max(lo, hi)))
+        with self._lock:
+            self._bounds[key] = bounds
+            if len(self._bounds) > self.max_ranges:
+                self._bounds.popitem(last=False)
+        return bounds
+
+    def column(self, name, start=None, end=None):
+        lo, hi = self.bounds(start, end)
+        return self.columns[name][lo:hi]
+
+    def view(self, start=None, end=None, columns=None):
+        """
+        DataFrame de la période dont les colonnes sont des vues sur les données brutes.
+
+        :param columns: Colonnes à inclure (toutes par défaut).
+        :return: DataFrame avec 'Date' et les colonnes demandées.
+        """
+        lo, hi = self.bounds(start, end)
+        data = {"Date": self.dates[lo:hi]}
+        for name in columns or self.columns:
+            data[name] = self.columns[name][lo:hi]
+        return pd.DataFrame(data, copy=False)
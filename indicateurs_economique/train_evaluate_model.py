@@ -1,6 +1,3 @@
-import pickle
-import json
-import os
 import numpy as np
 import pandas as pd
 from sklearn.linear_model import LinearRegression
@@ -10,13 +7,47 @@ from statsmodels.tsa.holtwinters import ExponentialSmoothing
 from statsmodels.tsa.statespace.sarimax import SARIMAX
 from tbats import TBATS
 from sklearn.metrics import mean_squared_error
+from model_registry import shared_registry, registry_key
+from order_search import OrderSearch, SEARCHABLE
+from incremental_prophet import IncrementalProphet
 
-def train_model(df, model_choice, pred_days=50, output_dir="model_coefficients"):
-    os.makedirs(output_dir, exist_ok=True)
+# Hyperparamètres fixes de chaque modèle (font partie de la clé du registre)
+MODEL_PARAMS = {
+    "Holt-Winters": {"trend": "add", "seasonal": "add", "seasonal_periods": 12},
+    "ARIMA": {"order": (5, 1, 0)},
+    "TBATS": {"seasonal_periods": [12]},
+}
+
+MODELS = ["Linear Regression", "Prophet", "Logistic Regression", "Holt-Winters", "ARIMA", "TBATS"]
+
+def train_model(df, model_choice, pred_days=50, output_dir="model_coefficients", registry=None, refit=False,
+                auto_params=False, criterion="aic", warm_start=False):
+    # Réutilise un modèle déjà ajusté sur les mêmes données avec les mêmes paramètres
+    # (refit=True force un nouvel ajustement, ex. pour mesurer les temps de calcul).
+    # auto_params=True : ordre ARIMA / saisonnalités choisis par OrderSearch (mis en cache par
+    # empreinte des données : seule la première demande lance la recherche).
+    # warm_start=True : Prophet repart des paramètres du dernier ajustement de la même série
+    # quand les données n'ont fait que s'allonger (IncrementalProphet).
+    registry = registry or shared_registry(output_dir)
+    model_params = MODEL_PARAMS.get(model_choice, {})
+    if auto_params and model_choice in SEARCHABLE:
+        model_params = OrderSearch(output_dir, criterion=criterion).best(df, model_choice)
+    params = dict(model_params, pred_days=pred_days)
+    key = registry_key(df, model_choice, params)
+    entry = None if refit else registry.lookup(key)
+    if entry is not None:
+        return entry["model_path"], entry["mse"], entry["rmse"]
+
+    df = df.copy()
     df['Prediction'] = df['Close'].shift(-pred_days)
+    # Dates des pred_days dernières séances : écartées de l'entraînement, elles servent de période de test
+    # aux modèles de prévision (leurs clôtures sont les pred_days dernières valeurs de y)
+    test_dates = df['Date'].iloc[-pred_days:]
     df = df.dropna()
     X = np.array(df['Close']).reshape(-1, 1)
     y = np.array(df['Prediction']).reshape(-1, 1)
+    # Régressions : prédictions sur l'échantillon, alignées sur y ; prévisions : les pred_days clôtures suivantes
+    target = y
     
     if model_choice == "Linear Regression":
         model = LinearRegression()
@@ -24,32 +55,39 @@ def train_model(df, model_choice, pred_days=50, output_dir="model_coefficients")
         predictions = model.predict(X)
     elif model_choice == "Prophet":
         df_prophet = df[['Date', 'Close']].rename(columns={'Date': 'ds', 'Close': 'y'})
-        model = Prophet()
-        model.fit(df_prophet)
-        future = model.make_future_dataframe(periods=pred_days)
-        forecast = model.predict(future)
+        if warm_start:
+            model, _ = IncrementalProphet(output_dir).fit(df_prophet, Prophet, {"model": model_choice, **model_params})
+        else:
+            model = Prophet()
+            model.fit(df_prophet)
+        forecast = model.predict(pd.DataFrame({'ds': test_dates.values}))
         predictions = forecast['yhat'].values
+        target = y[-pred_days:]
     elif model_choice == "Logistic Regression":
         X = sm.add_constant(X)
         model = sm.Logit(y, X)
         model = model.fit()
         predictions = model.predict(X)
     elif model_choice == "Holt-Winters":
-        model = ExponentialSmoothing(df['Close'], trend='add', seasonal='add', seasonal_periods=12).fit()
+        model = ExponentialSmoothing(df['Close'], trend=model_params["trend"], seasonal=model_params["seasonal"],
+                                     seasonal_periods=model_params["seasonal_periods"]).fit()
         predictions = model.forecast(pred_days)
+        target = y[-pred_days:]
     elif model_choice == "ARIMA":
-        model = SARIMAX(df['Close'], order=(5,1,0)).fit()
+        model = SARIMAX(df['Close'], order=model_params["order"]).fit()
         predictions = model.forecast(pred_days)
+        target = y[-pred_days:]
     elif model_choice == "TBATS":
-        estimator = TBATS(seasonal_periods=12)
+        estimator = TBATS(seasonal_periods=model_params["seasonal_periods"])
         model = estimator.fit(df['Close'])
         predictions = model.forecast(steps=pred_days)
+        target = y[-pred_days:]
     
-    mse = mean_squared_error(y[:len(predictions)], predictions)
+    mse = mean_squared_error(target, predictions)
     rmse = np.sqrt(mse)
     
-    model_path = os.path.join(output_dir, f"{model_choice}.pkl")
-    with open(model_path, "wb") as f:
-        pickle.dump(model, f)
+    entry = registry.store(key, model, {"mse": float(mse), "rmse": float(rmse)},
+                           model=model_choice, params=params,
+                           start=str(df['Date'].iloc[0]), end=str(df['Date'].iloc[-1]))
     
-    return model_path, mse, rmse
+    return entry["model_path"], mse, rmse
@@ -0,0 +1,97 @@
+import time
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from train_evaluate_model import train_model
+
+PENDING = "En attente"
+RUNNING = "En cours"
+DONE = "Terminé"
+FAILED = "Échec"
+
+
+def job_key(asset, start_date, end_date, model_choice, pred_days):
+    return (
+        asset,
+        pd.Timestamp(start_date).strftime("%Y-%m-%d"),
+        pd.Timestamp(end_date).strftime("%Y-%m-%d"),
+        model_choice,
+        int(pred_days),
+    )
+
+
+def _run_job(df, model_choice, pred_days):
+    # Exécuté dans un processus du pool
+    start = time.time()
+    model_path, mse, rmse = train_model(df, model_choice, pred_days=pred_days)
+    return {"model_path": model_path, "mse": float(mse), "rmse": float(rmse), "fit_time": time.time() - start}
+
+
+def _failed(future):
+    return future.done() and (future.cancelled() or future.exception() is not None)
+
+
+class TrainingJobManager:
+    """
+    File de jobs d'entraînement exécutés dans un pool de processus.
+    Les jobs sont identifiés par (actif, début, fin, modèle, horizon) : une demande identique
+    à un job en cours ou terminé réutilise ce job au lieu d'en lancer un nouveau.
+    """
+
+    def __init__(self, max_workers=2, max_jobs=64):
+        # 'spawn' plutôt que 'fork' : le serveur Streamlit est multi-thread.
+        self._executor = ProcessPoolExecutor(max_workers=max_workers,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_jobs = max_jobs
+
+    def submit(self, asset, start_date, end_date, model_choice, pred_days, df):
+        key = job_key(asset, start_date, end_date, model_choice, pred_days)
+        with self._lock:
+            job = self._jobs.get(key)
+            # Un job échoué ou annulé (ex. arrêt du pool) est soumis à nouveau
+            if job is not None and not _failed(job["future"]):
+                self._jobs.move_to_end(key)
+                return key
+            future = self._executor.submit(_run_job, df.copy(), model_choice, pred_days)
+            self._jobs[key] = {"future": future, "submitted": time.time()}
+            self._prune()
+        return key
+
+    def _prune(self):
+        # On n'oublie que des jobs terminés, jamais un job en cours.
+        for key in list(self._jobs):
+            if len(self._jobs) <= self.max_jobs:
+                break
+            if self._jobs[key]["future"].done():
+                del self._jobs[key]
+
+    def status(self, key):
+        with self._lock:
+            job = self._jobs.get(key)
+        if job is None:
+            return None
+        future = job["future"]
+        elapsed = time.time() - job["submitted"]
+        if future.running():
+            return {"state": RUNNING, "elapsed": elapsed}
+        if not future.done():
+            return {"state": PENDING, "elapsed": elapsed}
+        # exception() lève CancelledError sur un job annulé : à tester avant
+        if future.cancelled():
+            return {"state": FAILED, "elapsed": elapsed, "error": "Job annulé"}
+        error = future.exception()
+        if error is not None:
+            return {"state": FAILED, "elapsed": elapsed, "error": repr(error)}
+        return {"state": DONE, "elapsed": elapsed, "result": future.result()}
+
+    def jobs(self):
+        with self._lock:
+            keys = list(self._jobs)
+        return {key: self.status(key) for key in keys}
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
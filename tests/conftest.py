@@ -0,0 +1,35 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Les modules de indicateurs_economique s'importent à plat (from risk_metrics import ...), comme dans les applications
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "indicateurs_economique"))
+
+
+@pytest.fixture
+def returns():
+    # Deux actifs de rendements journaliers corrélés, avec des jours sans cotation (NaN) sur le second
+    rng = np.random.default_rng(0)
+    r = rng.normal(0.0004, 0.02, size=(600, 2))
+    r[:, 1] = 0.5 * r[:, 0] + rng.normal(0.0002, 0.01, size=600)
+    r[rng.random(600) < 0.05, 1] = np.nan
+    r[0] = np.nan
+    return r
+
+
+@pytest.fixture
+def prices():
+    # Barres OHLCV journalières synthétiques (format *_historical_data_cleaned.csv)
+    rng = np.random.default_rng(1)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 300)))
+    return pd.DataFrame({
+        "Date": pd.bdate_range("2020-01-01", periods=300),
+        "Close": close.round(2),
+        "High": (close * 1.01).round(2),
+        "Low": (close * 0.99).round(2),
+        "Open": close.round(2),
+        "Volume": rng.integers(1_000, 10_000, 300),
+    })
@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+from indicator_engine import build_indicator_file, append_bars
+
+
+def test_append_bars_matches_full_build(prices, tmp_path):
+    full_csv, partial_csv = tmp_path / "full.csv", tmp_path / "partial.csv"
+    prices.to_csv(full_csv, index=False)
+    prices.iloc[:-40].to_csv(partial_csv, index=False)
+
+    build_indicator_file(full_csv, tmp_path / "full_with_indicators.csv")
+    build_indicator_file(partial_csv, tmp_path / "partial_with_indicators.csv")
+    # Ajouts en plusieurs fois, avec des dates déjà présentes (ignorées)
+    assert append_bars(tmp_path / "partial_with_indicators.csv", prices.iloc[-45:-20]) == 20
+    assert append_bars(tmp_path / "partial_with_indicators.csv", prices.iloc[-20:]) == 20
+    assert append_bars(tmp_path / "partial_with_indicators.csv", prices.iloc[-5:]) == 0
+
+    expected = pd.read_csv(tmp_path / "full_with_indicators.csv")
+    result = pd.read_csv(tmp_path / "partial_with_indicators.csv")
+    assert (result["Date"] == expected["Date"]).all()
+    assert np.allclose(result.drop(columns="Date").to_numpy(float), expected.drop(columns="Date").to_numpy(float),
+                       rtol=1e-10, equal_nan=True)
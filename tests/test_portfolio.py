@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+from portfolio import PortfolioEngine, grid_weights, random_weights, backtest, _project
+
+
+@pytest.fixture
+def engine():
+    # Trois actifs corrélés à rendement positif : optima à l'intérieur du simplexe
+    rng = np.random.default_rng(2)
+    chol = np.linalg.cholesky(np.array([[1.0, 0.4, 0.2], [0.4, 1.0, 0.3], [0.2, 0.3, 1.0]]))
+    r = rng.normal(size=(750, 3)) @ chol.T * [0.010, 0.015, 0.020] + [0.0010, 0.0015, 0.0020]
+    frame = pd.DataFrame(r, index=pd.bdate_range("2020-01-01", periods=len(r)), columns=["A", "B", "C"])
+    return PortfolioEngine(frame, risk_free=0.01)
+
+
+@pytest.fixture
+def grid(engine):
+    # Recherche exhaustive sur une grille fine du simplexe (pas de 0,5 %)
+    weights = grid_weights(len(engine.assets), steps=200)
+    return weights, engine.evaluate(weights)
+
+
+def test_grid_weights_cover_simplex():
+    weights = grid_weights(3, steps=10)
+    assert len(weights) == 66
+    assert np.allclose(weights.sum(axis=1), 1.0)
+    assert (weights >= 0).all()
+
+
+def test_project_onto_weighted_simplex():
+    rng = np.random.default_rng(3)
+    for _ in range(50):
+        v, a = rng.normal(size=5), rng.uniform(0.1, 2.0, size=5)
+        y = _project(v, a)
+        assert (y >= 0).all() and a @ y == pytest.approx(1.0)
+        # Optimalité : aucune autre solution admissible n'est plus proche de v
+        others = random_weights(2000, 5, seed=4) / a
+        others /= (others @ a)[:, None]
+        assert np.linalg.norm(v - y) <= np.linalg.norm(v - others, axis=1).min() + 1e-12
+
+
+def test_min_variance_matches_grid(engine, grid):
+    weights, stats = grid
+    w = engine.min_variance()
+    assert w.sum() == pytest.approx(1.0) and (w >= 0).all()
+    vol = engine.evaluate(w)[0, 1]
+    assert vol <= stats[:, 1].min() + 1e-12
+    assert np.abs(w - weights[stats[:, 1].argmin()]).max() <= 0.01
+
+
+def test_max_sharpe_matches_grid(engine, grid):
+    weights, stats = grid
+    w = engine.max_sharpe()
+    sharpe = engine.evaluate(w)[0, 2]
+    assert sharpe >= np.nanmax(stats[:, 2]) - 1e-12
+    assert np.abs(w - weights[np.nanargmax(stats[:, 2])]).max() <= 0.01
+
+
+def test_unconstrained_min_variance_closed_form(engine):
+    inv = np.linalg.solve(engine.cov, np.ones(len(engine.assets)))
+    assert np.allclose(engine.min_variance(long_only=False), inv / inv.sum())
+
+
+def test_frontier_dominates_grid(engine, grid):
+    _, stats = grid
+    _, frontier = engine.frontier(n_points=20)
+    assert (np.diff(frontier[:, 0]) >= -1e-12).all()
+    for ret, vol, _ in frontier:
+        feasible = stats[:, 0] >= ret
+        assert vol <= stats[feasible, 1].min() + 1e-9
+
+
+def test_backtest_matches_loop(returns):
+    frame = pd.DataFrame(np.nan_to_num(returns), index=pd.bdate_range("2020-01-01", periods=len(returns)))
+    weights = np.array([[0.3, 0.7], [1.0, 0.0]])
+    for rebalance in ("W", "M", None):
+        wealth = backtest(frame, weights, rebalance).to_numpy()
+        labels = frame.index.to_period(rebalance) if rebalance else np.zeros(len(frame))
+        for k, w in enumerate(weights):
+            holdings, expected = w.copy(), []
+            for t, r in enumerate(frame.to_numpy()):
+                if t > 0 and labels[t] != labels[t - 1]:
+                    holdings = w * holdings.sum()
+                holdings = holdings * (1 + r)
+                expected.append(holdings.sum())
+            assert np.allclose(wealth[:, k], expected)
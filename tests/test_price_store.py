@@ -0,0 +1,18 @@
+import pandas as pd
+import pytest
+from price_store import write_frame, append_frame, open_entry
+
+
+def test_append_frame_matches_full_write(prices, tmp_path):
+    write_frame(prices, "full", tmp_path)
+    write_frame(prices.iloc[:100], "partial", tmp_path)
+    assert append_frame(prices.iloc[100:250], "partial", tmp_path) == 150
+    assert append_frame(prices.iloc[250:], "partial", tmp_path) == 50
+    pd.testing.assert_frame_equal(open_entry("partial", tmp_path), open_entry("full", tmp_path))
+
+
+def test_append_frame_rejects_past_dates(prices, tmp_path):
+    write_frame(prices, "entry", tmp_path)
+    with pytest.raises(ValueError):
+        append_frame(prices.iloc[-3:], "entry", tmp_path)
+    assert len(open_entry("entry", tmp_path)) == len(prices)
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+from risk_metrics import compute_risk_metrics, rolling_risk_metrics
+
+# Métriques glissantes définies comme compute_risk_metrics sur la tranche de la fenêtre
+# (l'Ulcer Index glissant mesure le drawdown depuis le plus haut des window derniers jours : exclu)
+COMPARED = ["Rendement Annuel", "Volatilité Annuelle", "Sharpe Ratio", "Sortino Ratio", "Max Drawdown"]
+
+
+@pytest.mark.parametrize("window", [30, 90, 252])
+@pytest.mark.parametrize("risk_free", ["scalar", "series"])
+def test_rolling_matches_sliced_windows(returns, window, risk_free):
+    rates = 0.02 if risk_free == "scalar" else np.linspace(0.0, 0.05, len(returns)) / 252
+    rolling = rolling_risk_metrics(returns, window, risk_free=rates, min_periods=window // 2)
+    for t in range(window, len(returns), 37):
+        window_rates = rates if np.ndim(rates) == 0 else rates[t - window + 1:t + 1]
+        expected = compute_risk_metrics(returns[t - window + 1:t + 1], risk_free=window_rates)
+        for j in range(returns.shape[1]):
+            if np.isnan(returns[t, j]):
+                assert np.isnan(rolling["Max Drawdown"].iloc[t, j])
+                continue
+            for name in COMPARED:
+                assert rolling[name].iloc[t, j] == pytest.approx(expected[name].iloc[j], rel=1e-7, abs=1e-9), (name, t, j)
+
+
+def test_rolling_max_drawdown_partial_windows(returns):
+    # Premières lignes : fenêtre partielle depuis le début de la série
+    rolling = rolling_risk_metrics(returns, 90, min_periods=1)["Max Drawdown"]
+    for t in (5, 40, 88):
+        expected = compute_risk_metrics(returns[:t + 1])["Max Drawdown"]
+        assert rolling.iloc[t, 0] == pytest.approx(expected.iloc[0], abs=1e-9)
+
+
+def test_min_periods_masks_short_windows(returns):
+    rolling = rolling_risk_metrics(returns, 30)
+    assert rolling["Sharpe Ratio"].iloc[:30, 0].isna().all()
+    assert rolling["Sharpe Ratio"].iloc[30:, 0].notna().all()